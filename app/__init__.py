@@ -1,4 +1,4 @@
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
@@ -35,10 +35,15 @@ def create_app(config_object="app.config.DevelopmentConfig"):
     limiter.init_app(app)
     mail.init_app(app)
 
+    # Faster JSON responses when orjson is available
+    from app.utils.json_provider import init_json_provider
+    init_json_provider(app)
+
     # Import models so Alembic sees them
     from app.models import (  # noqa: F401
         user, task, tag, comment,
-        token_blacklist, password_reset, activity_log
+        token_blacklist, password_reset, activity_log,
+        task_counter, data_version, idempotency_key, tombstone, archive
     )
 
     # ---------------------------------------- #
@@ -57,6 +62,9 @@ def create_app(config_object="app.config.DevelopmentConfig"):
     from app.resources.export   import export_bp
     from app.resources.admin    import admin_bp
     from app.resources.activity import activity_bp   # <-- NEW
+    from app.resources.batch    import batch_bp
+    from app.resources.sync     import sync_bp
+    from app.resources.events   import events_bp
     from app.utils.api_docs     import api_docs_bp
     from app.resources.debug    import debug_bp
 
@@ -67,6 +75,9 @@ def create_app(config_object="app.config.DevelopmentConfig"):
     app.register_blueprint(export_bp,   url_prefix="/api/v1")
     app.register_blueprint(admin_bp,    url_prefix="/api/v1/admin")
     app.register_blueprint(activity_bp, url_prefix="/api/v1")  # <-- NEW
+    app.register_blueprint(batch_bp,    url_prefix="/api/v1")
+    app.register_blueprint(sync_bp,     url_prefix="/api/v1")
+    app.register_blueprint(events_bp,   url_prefix="/api/v1")
     app.register_blueprint(api_docs_bp, url_prefix="/api/v1/docs")
     app.register_blueprint(debug_bp,    url_prefix="/api/v1/debug")
 
@@ -77,8 +88,30 @@ def create_app(config_object="app.config.DevelopmentConfig"):
 
     @jwt.token_in_blocklist_loader
     def _is_token_revoked(jwt_header, jwt_payload):
+        # Batch sub-requests run on the token the batch has already checked
+        if jwt_payload.get('jti') == g.get('batch_jti'):
+            return False
         return TokenBlacklist.is_token_revoked(jwt_payload)
 
+    # ---------------------------------------- #
+    # JWT error responses
+    # ---------------------------------------- #
+    @jwt.unauthorized_loader
+    def _missing_token(reason):
+        return jsonify({"error": "Authorization required", "message": reason}), 401
+
+    @jwt.invalid_token_loader
+    def _invalid_token(reason):
+        return jsonify({"error": "Invalid token", "message": reason}), 401
+
+    @jwt.expired_token_loader
+    def _expired_token(jwt_header, jwt_payload):
+        return jsonify({"error": "Token has expired"}), 401
+
+    @jwt.revoked_token_loader
+    def _revoked_token(jwt_header, jwt_payload):
+        return jsonify({"error": "Token has been revoked"}), 401
+
     # Error handlers & 429 handler already present elsewhere
     from app.utils.errors import register_error_handlers
     register_error_handlers(app)
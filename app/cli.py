@@ -1,8 +1,14 @@
 import click
+from datetime import datetime, timedelta
+from flask import current_app
 from flask.cli import with_appcontext
 from app import db
 from app.utils.db_init import init_db, drop_db, create_sample_data
 from app.models.user import User
+from app.models.task_counter import TaskCounter
+from app.models.idempotency_key import IdempotencyKey
+from app.models.tombstone import Tombstone
+from app.models.archive import ArchivedTask
 from app.utils.cleanup import cleanup_expired_tokens
 
 def register_commands(app):
@@ -12,6 +18,10 @@ def register_commands(app):
     app.cli.add_command(create_sample_data_command)
     app.cli.add_command(create_admin_command)
     app.cli.add_command(cleanup_tokens_command)
+    app.cli.add_command(reconcile_counters_command)
+    app.cli.add_command(purge_idempotency_keys_command)
+    app.cli.add_command(compact_tombstones_command)
+    app.cli.add_command(archive_tasks_command)
 
 @click.command('init-db')
 @with_appcontext
@@ -76,4 +86,53 @@ def cleanup_tokens_command():
     if result >= 0:
         click.echo(f"Removed {result} expired tokens from the blacklist.")
     else:
-        click.echo("Error cleaning up expired tokens.")
\ No newline at end of file
+        click.echo("Error cleaning up expired tokens.")
+
+@click.command('reconcile-counters')
+@with_appcontext
+def reconcile_counters_command():
+    """Rebuild the per-user task counters from the tasks table."""
+    rows = TaskCounter.rebuild()
+    click.echo(f"Rebuilt task counters ({rows} rows).")
+
+@click.command('purge-idempotency-keys')
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Delete expired Idempotency-Key responses."""
+    removed = IdempotencyKey.purge()
+    db.session.commit()
+    click.echo(f"Removed {removed} expired idempotency keys.")
+
+@click.command('compact-tombstones')
+@click.option('--days', type=int, default=None,
+              help='Keep deletions this many days (default: SYNC_TOMBSTONE_RETENTION)')
+@with_appcontext
+def compact_tombstones_command(days):
+    """Delete old sync tombstones; older cursors must then resync in full."""
+    retention = (timedelta(days=days) if days is not None
+                 else current_app.config['SYNC_TOMBSTONE_RETENTION'])
+    removed = Tombstone.compact(datetime.utcnow() - retention)
+    db.session.commit()
+    click.echo(f"Removed {removed} sync tombstones.")
+
+# Units accepted by --older-than, e.g. 90d, 12w, 36h
+_AGE_UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+def _parse_age(ctx, param, value):
+    if value is None:
+        return None
+    number, unit = value[:-1], value[-1:].lower()
+    if not number.isdigit() or unit not in _AGE_UNITS:
+        raise click.BadParameter('use a number of hours, days or weeks, e.g. 90d')
+    return timedelta(**{_AGE_UNITS[unit]: int(number)})
+
+@click.command('archive-tasks')
+@click.option('--older-than', callback=_parse_age,
+              help='Archive tasks completed longer ago than this (default: TASK_ARCHIVE_AFTER)')
+@with_appcontext
+def archive_tasks_command(older_than):
+    """Move old completed tasks, their tag links and comments to the archive tables."""
+    age = older_than if older_than is not None else current_app.config['TASK_ARCHIVE_AFTER']
+    moved = ArchivedTask.archive(datetime.utcnow() - age,
+                                 current_app.config['BULK_WRITE_CHUNK_SIZE'])
+    click.echo(f"Archived {moved} completed tasks.")
@@ -30,6 +30,51 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@taskmanager.com')
     
+    # Full-text search: 'auto' picks tsvector/FTS5 by dialect, 'ilike' forces the scan
+    TASK_SEARCH_BACKEND = os.environ.get('TASK_SEARCH_BACKEND', 'auto')
+    # In-process trigram index used for search_mode=trigram off PostgreSQL
+    TRIGRAM_INDEX_MAX_TASKS = 50000      # larger users get a partial, "truncated" index
+    TRIGRAM_INDEX_MAX_USERS = 1000       # least recently used indexes are evicted
+    TRIGRAM_MAX_CANDIDATES = 20000       # caps the work done per query
+    # In-process tag bitmaps for ?tags=&tag_mode= (off: EXISTS / GROUP BY plans only)
+    TAG_BITMAP_INDEX = os.environ.get('TAG_BITMAP_INDEX', 'false').lower() == 'true'
+    TAG_BITMAP_INDEX_MAX_USERS = 1000
+    TAG_BITMAP_MAX_IDS = 5000            # larger matches use the SQL plan
+    # Per-user cache of rendered task / tag / comment listings
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+    # Bulk task endpoints: items per request and rows per statement
+    BULK_CREATE_MAX_TASKS = 1000
+    BULK_WRITE_CHUNK_SIZE = 500
+    # Stored responses for POSTs retried with an Idempotency-Key header
+    IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+    IDEMPOTENCY_PURGE_INTERVAL = 3600    # seconds between purges of expired keys
+    # Sub-requests accepted by one POST /api/v1/batch
+    BATCH_MAX_REQUESTS = 20
+    # Delta sync: rows per page and how long deletions stay reportable
+    SYNC_PAGE_SIZE = 500
+    SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+    # Completed tasks untouched this long are moved out by `flask archive-tasks`
+    TASK_ARCHIVE_AFTER = timedelta(days=90)
+    # Server-Sent Events: fan-out between workers is 'none', 'unix' or 'postgres'
+    EVENTS_FANOUT = os.environ.get('EVENTS_FANOUT', 'none')
+    EVENTS_SOCKET_DIR = os.environ.get('EVENTS_SOCKET_DIR', '/tmp/task-api-events')
+    EVENTS_HEARTBEAT = 15                # seconds between keep-alive comments
+    EVENTS_RETRY_MS = 3000               # reconnection delay suggested to browsers
+    EVENTS_STREAM_MAX_SECONDS = 3600     # streams also end when the token expires
+    EVENTS_QUEUE_SIZE = 256              # per stream; a slower client is told to resync
+    EVENTS_REPLAY_MAX = 500              # missed changes replayed on Last-Event-ID
+    EVENTS_MAX_CHANGES = 100             # changes listed in one event
+    # Activity log entries are inserted in batches by a background thread
+    ACTIVITY_LOG_ASYNC = True
+    ACTIVITY_LOG_BATCH_SIZE = 200        # rows per INSERT
+    ACTIVITY_LOG_FLUSH_INTERVAL = 0.5    # seconds a queued entry waits at most
+    ACTIVITY_LOG_QUEUE_SIZE = 10000
+    ACTIVITY_LOG_ENQUEUE_TIMEOUT = 1.0   # seconds a request waits on a full queue
+    # 'orjson' (if installed) or 'default' for Flask's stdlib json provider
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+
     # Frontend URL for password reset links
     FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
@@ -51,6 +96,10 @@ class TestingConfig(Config):
     RATELIMIT_ENABLED = False
     # Suppress email sending in tests
     MAIL_SUPPRESS_SEND = True
+    # Tests opt in to the response cache explicitly
+    RESPONSE_CACHE_ENABLED = False
+    # Activity log entries are committed with the request
+    ACTIVITY_LOG_ASYNC = False
 
 class ProductionConfig(Config):
     """Production configuration."""
@@ -63,6 +112,9 @@ class ProductionConfig(Config):
     REMEMBER_COOKIE_HTTPONLY = True
     # More restrictive rate limits for production
     RATELIMIT_DEFAULT = "20 per minute"
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+    # Several workers per host: share change events over Unix sockets
+    EVENTS_FANOUT = os.environ.get('EVENTS_FANOUT', 'unix')
     
     # Email configuration for production
     MAIL_DEBUG = False
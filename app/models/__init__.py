@@ -4,4 +4,8 @@ from app.models.token_blacklist import TokenBlacklist
 from app.models.tag import Tag
 from app.models.comment import Comment
 from app.models.password_reset import PasswordResetToken
-from app.models.activity_log import ActivityLog
\ No newline at end of file
+from app.models.activity_log import ActivityLog
+from app.models.task_counter import TaskCounter
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+from app.models.archive import ArchivedTask, ArchivedComment
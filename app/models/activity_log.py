@@ -15,8 +15,10 @@ class ActivityType(Enum):
     TASK_CREATE = "task_create"
     TASK_UPDATE = "task_update"
     TASK_DELETE = "task_delete"
+    TASK_BULK_CREATE = "task_bulk_create"
     TASK_BULK_UPDATE = "task_bulk_update"
     TASK_BULK_DELETE = "task_bulk_delete"
+    TASK_RESTORE = "task_restore"
     
     # Tag operations
     TAG_CREATE = "tag_create"
@@ -75,6 +77,21 @@ class ActivityLog(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
     
+    @classmethod
+    def row(cls, user_id, activity_type, request=None, **kwargs):
+        """Column values for an activity, for inserts outside the ORM."""
+        return {
+            'user_id': user_id,
+            'activity_type': activity_type.value if isinstance(activity_type, ActivityType) else activity_type,
+            'entity_type': kwargs.get('entity_type'),
+            'entity_id': kwargs.get('entity_id'),
+            'description': kwargs.get('description'),
+            'activity_data': kwargs.get('activity_data'),
+            'ip_address': request.remote_addr if request else None,
+            'user_agent': request.headers.get('User-Agent', '')[:256] if request else None,
+            'created_at': datetime.utcnow()
+        }
+    
     @classmethod
     def log(cls, user_id, activity_type, request=None, **kwargs):
         """Convenience method to log an activity."""
@@ -0,0 +1,165 @@
+from app import db
+from app.models.task import Task
+from app.models.tag import Tag, task_tags
+from app.models.comment import Comment
+from app.models.task_counter import TaskCounter
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+from app.utils.events import queue_changes
+from datetime import datetime
+from sqlalchemy import delete, insert, literal, select
+
+# Cold copies of the task -> tags links
+archived_task_tags = db.Table('task_tags_archive',
+    db.Column('task_id', db.Integer, db.ForeignKey('tasks_archive.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+)
+
+class ArchivedTask(db.Model):
+    """Completed task moved out of the hot ``tasks`` table.
+
+    Rows keep their id and every column of ``Task`` (so they serialise
+    with ``TaskSchema``), plus ``archived_at``.  Their tag links and
+    comments move to ``task_tags_archive`` and ``comments_archive``.
+    ``archive`` moves old completed tasks here in set-based chunks;
+    ``restore`` moves one back.
+    """
+    __tablename__ = 'tasks_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text)
+    status = db.Column(db.String(20))
+    priority = db.Column(db.String(20))
+    due_date = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    tags = db.relationship(Tag, secondary=archived_task_tags, lazy='selectin', viewonly=True)
+
+    __table_args__ = (
+        db.Index('ix_tasks_archive_user_updated_at', 'user_id', 'updated_at'),
+    )
+
+    # Columns copied between the hot and the cold table
+    COLUMNS = ('id', 'title', 'description', 'status', 'priority', 'due_date',
+               'created_at', 'updated_at', 'version', 'user_id')
+
+    @classmethod
+    def archive(cls, before, chunk_size=500):
+        """
+        Move tasks completed (last updated) before ``before`` into the
+        archive, with their tag links and comments; returns the number moved.
+
+        Each chunk is one transaction of ``INSERT ... SELECT`` and ``DELETE``
+        statements.  For the owners it adjusts the task counters and
+        records tombstones and change events: archived tasks leave the
+        synced set until they are restored.
+        """
+        moved = 0
+        while True:
+            rows = db.session.query(Task.id, Task.user_id, Task.priority).filter(
+                Task.status == 'completed', Task.updated_at < before
+            ).order_by(Task.id).limit(chunk_size).all()
+            if not rows:
+                return moved
+            ids = [task_id for task_id, _, _ in rows]
+            comment_rows = db.session.query(Comment.id, Comment.user_id) \
+                                     .filter(Comment.task_id.in_(ids)).all()
+
+            _copy(Task.__table__, cls.__table__, cls.COLUMNS, Task.id.in_(ids),
+                  archived_at=datetime.utcnow())
+            _copy(task_tags, archived_task_tags, ('task_id', 'tag_id'),
+                  task_tags.c.task_id.in_(ids))
+            _copy(Comment.__table__, ArchivedComment.__table__, ArchivedComment.COLUMNS,
+                  Comment.task_id.in_(ids))
+
+            owners = {}
+            for task_id, user_id, priority in rows:
+                owners.setdefault(user_id, {'tasks': [], 'comments': [], 'deltas': {}})
+                owners[user_id]['tasks'].append(task_id)
+                deltas = owners[user_id]['deltas']
+                deltas[('completed', priority)] = deltas.get(('completed', priority), 0) - 1
+            for comment_id, user_id in comment_rows:
+                owners.setdefault(user_id, {'tasks': [], 'comments': [], 'deltas': {}})
+                owners[user_id]['comments'].append(comment_id)
+            for user_id, owned in owners.items():
+                TaskCounter.adjust_many(user_id, owned['deltas'])
+                seq = UserDataVersion.change_seq(user_id)
+                Tombstone.record(user_id, 'task', owned['tasks'], seq)
+                Tombstone.record(user_id, 'comment', owned['comments'], seq)
+                queue_changes(user_id, 'task', owned['tasks'], 'deleted')
+                queue_changes(user_id, 'comment', owned['comments'], 'deleted')
+
+            db.session.execute(delete(Comment).where(Comment.task_id.in_(ids)))
+            db.session.execute(task_tags.delete().where(task_tags.c.task_id.in_(ids)))
+            db.session.execute(delete(Task).where(Task.id.in_(ids)),
+                               execution_options={'synchronize_session': False})
+            db.session.commit()
+            moved += len(ids)
+
+    @classmethod
+    def restore(cls, task_id, user_id):
+        """
+        Move an archived task back into ``tasks`` with its comments and the
+        links to tags that still exist.  Returns ``(tag_ids, comment_ids)``,
+        or None when the user has no such archived task.  The caller
+        records the write (counters, indexes) and commits.
+        """
+        archived = db.session.query(cls.id).filter_by(id=task_id, user_id=user_id).first()
+        if archived is None:
+            return None
+
+        seq = UserDataVersion.change_seq(user_id)
+        _copy(cls.__table__, Task.__table__, cls.COLUMNS, cls.id == task_id, change_seq=seq)
+        live_tags = archived_task_tags.c.tag_id.in_(select(Tag.id))
+        _copy(archived_task_tags, task_tags, ('task_id', 'tag_id'),
+              (archived_task_tags.c.task_id == task_id) & live_tags)
+        _copy(ArchivedComment.__table__, Comment.__table__, ArchivedComment.COLUMNS,
+              ArchivedComment.task_id == task_id, change_seq=seq)
+
+        tag_ids = db.session.execute(select(task_tags.c.tag_id).where(
+            task_tags.c.task_id == task_id)).scalars().all()
+        comment_ids = db.session.execute(select(Comment.id).where(
+            Comment.task_id == task_id)).scalars().all()
+
+        db.session.execute(delete(ArchivedComment).where(ArchivedComment.task_id == task_id))
+        db.session.execute(archived_task_tags.delete().where(
+            archived_task_tags.c.task_id == task_id))
+        db.session.execute(delete(cls).where(cls.id == task_id),
+                           execution_options={'synchronize_session': False})
+        queue_changes(user_id, 'task', [task_id])
+        queue_changes(user_id, 'comment', comment_ids)
+        return tag_ids, comment_ids
+
+    def __repr__(self):
+        return f'<ArchivedTask {self.title}>'
+
+
+class ArchivedComment(db.Model):
+    """Comment of an archived task."""
+    __tablename__ = 'comments_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks_archive.id', ondelete='CASCADE'),
+                        nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    COLUMNS = ('id', 'content', 'created_at', 'updated_at', 'task_id', 'user_id')
+
+    def __repr__(self):
+        return f'<ArchivedComment {self.id}>'
+
+
+def _copy(source, target, columns, where, **constants):
+    """``INSERT INTO target (...) SELECT ... FROM source WHERE ...``."""
+    names = list(columns) + list(constants)
+    select_list = [source.c[name] for name in columns] + \
+                  [literal(value, type_=target.c[name].type) for name, value in constants.items()]
+    db.session.execute(insert(target).from_select(names, select(*select_list).where(where)))
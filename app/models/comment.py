@@ -13,6 +13,14 @@ class Comment(db.Model):
     # Foreign Keys
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # Per-user change sequence of the last write, for delta sync
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    
+    __table_args__ = (
+        db.Index('ix_comments_user_change_seq', 'user_id', 'change_seq'),
+        # Ids are never reused: archived comments are restored under their id
+        {'sqlite_autoincrement': True},
+    )
     
     def __init__(self, content, task_id, user_id):
         self.content = content
@@ -0,0 +1,98 @@
+from app import db
+from app.models.task import Task
+from app.models.tag import Tag
+from app.models.comment import Comment
+from app.models.tombstone import Tombstone
+from app.utils.sql import upsert_increment
+from datetime import datetime
+from itertools import chain
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+class UserDataVersion(db.Model):
+    """Per-user version number bumped whenever the user's tasks, tags or
+    comments change.
+
+    Conditional GETs compare it against the client's ETag before running
+    any listing query (see ``app/utils/conditional.py``).  It doubles as
+    the per-user change sequence for delta sync: a transaction writing a
+    user's tasks, tags or comments bumps it once and stamps the new value
+    into the rows' ``change_seq`` (or a ``Tombstone``).  ORM writes are
+    stamped by a flush hook; query-level statements must write
+    ``change_seq(user_id)`` themselves.
+    """
+    __tablename__ = 'user_data_versions'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Tombstones up to this sequence number have been compacted away
+    compacted_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
+    @classmethod
+    def current(cls, user_id):
+        """Return ``(version, updated_at)`` for a user; ``(0, None)`` before any write."""
+        row = db.session.query(cls.version, cls.updated_at).filter_by(user_id=user_id).first()
+        return (row.version, row.updated_at) if row else (0, None)
+
+    @classmethod
+    def bump(cls, user_ids, session=None):
+        """
+        Increment the version of every user in ``user_ids``.
+
+        The users are also recorded in ``session.info['bumped_user_ids']``
+        so in-process caches can be invalidated once the transaction commits.
+        """
+        session = session if session is not None else db.session
+        user_ids = set(user_ids)
+        now = datetime.utcnow()
+        connection = session.connection()
+        for user_id in sorted(user_ids):
+            upsert_increment(connection, cls, {'user_id': user_id}, 'version', 1, updated_at=now)
+        session.info.setdefault('bumped_user_ids', set()).update(user_ids)
+
+    @classmethod
+    def change_seq(cls, user_id, session=None):
+        """
+        The sequence number of the current transaction's changes for a user.
+
+        The first call bumps the version; on PostgreSQL that holds the
+        row lock until commit, so numbers are handed out in commit order
+        and a cursor never skips a transaction committing late.  Later
+        calls in the same transaction return the same number.
+        """
+        session = session if session is not None else db.session
+        seqs = session.info.setdefault('change_seqs', {})
+        if user_id not in seqs:
+            cls.bump([user_id], session)
+            seqs[user_id] = session.connection().execute(
+                select(cls.version).where(cls.user_id == user_id)).scalar_one()
+        return seqs[user_id]
+
+    def __repr__(self):
+        return f'<UserDataVersion user={self.user_id} v{self.version}>'
+
+
+# Entities synced through GET /api/v1/sync, by model
+SYNCED_ENTITIES = {Task: 'task', Tag: 'tag', Comment: 'comment'}
+
+@event.listens_for(Session, 'before_flush')
+def _stamp_changes(session, flush_context, instances):
+    """Stamp new and changed rows with the transaction's sequence number
+    and record deleted ones as tombstones."""
+    changed = chain(session.new, (target for target in session.dirty
+                                  if session.is_modified(target)))
+    for target in changed:
+        if type(target) in SYNCED_ENTITIES and target.user_id is not None:
+            target.change_seq = UserDataVersion.change_seq(target.user_id, session)
+    for target in list(session.deleted):
+        if type(target) in SYNCED_ENTITIES and target.user_id is not None:
+            session.add(Tombstone(
+                user_id=target.user_id, entity=SYNCED_ENTITIES[type(target)],
+                entity_id=target.id,
+                change_seq=UserDataVersion.change_seq(target.user_id, session)))
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _end_change_seqs(session, *args):
+    session.info.pop('change_seqs', None)
@@ -0,0 +1,36 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import delete
+
+class IdempotencyKey(db.Model):
+    """Stored response of a POST made with an ``Idempotency-Key`` header.
+
+    Rows are keyed by user and a SHA-256 of the client's key, hold the
+    exact response (status and JSON text) plus a fingerprint of the
+    request that produced it, and expire after ``IDEMPOTENCY_KEY_TTL``.
+    See ``app/utils/idempotency.py``.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    key_hash = db.Column(db.String(64), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.SmallInteger, nullable=False)
+    response_body = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    @classmethod
+    def find(cls, user_id, key_hash):
+        """The live entry for a key, or None."""
+        return cls.query.filter(cls.user_id == user_id, cls.key_hash == key_hash,
+                                cls.expires_at > datetime.utcnow()).first()
+
+    @classmethod
+    def purge(cls, now=None):
+        """Delete expired entries; returns the number removed."""
+        result = db.session.execute(
+            delete(cls).where(cls.expires_at <= (now or datetime.utcnow())))
+        return result.rowcount
+
+    def __repr__(self):
+        return f'<IdempotencyKey user={self.user_id} {self.key_hash[:12]}>'
@@ -3,7 +3,9 @@ from app import db
 # Many-to-many relationship table between tasks and tags
 task_tags = db.Table('task_tags',
     db.Column('task_id', db.Integer, db.ForeignKey('tasks.id'), primary_key=True),
-    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id'), primary_key=True),
+    # The primary key serves task -> tags; this serves tag -> tasks filters
+    db.Index('ix_task_tags_tag_id_task_id', 'tag_id', 'task_id')
 )
 
 class Tag(db.Model):
@@ -14,6 +16,12 @@ class Tag(db.Model):
     name = db.Column(db.String(50), unique=True, nullable=False)
     color = db.Column(db.String(7), default="#3498db")  # Default to a blue color
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # Per-user change sequence of the last write, for delta sync
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+    
+    __table_args__ = (
+        db.Index('ix_tags_user_change_seq', 'user_id', 'change_seq'),
+    )
     
     # Relationships
     tasks = db.relationship(
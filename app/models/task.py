@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import event, DDL
 
 class Task(db.Model):
     """Task model for storing task related details."""
@@ -13,6 +14,10 @@ class Task(db.Model):
     due_date = db.Column(db.DateTime, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic concurrency: bumped by every UPDATE, exposed as the ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Per-user change sequence of the last write, for delta sync
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     
     # Foreign Keys
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
@@ -21,6 +26,18 @@ class Task(db.Model):
     comments = db.relationship('Comment', backref='task', lazy=True, cascade='all, delete-orphan')
     
     # The tags relationship is defined in the Tag model via the task_tags table
+
+    __table_args__ = (
+        # Overdue / due-soon counts are index range scans per status
+        db.Index('ix_tasks_user_status_due_date', 'user_id', 'status', 'due_date'),
+        # Calendar ranges over all of a user's tasks
+        db.Index('ix_tasks_user_due_date', 'user_id', 'due_date'),
+        # Delta sync reads a user's rows changed after a cursor
+        db.Index('ix_tasks_user_change_seq', 'user_id', 'change_seq'),
+        # Ids are never reused: archived tasks are restored under their id
+        {'sqlite_autoincrement': True},
+    )
+    __mapper_args__ = {'version_id_col': version}
     
     def __init__(self, title, user_id, description=None, status='pending', 
                  priority='medium', due_date=None):
@@ -46,4 +63,47 @@ class Task(db.Model):
         }
     
     def __repr__(self):
-        return f'<Task {self.title}>'
\ No newline at end of file
+        return f'<Task {self.title}>'
+
+# ---------------------------------------------------------------------- #
+# Full-text search structures (see app/utils/search.py)
+# ---------------------------------------------------------------------- #
+# PostgreSQL: a generated tsvector column with a GIN index.  It is kept out
+# of the mapped columns so the model stays portable across dialects.
+_PG_SEARCH_DDL = (
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+    # Trigram indexes for typo-tolerant search (app/utils/trigram.py)
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_tasks_title_trgm ON tasks USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX ix_tasks_description_trgm ON tasks USING GIN (description gin_trgm_ops)",
+)
+
+# SQLite: an external-content FTS5 shadow table synchronised by triggers.
+_SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+for _statement in _PG_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create',
+                    DDL(_statement).execute_if(dialect='postgresql'))
+for _statement in _SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, 'after_create',
+                    DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(Task.__table__, 'before_drop',
+                DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect='sqlite'))
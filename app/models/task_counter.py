@@ -0,0 +1,92 @@
+from app import db
+from app.models.task import Task
+from app.utils.sql import upsert_increment
+from sqlalchemy import event, func, insert, delete, select, inspect
+
+class TaskCounter(db.Model):
+    """Denormalised per-user task counts keyed by (status, priority).
+
+    Rows are adjusted in the same transaction as the task writes that
+    change them, so list totals and statistics can be read from at most
+    nine rows per user instead of running COUNT(*) over the tasks table.
+    ORM inserts, updates and deletes of ``Task`` are tracked by the mapper
+    events below; query-level bulk statements must call ``adjust_many``.
+    """
+    __tablename__ = 'task_counters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    priority = db.Column(db.String(20), primary_key=True)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def adjust(cls, user_id, status, priority, delta, connection=None):
+        """Add ``delta`` to one counter, creating the row if needed."""
+        if not delta:
+            return
+        upsert_increment(connection if connection is not None else db.session, cls,
+                         {'user_id': user_id, 'status': status, 'priority': priority},
+                         'task_count', delta)
+
+    @classmethod
+    def adjust_many(cls, user_id, deltas):
+        """Apply a ``{(status, priority): delta}`` mapping of adjustments."""
+        for (status, priority), delta in deltas.items():
+            cls.adjust(user_id, status, priority, delta)
+
+    @classmethod
+    def total(cls, user_id, status=None, priority=None):
+        """Number of tasks for a user, optionally narrowed by status/priority."""
+        query = db.session.query(func.coalesce(func.sum(cls.task_count), 0)) \
+                          .filter(cls.user_id == user_id)
+        if status is not None:
+            query = query.filter(cls.status == status)
+        if priority is not None:
+            query = query.filter(cls.priority == priority)
+        return int(query.scalar())
+
+    @classmethod
+    def breakdown(cls, user_id):
+        """Return a user's non-zero counters as ``{(status, priority): count}``."""
+        rows = db.session.query(cls.status, cls.priority, cls.task_count) \
+                         .filter(cls.user_id == user_id, cls.task_count != 0)
+        return {(status, priority): count for status, priority, count in rows}
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every counter from the tasks table in one set-based pass."""
+        db.session.execute(delete(cls))
+        db.session.execute(
+            insert(cls).from_select(
+                ['user_id', 'status', 'priority', 'task_count'],
+                select(Task.user_id, Task.status, Task.priority, func.count(Task.id))
+                .group_by(Task.user_id, Task.status, Task.priority)
+            )
+        )
+        db.session.commit()
+        return db.session.query(func.count()).select_from(cls).scalar()
+
+    def __repr__(self):
+        return f'<TaskCounter user={self.user_id} {self.status}/{self.priority}={self.task_count}>'
+
+
+@event.listens_for(Task, 'after_insert')
+def _count_inserted_task(mapper, connection, target):
+    TaskCounter.adjust(target.user_id, target.status, target.priority, 1, connection)
+
+@event.listens_for(Task, 'after_delete')
+def _count_deleted_task(mapper, connection, target):
+    TaskCounter.adjust(target.user_id, target.status, target.priority, -1, connection)
+
+@event.listens_for(Task, 'after_update')
+def _count_updated_task(mapper, connection, target):
+    state = inspect(target)
+    status, priority = state.attrs.status.history, state.attrs.priority.history
+    if not (status.has_changes() or priority.has_changes()):
+        return
+
+    old_status = status.deleted[0] if status.deleted else target.status
+    old_priority = priority.deleted[0] if priority.deleted else target.priority
+    if (old_status, old_priority) != (target.status, target.priority):
+        TaskCounter.adjust(target.user_id, old_status, old_priority, -1, connection)
+        TaskCounter.adjust(target.user_id, target.status, target.priority, 1, connection)
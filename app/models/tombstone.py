@@ -0,0 +1,59 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import case, delete, func, insert, select, update
+
+class Tombstone(db.Model):
+    """Record of a deleted task, tag or comment for delta sync.
+
+    Each row carries the change sequence number of the transaction that
+    deleted the entity, so ``GET /api/v1/sync`` can report deletions
+    alongside changes.  ORM deletes are recorded by a flush hook (see
+    ``app/models/data_version.py``); statement-level deletes call
+    ``record``.  ``compact`` drops old rows and remembers how far it went.
+    """
+    __tablename__ = 'tombstones'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    entity = db.Column(db.String(20), nullable=False)        # task, tag, comment
+    entity_id = db.Column(db.Integer, nullable=False)
+    change_seq = db.Column(db.BigInteger, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index('ix_tombstones_user_change_seq', 'user_id', 'change_seq'),
+    )
+
+    @classmethod
+    def record(cls, user_id, entity, entity_ids, change_seq, session=None):
+        """Insert tombstones for ids removed by a statement-level delete."""
+        if entity_ids:
+            (session if session is not None else db.session).execute(insert(cls), [
+                {'user_id': user_id, 'entity': entity, 'entity_id': entity_id,
+                 'change_seq': change_seq} for entity_id in entity_ids])
+
+    @classmethod
+    def compact(cls, before):
+        """
+        Delete tombstones older than ``before``; returns the number removed.
+
+        Each affected user's ``compacted_seq`` is raised to the newest
+        sequence number dropped, so cursors from before it are refused
+        instead of silently missing deletions.
+        """
+        from app.models.data_version import UserDataVersion
+
+        newest = select(func.max(cls.change_seq)).where(
+            cls.user_id == UserDataVersion.user_id, cls.deleted_at < before).scalar_subquery()
+        db.session.execute(
+            update(UserDataVersion)
+            .where(UserDataVersion.user_id.in_(
+                select(cls.user_id).where(cls.deleted_at < before).distinct()))
+            .values(compacted_seq=case((newest > UserDataVersion.compacted_seq, newest),
+                                       else_=UserDataVersion.compacted_seq)),
+            execution_options={'synchronize_session': False})
+        result = db.session.execute(delete(cls).where(cls.deleted_at < before))
+        return result.rowcount
+
+    def __repr__(self):
+        return f'<Tombstone {self.entity} {self.entity_id} seq={self.change_seq}>'
@@ -6,6 +6,8 @@ Added 2025-06-04
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.activity_log import ActivityLog
+from app.schemas import activity_logs_serializer
+from app.utils.pagination import paginate_keyset, CursorError
 
 activity_bp = Blueprint("activity", __name__)
 
@@ -18,6 +20,8 @@ def get_my_activities():
     Query-string parameters (all optional):
         limit   – max rows to return (default 50, max 100)
         offset  – starting row (default 0)
+        cursor  – keyset cursor; when present (even empty) the response is
+                  an object with `activities`, `next_cursor`, `prev_cursor`
     """
     user_id = get_jwt_identity()
     if isinstance(user_id, str):
@@ -29,10 +33,26 @@ def get_my_activities():
     except ValueError:
         return jsonify({"error": "limit and offset must be integers"}), 400
 
+    if "cursor" in request.args:
+        query = ActivityLog.query.filter_by(user_id=user_id)
+        try:
+            page = paginate_keyset(query, ActivityLog.id, limit,
+                                   cursor=request.args.get("cursor") or None,
+                                   sort_column=ActivityLog.created_at,
+                                   key="created_at:desc")
+        except CursorError as err:
+            return jsonify({"error": str(err)}), 400
+
+        return jsonify({
+            "activities": activity_logs_serializer.dump(page.items),
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor
+        }), 200
+
     logs = ActivityLog.get_user_activities(
         user_id=user_id,
         limit=limit,
         offset=offset
     )
 
-    return jsonify([entry.to_dict() for entry in logs]), 200
\ No newline at end of file
+    return jsonify(activity_logs_serializer.dump(logs)), 200
\ No newline at end of file
@@ -2,7 +2,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import get_jwt_identity
 from app.utils.auth import admin_required
 from app.models.user import User
-from app.schemas import user_schema, users_schema
+from app.schemas import user_serializer, users_serializer
+from app.utils.pagination import paginate_keyset, CursorError
+from app.utils.streaming import stream_json
 from app import db
 from marshmallow import ValidationError
 
@@ -12,15 +14,41 @@ admin_bp = Blueprint('admin', __name__)
 @admin_required
 def get_users():
     """Get all users (admin only)."""
+    # `?per_page=all` streams every user instead of building one big page
+    if request.args.get('per_page') == 'all':
+        return stream_json(User.query.order_by(User.id), user_serializer.dump,
+                           key="users", trailer={"per_page": "all"})
+
     # Get query parameters for pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
 
+    # Keyset mode – `?cursor=` (empty for the first page) seeks on the id
+    if 'cursor' in request.args:
+        per_page = max(1, min(per_page, 100))
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        try:
+            result = paginate_keyset(User.query, User.id, per_page,
+                                     cursor=request.args.get('cursor') or None,
+                                     descending=False, key="id:asc")
+        except CursorError as err:
+            return jsonify({"error": str(err)}), 400
+
+        body = {
+            "users": users_serializer.dump(result.items),
+            "per_page": per_page,
+            "next_cursor": result.next_cursor,
+            "prev_cursor": result.prev_cursor
+        }
+        if include_total:
+            body["total"] = User.query.count()
+        return jsonify(body), 200
+
     # Paginate users
     pagination = User.query.paginate(page=page, per_page=per_page)
 
     return jsonify({
-        "users": users_schema.dump(pagination.items),
+        "users": users_serializer.dump(pagination.items),
         "total": pagination.total,
         "pages": pagination.pages,
         "page": page,
@@ -36,7 +64,7 @@ def get_user(user_id):
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    return jsonify(user_schema.dump(user)), 200
+    return jsonify(user_serializer.dump(user)), 200
 
 @admin_bp.route('/users/<int:user_id>', methods=['PUT'])
 @admin_required
@@ -86,7 +114,7 @@ def update_user(user_id):
 
     return jsonify({
         "message": "User updated successfully",
-        "user": user_schema.dump(user)
+        "user": user_serializer.dump(user)
     }), 200
 
 @admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
@@ -109,32 +137,30 @@ def delete_user(user_id):
 @admin_required
 def get_admin_statistics():
     """Get admin statistics (admin only)."""
-    # Get total users
-    total_users = User.query.count()
-
-    # Get users by role
-    admin_users = User.query.filter_by(role='admin').count()
-    regular_users = User.query.filter_by(role='user').count()
+    from sqlalchemy import func
+    from app.models.task_counter import TaskCounter
+    from app.utils.response_cache import get_response_cache
 
-    # Get total tasks
-    from app.models.task import Task
-    total_tasks = Task.query.count()
+    # Users by role in one grouped pass
+    users_by_role = dict(
+        db.session.query(User.role, func.count(User.id)).group_by(User.role).all()
+    )
 
-    # Get tasks by status
-    from sqlalchemy import func
+    # Task totals come from the denormalised counters, not the tasks table
     task_by_status = db.session.query(
-        Task.status, func.count(Task.id)
-    ).group_by(Task.status).all()
-    status_stats = {status: count for status, count in task_by_status}
+        TaskCounter.status, func.sum(TaskCounter.task_count)
+    ).group_by(TaskCounter.status).all()
+    status_stats = {status: int(count) for status, count in task_by_status if count}
 
     return jsonify({
         "user_stats": {
-            "total": total_users,
-            "admins": admin_users,
-            "regular_users": regular_users
+            "total": sum(users_by_role.values()),
+            "admins": users_by_role.get('admin', 0),
+            "regular_users": users_by_role.get('user', 0)
         },
         "task_stats": {
-            "total": total_tasks,
+            "total": sum(status_stats.values()),
             "by_status": status_stats
-        }
-    }), 200
\ No newline at end of file
+        },
+        "response_cache": get_response_cache().stats()
+    }), 200
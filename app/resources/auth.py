@@ -9,7 +9,7 @@ from app import db, limiter
 from app.models.user import User
 from app.models.token_blacklist import TokenBlacklist
 from app.models.password_reset import PasswordResetToken
-from app.schemas import user_registration_schema, user_login_schema, user_schema
+from app.schemas import user_registration_schema, user_login_schema, user_serializer
 from app.utils.email import send_password_reset_email, send_password_reset_confirmation_email
 
 auth_bp = Blueprint('auth', __name__)
@@ -49,7 +49,7 @@ def register():
     
     return jsonify({
         "message": "User registered successfully",
-        "user": user_schema.dump(user),
+        "user": user_serializer.dump(user),
         "access_token": access_token,
         "refresh_token": refresh_token
     }), 201
@@ -75,7 +75,7 @@ def login():
     
     return jsonify({
         "message": "Login successful",
-        "user": user_schema.dump(user),
+        "user": user_serializer.dump(user),
         "access_token": access_token,
         "refresh_token": refresh_token
     }), 200
@@ -173,7 +173,7 @@ def me():
     if not user:
         return jsonify({"error": "User not found"}), 404
     
-    return jsonify(user_schema.dump(user)), 200
+    return jsonify(user_serializer.dump(user)), 200
 
 @auth_bp.route('/me', methods=['PUT'])
 @limiter.limit("20 per hour")
@@ -215,7 +215,7 @@ def update_me():
     
     return jsonify({
         "message": "User updated successfully",
-        "user": user_schema.dump(user)
+        "user": user_serializer.dump(user)
     }), 200
 
 @auth_bp.route('/forgot-password', methods=['POST'])
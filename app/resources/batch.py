@@ -0,0 +1,154 @@
+"""
+POST /api/v1/batch – several API calls in one request and one transaction.
+
+    {"requests": [
+        {"id": "tag",  "method": "POST", "path": "/api/v1/tags", "body": {"name": "Q3"}},
+        {"id": "task", "method": "POST", "path": "/api/v1/tasks",
+         "body": {"title": "Plan Q3", "tag_ids": ["${tag.tag.id}"]}},
+        {"method": "POST", "path": "/api/v1/tasks/${task.task.id}/comments",
+         "body": {"content": "Kick-off on Monday"}}
+    ]}
+
+Sub-requests are matched against the application's URL map and dispatched
+in-process, in order, on the caller's token.  Each view still decodes the
+token, but the revocation lookup runs once, for the batch itself.  Apart
+from ``Authorization``, no header of the batch request is forwarded: a
+sub-request sees only its own ``headers`` (without ``Authorization`` or
+``Content-Type``).  The application's before-request hooks run for every
+sub-request, so each one counts against the rate limits of the endpoint it
+calls.  ``${name.path.to.value}`` in a path or body refers to the JSON
+response of an earlier sub-request, by ``id`` or by index; a string that is
+exactly one reference keeps the referenced value's type.
+
+The views' commits are turned into flushes for the duration of the batch,
+so everything is committed once at the end, or rolled back as a whole as
+soon as a sub-request fails (any status >= 400).
+"""
+import re
+
+from flask import Blueprint, current_app, g, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+from marshmallow import ValidationError
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app import db
+from app.schemas import batch_schema
+from app.utils.transaction import single_commit
+
+batch_bp = Blueprint('batch', __name__)
+
+# Blueprints whose endpoints may be called from a batch
+BATCH_BLUEPRINTS = ('task', 'tag', 'comment', 'activity')
+
+_REFERENCE = re.compile(r'\$\{([^}]+)\}')
+
+
+class BatchReferenceError(Exception):
+    """A ``${...}`` reference that does not resolve."""
+
+
+def _lookup(expression, results, names):
+    name, *path = expression.split('.')
+    index = int(name) if name.isdigit() else names.get(name)
+    if index is None or index >= len(results):
+        raise BatchReferenceError(f"Unknown sub-request '{name}'")
+    value = results[index]['body']
+    for key in path:
+        try:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise BatchReferenceError(f"'{expression}' does not resolve") from None
+    return value
+
+
+def _resolve(value, results, names):
+    """Substitute references to earlier results throughout a path or body."""
+    if isinstance(value, dict):
+        return {key: _resolve(item, results, names) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results, names) for item in value]
+    if not isinstance(value, str) or '${' not in value:
+        return value
+    whole = _REFERENCE.fullmatch(value)
+    if whole:
+        return _lookup(whole.group(1), results, names)
+    return _REFERENCE.sub(lambda m: str(_lookup(m.group(1), results, names)), value)
+
+
+def _dispatch(method, path, body, headers):
+    """Run one sub-request through the URL map and return ``(status, json)``."""
+    environ = EnvironBuilder(
+        path=path, method=method, json=body,
+        headers={**headers, 'Authorization': request.headers.get('Authorization', '')},
+        environ_base={'REMOTE_ADDR': request.remote_addr,
+                      'HTTP_USER_AGENT': request.headers.get('User-Agent', '')}
+    ).get_environ()
+
+    app = current_app._get_current_object()
+    with app.request_context(environ):
+        try:
+            if request.routing_exception is not None:
+                raise request.routing_exception
+            if request.blueprint not in BATCH_BLUEPRINTS:
+                return 400, {"error": "Endpoint not available in a batch"}
+            # Before-request hooks, e.g. Flask-Limiter charging the endpoint
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = app.dispatch_request()
+        except HTTPException as err:
+            rv = app.handle_user_exception(err)
+        response = app.make_response(rv)
+        return response.status_code, response.get_json(silent=True)
+
+
+@batch_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """Execute an ordered list of sub-requests atomically."""
+    try:
+        operations = batch_schema.load(request.json)['requests']
+    except ValidationError as err:
+        return jsonify({"error": "Validation error", "messages": err.messages}), 400
+
+    limit = current_app.config['BATCH_MAX_REQUESTS']
+    if len(operations) > limit:
+        return jsonify({"error": "Validation error",
+                        "messages": {"requests": [f"At most {limit} sub-requests per batch."]}}), 400
+
+    # The token was checked against the blacklist by ``jwt_required`` above
+    g.batch_jti = get_jwt()['jti']
+    try:
+        return _run_operations(operations)
+    finally:
+        g.pop('batch_jti', None)
+
+
+def _run_operations(operations):
+    """Dispatch the sub-requests in one transaction, stopping at the first failure."""
+    results, names = [], {}
+    with single_commit() as session:
+        for index, op in enumerate(operations):
+            try:
+                path = _resolve(op['path'], results, names)
+                body = _resolve(op.get('body'), results, names)
+            except BatchReferenceError as err:
+                status, payload = 400, {"error": str(err)}
+            else:
+                headers = {key: value for key, value in op.get('headers', {}).items()
+                           if key.lower() not in ('authorization', 'content-type')}
+                status, payload = _dispatch(op['method'], path, body, headers)
+
+            results.append({"id": op.get('id'), "status": status, "body": payload})
+            if 'id' in op:
+                names[op['id']] = index
+            if status >= 400:
+                session.rollback()
+                return jsonify({
+                    "error": "Batch aborted; no changes were committed",
+                    "failed_index": index,
+                    "results": results
+                }), status
+
+    db.session.commit()
+    return jsonify({"results": results}), 200
@@ -4,12 +4,18 @@ from marshmallow import ValidationError
 from app import db
 from app.models.comment import Comment
 from app.models.task import Task
-from app.schemas import comment_schema, comments_schema
+from app.schemas import comment_schema, comment_serializer, comments_serializer
+from app.utils.pagination import paginate_keyset, CursorError
+from app.utils.conditional import conditional_get
+from app.utils.response_cache import cached_response
+from app.utils.idempotency import idempotent
 
 comment_bp = Blueprint('comment', __name__)
 
 @comment_bp.route('/tasks/<int:task_id>/comments', methods=['GET'])
 @jwt_required()
+@conditional_get
+@cached_response()
 def get_task_comments(task_id):
     """Get all comments for a specific task."""
     current_user_id = get_jwt_identity()
@@ -24,13 +30,33 @@ def get_task_comments(task_id):
     if not task:
         return jsonify({"error": "Task not found"}), 404
     
+    # Keyset mode – `?cursor=` (empty for the first page)
+    if 'cursor' in request.args:
+        per_page = max(1, min(request.args.get('per_page', 50, type=int), 100))
+        query = Comment.query.filter_by(task_id=task_id)
+        try:
+            page = paginate_keyset(query, Comment.id, per_page,
+                                   cursor=request.args.get('cursor') or None,
+                                   sort_column=Comment.created_at,
+                                   descending=False, key="created_at:asc")
+        except CursorError as err:
+            return jsonify({"error": str(err)}), 400
+
+        return jsonify({
+            "comments": comments_serializer.dump(page.items),
+            "per_page": per_page,
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor
+        }), 200
+
     # Get comments for the task
     comments = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at).all()
     
-    return jsonify(comments_schema.dump(comments)), 200
+    return jsonify(comments_serializer.dump(comments)), 200
 
 @comment_bp.route('/tasks/<int:task_id>/comments', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_comment(task_id):
     """Create a new comment for a task."""
     current_user_id = get_jwt_identity()
@@ -64,11 +90,12 @@ def create_comment(task_id):
     
     return jsonify({
         "message": "Comment created successfully",
-        "comment": comment_schema.dump(comment)
+        "comment": comment_serializer.dump(comment)
     }), 201
 
 @comment_bp.route('/comments/<int:comment_id>', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_comment(comment_id):
     """Get a specific comment."""
     current_user_id = get_jwt_identity()
@@ -88,7 +115,7 @@ def get_comment(comment_id):
     if not task:
         return jsonify({"error": "You do not have permission to access this comment"}), 403
     
-    return jsonify(comment_schema.dump(comment)), 200
+    return jsonify(comment_serializer.dump(comment)), 200
 
 @comment_bp.route('/comments/<int:comment_id>', methods=['PUT'])
 @jwt_required()
@@ -123,7 +150,7 @@ def update_comment(comment_id):
     
     return jsonify({
         "message": "Comment updated successfully",
-        "comment": comment_schema.dump(comment)
+        "comment": comment_serializer.dump(comment)
     }), 200
 
 @comment_bp.route('/comments/<int:comment_id>', methods=['DELETE'])
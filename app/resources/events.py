@@ -0,0 +1,131 @@
+"""
+GET /api/v1/events – Server-Sent Events stream of the user's changes.
+
+    id: 42
+    event: change
+    data: {"seq": 42, "changes": [{"entity": "task", "id": 7, "op": "changed"}]}
+
+One ``change`` event is sent per committed transaction that touched the
+user's tasks, tags or comments (see ``app/utils/events.py``); ``op`` is
+``changed`` or ``deleted``.  A comment line is sent every
+``EVENTS_HEARTBEAT`` seconds so proxies keep the connection open.
+
+The event id is a ``/sync`` cursor.  A client reconnecting with
+``Last-Event-ID`` (or ``?last_event_id=``) is first sent the events it
+missed, rebuilt from the ``change_seq`` columns and tombstones.  When
+that backlog is too large, the cursor has been compacted, or the client
+falls behind a live stream, it gets a ``resync`` event carrying a cursor
+instead and should catch up through ``GET /api/v1/sync``.
+
+``EventSource`` cannot set headers, so the access token may also be
+passed as ``?jwt=``.  A stream ends when its token expires (or after
+``EVENTS_STREAM_MAX_SECONDS``); the browser reconnects by itself.
+"""
+import queue
+import time
+
+from flask import Blueprint, current_app, request
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+
+from app import db
+from app.models.task import Task
+from app.models.tag import Tag
+from app.models.comment import Comment
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+from app.utils.events import build_events, get_event_broker
+
+events_bp = Blueprint('events', __name__)
+
+
+def _backlog(user_id, since, latest, limit):
+    """
+    ``(user_id, seq, entity, id, op)`` for the changes after ``since``, or
+    None when there are more than ``limit`` of them.
+    """
+    changes = []
+    for model, entity in ((Task, 'task'), (Tag, 'tag'), (Comment, 'comment')):
+        rows = db.session.query(model.change_seq, model.id).filter(
+            model.user_id == user_id, model.change_seq > since, model.change_seq <= latest
+        ).limit(limit + 1).all()
+        changes += [(user_id, seq, entity, row_id, 'changed') for seq, row_id in rows]
+    rows = db.session.query(Tombstone.change_seq, Tombstone.entity, Tombstone.entity_id).filter(
+        Tombstone.user_id == user_id, Tombstone.change_seq > since, Tombstone.change_seq <= latest
+    ).limit(limit + 1).all()
+    changes += [(user_id, seq, entity, entity_id, 'deleted') for seq, entity, entity_id in rows]
+    return changes if len(changes) <= limit else None
+
+
+def _frame(encode, event, name='change'):
+    lines = f"event: {name}\ndata: {encode(event)}\n\n"
+    return f"id: {event['seq']}\n{lines}" if name == 'change' else lines
+
+
+def _stream(subscription, backlog, last_seq, encode, retry_ms, heartbeat, deadline):
+    """Yield the backlog, then live events and heartbeats until the deadline."""
+    yield f"retry: {retry_ms}\n\n"
+    yield from backlog
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            event = subscription.get(timeout=min(heartbeat, remaining))
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        if subscription.lagging:
+            subscription.drain()
+            yield _frame(encode, {'cursor': last_seq}, 'resync')
+            continue
+        # Already sent as part of the backlog
+        if event['seq'] <= last_seq:
+            continue
+        last_seq = event['seq']
+        yield _frame(encode, event)
+
+
+@events_bp.route('/events', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_events():
+    """Stream the current user's change events."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    config = current_app.config
+    encode = current_app.json.dumps
+    broker = get_event_broker()
+    # Subscribe before reading the backlog so nothing falls in between
+    subscription = broker.subscribe(current_user_id)
+
+    row = db.session.query(UserDataVersion.version, UserDataVersion.compacted_seq) \
+                    .filter_by(user_id=current_user_id).first()
+    latest, compacted = row if row else (0, 0)
+
+    backlog = []
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id is not None:
+        since = int(last_event_id) if last_event_id.isdigit() else -1
+        valid = compacted <= since <= latest
+        changes = _backlog(current_user_id, since, latest, config['EVENTS_REPLAY_MAX']) \
+            if valid else None
+        if changes is None:
+            # A null cursor asks for a full sync
+            backlog.append(_frame(encode, {'cursor': since if valid else None}, 'resync'))
+        else:
+            events = build_events(changes, config['EVENTS_MAX_CHANGES'])
+            backlog += [_frame(encode, event) for event in events.get(current_user_id, ())]
+    # The stream holds no database connection while it waits
+    db.session.remove()
+
+    lifetime = min(config['EVENTS_STREAM_MAX_SECONDS'], get_jwt()['exp'] - time.time())
+    response = current_app.response_class(
+        _stream(subscription, backlog, latest, encode, config['EVENTS_RETRY_MS'],
+                config['EVENTS_HEARTBEAT'], time.monotonic() + lifetime),
+        mimetype='text/event-stream'
+    )
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'     # nginx: do not buffer the stream
+    return response
@@ -5,7 +5,9 @@ import csv
 from io import StringIO
 from app.models.task import Task
 from app.models.tag import Tag
-from app.schemas import tasks_schema
+from app.models.archive import ArchivedTask
+from app.schemas import task_serializer
+from app.utils.streaming import stream_json
 
 export_bp = Blueprint('export', __name__)
 
@@ -26,40 +28,45 @@ def export_tasks():
     status = request.args.get('status')
     priority = request.args.get('priority')
     tag_id = request.args.get('tag_id')
+    # Archived tasks follow the live ones, flagged with "archived"
+    include_archived = request.args.get('include_archived', 'false').lower() == 'true'
     
-    # Base query
-    query = Task.query.filter_by(user_id=current_user_id)
-    
-    # Apply filters if provided
-    if status:
-        query = query.filter_by(status=status)
-    if priority:
-        query = query.filter_by(priority=priority)
-    if tag_id:
-        query = query.join(Task.tags).filter(Tag.id == tag_id)
-    
-    # Get all tasks
-    tasks = query.all()
+    # Base queries, with the filters applied to the live and archived tasks alike
+    queries = []
+    for model in (Task, ArchivedTask) if include_archived else (Task,):
+        query = model.query.filter_by(user_id=current_user_id)
+        if status:
+            query = query.filter_by(status=status)
+        if priority:
+            query = query.filter_by(priority=priority)
+        if tag_id:
+            query = query.join(model.tags).filter(Tag.id == tag_id)
+        queries.append(query.order_by(model.id))
     
     if export_format == 'json':
-        # Serialise tasks to JSON
-        serialised_tasks = tasks_schema.dump(tasks)
-        return jsonify(serialised_tasks)
+        # Stream rows straight from a server-side cursor
+        if not include_archived:
+            return stream_json(queries[0], task_serializer.dump)
+        return stream_json(queries, lambda task: {**task_serializer.dump(task),
+                                                  'archived': isinstance(task, ArchivedTask)})
     
     elif export_format == 'csv':
+        tasks = [task for query in queries for task in query.all()]
+        
         # Prepare CSV data
         output = StringIO()
         writer = csv.writer(output)
         
         # Write header row
-        writer.writerow(['ID', 'Title', 'Description', 'Status', 'Priority', 'Due Date', 'Created At', 'Updated At', 'Tags'])
+        header = ['ID', 'Title', 'Description', 'Status', 'Priority', 'Due Date', 'Created At', 'Updated At', 'Tags']
+        writer.writerow(header + ['Archived'] if include_archived else header)
         
         # Write data rows
         for task in tasks:
             # Get tags as comma-separated string
             tags_str = ', '.join([tag.name for tag in task.tags])
             
-            writer.writerow([
+            row = [
                 task.id,
                 task.title,
                 task.description or '',  # Handle None values
@@ -69,7 +76,8 @@ def export_tasks():
                 task.created_at.isoformat(),
                 task.updated_at.isoformat(),
                 tags_str
-            ])
+            ]
+            writer.writerow(row + [isinstance(task, ArchivedTask)] if include_archived else row)
         
         # Prepare response
         response = Response(output.getvalue(), mimetype='text/csv')
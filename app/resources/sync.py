@@ -0,0 +1,139 @@
+"""
+GET /api/v1/sync – what changed since the client last synced.
+
+    GET /api/v1/sync                 full snapshot, plus a cursor
+    GET /api/v1/sync?since=<cursor>  tasks, tags and comments written after
+                                     the cursor, ids deleted after it, and
+                                     the next cursor
+
+The cursor is the user's change sequence (``UserDataVersion.version``).
+Every transaction that writes a user's data takes the next number and
+stamps it into the rows it writes (``change_seq``) and into tombstones
+for the rows it deletes, so a sync is four range scans on
+``(user_id, change_seq)`` indexes however long the client was offline.
+
+Pages end on a sequence boundary, so a transaction is never split across
+two pages; ``has_more`` asks the client to call again with the returned
+cursor.  A cursor older than the compacted tombstones (see the
+``compact-tombstones`` command) is answered with 410: deletions may have
+been forgotten and the client has to start again from a full sync.
+"""
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from marshmallow import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import lazyload
+
+from app import db
+from app.models.task import Task
+from app.models.tag import Tag, task_tags
+from app.models.comment import Comment
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+from app.schemas import (
+    sync_query_schema, sync_tasks_schema, sync_comments_schema, tags_serializer
+)
+
+sync_bp = Blueprint('sync', __name__)
+
+
+def _sources(user_id, include_deleted):
+    """``{name: (model, query)}`` for the rows a sync page is assembled from."""
+    sources = {
+        'tasks': (Task, Task.query.options(lazyload(Task.tags))),
+        'tags': (Tag, Tag.query.options(lazyload(Tag.tasks))),
+        'comments': (Comment, Comment.query),
+    }
+    if include_deleted:
+        sources['deleted'] = (Tombstone, Tombstone.query)
+    return {name: (model, query.filter(model.user_id == user_id))
+            for name, (model, query) in sources.items()}
+
+
+def _changes(model, query, since, upto, limit=None):
+    """Rows with ``since < change_seq <= upto`` in sequence order."""
+    query = query.filter(model.change_seq > since, model.change_seq <= upto) \
+                 .order_by(model.change_seq, model.id)
+    return query.limit(limit).all() if limit is not None else query.all()
+
+
+def _tag_ids(task_ids):
+    """Tag ids per task, for the tasks on a page."""
+    tag_ids = {task_id: [] for task_id in task_ids}
+    if task_ids:
+        rows = db.session.execute(
+            select(task_tags.c.task_id, task_tags.c.tag_id)
+            .where(task_tags.c.task_id.in_(task_ids))
+            .order_by(task_tags.c.task_id, task_tags.c.tag_id))
+        for task_id, tag_id in rows:
+            tag_ids[task_id].append(tag_id)
+    return tag_ids
+
+
+@sync_bp.route('/sync', methods=['GET'])
+@jwt_required()
+def sync():
+    """Return the current user's changes since a cursor."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        args = sync_query_schema.load(request.args)
+    except ValidationError as err:
+        return jsonify({"error": "Invalid query parameters",
+                        "messages": err.messages}), 400
+
+    row = db.session.query(UserDataVersion.version, UserDataVersion.compacted_seq) \
+                    .filter_by(user_id=current_user_id).first()
+    latest, compacted = row if row else (0, 0)
+
+    since = args.get('since')
+    if since is not None and since > latest:
+        return jsonify({"error": "Invalid cursor"}), 400
+    if since is not None and since < compacted:
+        return jsonify({"error": "Cursor has expired; a full sync is required",
+                        "resync": True}), 410
+
+    # A full sync starts below the rows written before sequences existed
+    lower = since if since is not None else -1
+    limit = args.get('limit', current_app.config['SYNC_PAGE_SIZE'])
+    sources = _sources(current_user_id, include_deleted=since is not None)
+    pages = {name: _changes(*source, lower, latest, limit + 1)
+             for name, source in sources.items()}
+
+    # Each source is complete below the first row it did not return
+    cutoffs = [rows[limit].change_seq for rows in pages.values() if len(rows) > limit]
+    upto = latest
+    if cutoffs:
+        upto = min(cutoffs) - 1
+        if upto <= lower:
+            # One transaction wrote more than a page: return it whole
+            upto = min(cutoffs)
+            pages = {name: _changes(*source, lower, upto)
+                     for name, source in sources.items()}
+    pages = {name: [item for item in rows if item.change_seq <= upto]
+             for name, rows in pages.items()}
+
+    tasks = sync_tasks_schema.dump(pages['tasks'])
+    tag_ids = _tag_ids([task['id'] for task in tasks])
+    for task in tasks:
+        task['tag_ids'] = tag_ids[task['id']]
+
+    # An id deleted and then reused is live again: the row wins
+    live = {'task': {task['id'] for task in tasks},
+            'tag': {tag.id for tag in pages['tags']},
+            'comment': {comment.id for comment in pages['comments']}}
+    deleted = {'tasks': [], 'tags': [], 'comments': []}
+    for tombstone in pages.get('deleted', ()):
+        if tombstone.entity_id not in live[tombstone.entity]:
+            deleted[tombstone.entity + 's'].append(tombstone.entity_id)
+
+    return jsonify({
+        "cursor": upto,
+        "has_more": upto < latest,
+        "tasks": tasks,
+        "tags": tags_serializer.dump(pages['tags']),
+        "comments": sync_comments_schema.dump(pages['comments']),
+        "deleted": deleted
+    }), 200
@@ -3,12 +3,18 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
 from app import db
 from app.models.tag import Tag
-from app.schemas import tag_schema, tags_schema
+from app.models.archive import archived_task_tags
+from app.schemas import tag_schema, tag_serializer, tags_serializer
+from app.utils.conditional import conditional_get
+from app.utils.response_cache import cached_response
+from app.utils.idempotency import idempotent
 
 tag_bp = Blueprint('tag', __name__)
 
 @tag_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get
+@cached_response()
 def get_tags():
     """Get all tags for the current user."""
     current_user_id = get_jwt_identity()
@@ -19,10 +25,11 @@ def get_tags():
     
     tags = Tag.query.filter_by(user_id=current_user_id).all()
     
-    return jsonify(tags_schema.dump(tags)), 200
+    return jsonify(tags_serializer.dump(tags)), 200
 
 @tag_bp.route('/<int:tag_id>', methods=['GET'])
 @jwt_required()
+@conditional_get
 def get_tag(tag_id):
     """Get a specific tag."""
     current_user_id = get_jwt_identity()
@@ -36,10 +43,11 @@ def get_tag(tag_id):
     if not tag:
         return jsonify({"error": "Tag not found"}), 404
     
-    return jsonify(tag_schema.dump(tag)), 200
+    return jsonify(tag_serializer.dump(tag)), 200
 
 @tag_bp.route('', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_tag():
     """Create a new tag."""
     current_user_id = get_jwt_identity()
@@ -72,7 +80,7 @@ def create_tag():
     
     return jsonify({
         "message": "Tag created successfully",
-        "tag": tag_schema.dump(tag)
+        "tag": tag_serializer.dump(tag)
     }), 201
 
 @tag_bp.route('/<int:tag_id>', methods=['PUT'])
@@ -112,7 +120,7 @@ def update_tag(tag_id):
     
     return jsonify({
         "message": "Tag updated successfully",
-        "tag": tag_schema.dump(tag)
+        "tag": tag_serializer.dump(tag)
     }), 200
 
 @tag_bp.route('/<int:tag_id>', methods=['DELETE'])
@@ -131,6 +139,7 @@ def delete_tag(tag_id):
         return jsonify({"error": "Tag not found"}), 404
     
     # Remove tag from database
+    db.session.execute(archived_task_tags.delete().where(archived_task_tags.c.tag_id == tag.id))
     db.session.delete(tag)
     db.session.commit()
     
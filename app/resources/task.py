@@ -1,18 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
-from datetime import datetime
-from sqlalchemy import desc, asc, or_
-from sqlalchemy.orm import selectinload, joinedload
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import (
+    desc, asc, func, case, and_, or_, tuple_, literal, select, insert, update, delete, union_all
+)
+from sqlalchemy.orm import selectinload, joinedload, load_only, lazyload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.exc import IntegrityError
+from werkzeug.http import quote_etag
 
 from app import db
 from app.models.task import Task
-from app.models.tag import Tag
+from app.models.comment import Comment
+from app.models.tag import Tag, task_tags
+from app.models.task_counter import TaskCounter
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+from app.models.archive import ArchivedTask, archived_task_tags
 from app.models.activity_log import ActivityType
 from app.schemas import (
     task_schema, tasks_schema, task_query_schema,
-    task_bulk_delete_schema, task_bulk_update_schema
+    task_bulk_create_schema, task_bulk_delete_schema, task_bulk_update_schema,
+    task_fieldset_schema, task_calendar_query_schema, task_batch_schema,
+    task_tag_schema, task_serializer, tasks_serializer, comments_serializer
 )
+from app.schemas.task import TaskSchema
+from app.schemas.compiled import compile_schema
+from app.utils.pagination import paginate_keyset, CursorError
+from app.utils.search import apply_search, highlight
+from app.utils.trigram import trigram_search
+from app.utils.tag_filter import apply_tag_filter
+from app.utils.facets import facet_counts
+from app.utils.sql import chunked
+from app.utils.conditional import conditional_get
+from app.utils.response_cache import cached_response
+from app.utils.idempotency import idempotent
+from app.utils.events import queue_changes
 
 # **NEW IMPORTS FOR LOGGING**
 from app.utils.activity_logger import (
@@ -27,6 +53,8 @@ task_bp = Blueprint('task', __name__)
 # ---------------------------------------------------------------------- #
 @task_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get
+@cached_response(task_query_schema)
 def get_tasks():
     """Get all tasks for the current user."""
     current_user_id = get_jwt_identity()
@@ -41,37 +69,156 @@ def get_tasks():
         return jsonify({"error": "Invalid query parameters",
                         "messages": err.messages}), 400
 
-    query = Task.query.options(selectinload(Task.tags)) \
-                       .filter_by(user_id=current_user_id)
+    trigram_mode = q.get('search_mode') == 'trigram'
+    if trigram_mode and 'search' not in q:
+        return jsonify({"error": "search_mode=trigram requires a search term"}), 400
+    if trigram_mode and 'facets' in q:
+        return jsonify({"error": "facets are not supported with search_mode=trigram"}), 400
+
+    if q.get('include_archived'):
+        if set(q) & {'search', 'tags', 'facets'} or 'cursor' in request.args \
+                or q.get('sort_by') == 'relevance':
+            return jsonify({"error": "include_archived is not supported with search, "
+                                     "tags, facets, sort_by=relevance or cursor pagination"}), 400
+        return _list_with_archive(current_user_id, q)
+
+    fieldset = q.get('fieldset')
+    query = Task.query.filter_by(user_id=current_user_id)
 
     if 'status' in q:    query = query.filter_by(status=q['status'])
     if 'priority' in q:  query = query.filter_by(priority=q['priority'])
-    if 'search' in q:
-        term = f"%{q['search']}%"
-        query = query.filter(or_(Task.title.ilike(term),
-                                 Task.description.ilike(term)))
+    relevance = None
+    if 'search' in q and not trigram_mode:
+        query, relevance = apply_search(query, q['search'])
     if 'tag' in q:
         query = query.join(Task.tags).filter(Tag.id == q['tag'])
+    if 'tags' in q:
+        query = apply_tag_filter(query, current_user_id, q['tags'],
+                                 q.get('tag_mode', 'any'))
     if 'due_before' in q: query = query.filter(Task.due_date <= q['due_before'])
     if 'due_after' in q:  query = query.filter(Task.due_date >= q['due_after'])
 
-    sort_attr = getattr(Task, q.get('sort_by', 'created_at'))
-    query = query.order_by(desc(sort_attr) if q.get('sort_order', 'desc') == 'desc'
-                           else asc(sort_attr))
+    # Facet counts over the filtered set, in one statement
+    facets = facet_counts(query, q['facets']) if 'facets' in q else None
+
+    per_page   = q.get('per_page', 10)
+
+    # Typo-tolerant mode pages through the matches by similarity
+    if trigram_mode:
+        page = q.get('page', 1)
+        matches, total, truncated = trigram_search(
+            query, current_user_id, q['search'], q.get('min_similarity', 0.3),
+            page, per_page, _projection(fieldset))
+        tasks = _schema_for(fieldset, many=True).dump([task for task, _ in matches])
+        for task, (_, score) in zip(tasks, matches):
+            task['similarity'] = round(score, 3)
+        return jsonify({
+            "tasks": tasks,
+            "total": total,
+            "pages": (total + per_page - 1) // per_page,
+            "page": page,
+            "per_page": per_page,
+            # More tasks may match than the candidate cap let through
+            "truncated": truncated
+        }), 200
+
+    sort_by    = q.get('sort_by', 'created_at')
+    sort_order = q.get('sort_order', 'desc')
+    if sort_by == 'relevance':
+        if 'search' not in q:
+            return jsonify({"error": "sort_by=relevance requires a search term"}), 400
+        if 'cursor' in request.args:
+            return jsonify({"error": "sort_by=relevance is not supported "
+                                     "with cursor pagination"}), 400
+        # Backends without ranking keep the default ordering
+        sort_attr = relevance if relevance is not None else Task.created_at
+    else:
+        sort_attr = getattr(Task, sort_by)
+    # The sort column is read back to build cursors, so always load it
+    query = query.options(*_projection(
+        fieldset, *([sort_attr] if sort_by != 'relevance' else [])))
+    include_total = q.get('include_total', True)
+    total      = None
+    if include_total:
+        # Plain status/priority listings are answered from the counters table
+        if set(q) & {'search', 'tag', 'tags', 'due_before', 'due_after'}:
+            total = query.count()
+        else:
+            total = TaskCounter.total(current_user_id,
+                                      status=q.get('status'),
+                                      priority=q.get('priority'))
+
+    # Keyset mode – `?cursor=` (empty for the first page) switches it on
+    if 'cursor' in request.args:
+        try:
+            result = paginate_keyset(query, Task.id, per_page,
+                                     cursor=q.get('cursor'),
+                                     sort_column=sort_attr,
+                                     descending=sort_order == 'desc',
+                                     key=f"{sort_by}:{sort_order}")
+        except CursorError as err:
+            return jsonify({"error": str(err)}), 400
+
+        body = {
+            "tasks": _dump_tasks(result.items, fieldset, q.get('search')),
+            "per_page": per_page,
+            "next_cursor": result.next_cursor,
+            "prev_cursor": result.prev_cursor
+        }
+        if include_total:
+            body["total"] = total
+        if facets is not None:
+            body["facets"] = facets
+        return jsonify(body), 200
+
+    direction = desc if sort_order == 'desc' else asc
+    query = query.order_by(direction(sort_attr))
+    if sort_by == 'relevance':
+        query = query.order_by(direction(Task.id))
 
     page      = q.get('page', 1)
-    per_page  = q.get('per_page', 10)
-    total     = query.count()
     items     = query.limit(per_page).offset((page-1)*per_page).all()
-    pages     = (total + per_page - 1) // per_page
 
-    return jsonify({
-        "tasks": tasks_schema.dump(items),
-        "total": total,
-        "pages": pages,
+    body = {
+        "tasks": _dump_tasks(items, fieldset, q.get('search')),
         "page": page,
         "per_page": per_page
-    }), 200
+    }
+    if include_total:
+        body["total"] = total
+        body["pages"] = (total + per_page - 1) // per_page
+    if facets is not None:
+        body["facets"] = facets
+    return jsonify(body), 200
+
+# ---------------------------------------------------------------------- #
+# Sparse fieldsets – ?fields=id,title&include=tags
+# ---------------------------------------------------------------------- #
+@lru_cache(maxsize=128)
+def _schema_for(fieldset, many=False):
+    """Compiled TaskSchema serializer restricted to `fieldset` (cached per fieldset)."""
+    if fieldset is None:
+        return tasks_serializer if many else task_serializer
+    return compile_schema(TaskSchema(only=fieldset, many=many))
+
+def _projection(fieldset, *extra_columns):
+    """Loader options: only the requested columns, tags only when asked for."""
+    if fieldset is None:
+        return [selectinload(Task.tags)]
+    columns = [getattr(Task, name) for name in fieldset if name != 'tags']
+    return [
+        load_only(*columns, *extra_columns),
+        selectinload(Task.tags) if 'tags' in fieldset else lazyload(Task.tags)
+    ]
+
+def _dump_tasks(items, fieldset=None, search=None):
+    """Serialise a page of tasks, adding highlighted snippets for searches."""
+    data = _schema_for(fieldset, many=True).dump(items)
+    if search:
+        snippets = highlight(search, [task.id for task in items])
+        for task in data:
+            task['snippet'] = snippets.get(task['id'])
+    return data
 
 @task_bp.route('/<int:task_id>', methods=['GET'])
 @jwt_required()
@@ -81,22 +228,351 @@ def get_task(task_id):
     if isinstance(current_user_id, str):
         current_user_id = int(current_user_id)
 
+    raw = {k: v for k, v in request.args.items()
+           if v and k in ('fields', 'include')}
+    try:
+        fieldset = task_fieldset_schema.load(raw).get('fieldset')
+    except ValidationError as err:
+        return jsonify({"error": "Invalid query parameters",
+                        "messages": err.messages}), 400
+
+    if fieldset is None:
+        options = [joinedload(Task.tags), joinedload(Task.comments)]
+    else:
+        options = _projection(fieldset, Task.version, Task.updated_at)
+
     task = (
         Task.query
-            .options(joinedload(Task.tags), joinedload(Task.comments))
+            .options(*options)
             .filter_by(id=task_id, user_id=current_user_id)
             .first()
     )
     if not task:
         return jsonify({"error": "Task not found"}), 404
 
-    return jsonify(task_schema.dump(task)), 200
+    # Validated by the task's own ETag rather than the user's data version
+    etag = _task_etag(task)
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(jsonify(_schema_for(fieldset).dump(task)), 200)
+    response.set_etag(etag)
+    if task.updated_at is not None:
+        response.last_modified = task.updated_at
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+# ---------------------------------------------------------------------- #
+# Batch fetch – many tasks by id in a fixed number of round trips
+# ---------------------------------------------------------------------- #
+def _comment_previews(task_ids, limit):
+    """Newest `limit` comments and the comment count of each task, in one query."""
+    ranked = select(
+        Comment.id,
+        func.row_number().over(partition_by=Comment.task_id,
+                               order_by=(Comment.created_at.desc(), Comment.id.desc())).label('rank'),
+        func.count().over(partition_by=Comment.task_id).label('total')
+    ).where(Comment.task_id.in_(task_ids)).subquery()
+    rows = (
+        db.session.query(Comment, ranked.c.total)
+            .join(ranked, ranked.c.id == Comment.id)
+            .filter(ranked.c.rank <= limit)
+            .options(joinedload(Comment.user))
+            .order_by(Comment.task_id, ranked.c.rank)
+    )
+
+    previews = {}
+    for comment, total in rows:
+        preview = previews.setdefault(comment.task_id, {"count": total, "items": []})
+        preview['items'].append(comment)
+    return previews
+
+def _batch_response(raw):
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        q = task_batch_schema.load(raw)
+    except ValidationError as err:
+        return jsonify({"error": "Validation error", "messages": err.messages}), 400
+
+    ids = list(dict.fromkeys(q['ids']))
+    fieldset = q.get('fieldset')
+    tasks = (
+        Task.query
+            .options(*_projection(fieldset))
+            .filter(Task.user_id == current_user_id, Task.id.in_(ids))
+            .all()
+    )
+
+    data = {task['id']: task for task in _schema_for(fieldset, many=True).dump(tasks)}
+    limit = q.get('comments', 0)
+    if limit and data:
+        previews = _comment_previews(list(data), limit)
+        for task_id, task in data.items():
+            preview = previews.get(task_id, {"count": 0, "items": []})
+            task['comment_count'] = preview['count']
+            task['comments'] = comments_serializer.dump(preview['items'])
+
+    return jsonify({
+        "tasks": {str(task_id): data[task_id] for task_id in ids if task_id in data},
+        "missing": [task_id for task_id in ids if task_id not in data]
+    }), 200
+
+@task_bp.route('/batch', methods=['GET'])
+@jwt_required()
+@conditional_get
+def get_tasks_batch():
+    """Get many tasks by id: ?ids=1,2,3."""
+    raw = {k: v for k, v in request.args.items()
+           if v and k in ('ids', 'fields', 'include', 'comments')}
+    return _batch_response(raw)
+
+@task_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def post_tasks_batch():
+    """Get many tasks by id, for id lists too long for a query string."""
+    return _batch_response(request.get_json(silent=True) or {})
+
+# ---------------------------------------------------------------------- #
+# Statistics – counters table plus index-only due-date counts
+# ---------------------------------------------------------------------- #
+STATUSES = ('pending', 'in_progress', 'completed')
+PRIORITIES = ('low', 'medium', 'high')
+OPEN_STATUSES = ('pending', 'in_progress')
+UPCOMING_DAYS = 7
+
+def _statistics_clock():
+    """Overdue/due counts move with time: revalidate at most once a minute."""
+    return datetime.utcnow().strftime('%Y%m%d%H%M')
+
+@task_bp.route('/statistics', methods=['GET'])
+@jwt_required()
+@conditional_get(vary=_statistics_clock)
+def get_task_statistics():
+    """Get task statistics for the current user."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    # Status / priority totals – at most nine counter rows
+    by_status = dict.fromkeys(STATUSES, 0)
+    by_priority = dict.fromkeys(PRIORITIES, 0)
+    for (status, priority), count in TaskCounter.breakdown(current_user_id).items():
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+    total = sum(by_status.values())
+
+    # Tag counts straight from the (tag_id, task_id) index
+    by_tag = dict(
+        db.session.query(Tag.name, func.count(task_tags.c.task_id))
+                  .outerjoin(task_tags, task_tags.c.tag_id == Tag.id)
+                  .filter(Tag.user_id == current_user_id)
+                  .group_by(Tag.id, Tag.name)
+                  .all()
+    )
+
+    # Open tasks by due date – one range scan of (user_id, status, due_date)
+    now = datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow = today + timedelta(days=1)
+    soon = now + timedelta(days=UPCOMING_DAYS)
+    overdue, due_today, upcoming = db.session.query(
+        func.count(case((Task.due_date < now, 1))),
+        func.count(case((and_(Task.due_date >= today, Task.due_date < tomorrow), 1))),
+        func.count(case((and_(Task.due_date >= now, Task.due_date < soon), 1)))
+    ).filter(
+        Task.user_id == current_user_id,
+        Task.status.in_(OPEN_STATUSES),
+        Task.due_date < max(soon, tomorrow)
+    ).one()
+
+    return jsonify({
+        "total_tasks": total,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_tag": by_tag,
+        "overdue_tasks": overdue,
+        "due_today": due_today,
+        "upcoming_tasks": upcoming,
+        "completion_rate": round(by_status['completed'] / total, 4) if total else 0.0
+    }), 200
+
+# ---------------------------------------------------------------------- #
+# Calendar – per-bucket counts and first N summaries in one windowed query
+# ---------------------------------------------------------------------- #
+def _due_bucket(bucket):
+    """SQL expression for the start of the day/week (Monday) a task is due in."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.date_trunc(bucket, Task.due_date)
+    if bucket == 'week':
+        return func.date(Task.due_date, 'weekday 0', '-6 days')
+    return func.date(Task.due_date)
+
+def _bucket_key(value):
+    return value.date().isoformat() if isinstance(value, datetime) else str(value)[:10]
+
+@task_bp.route('/calendar', methods=['GET'])
+@jwt_required()
+@conditional_get
+def get_task_calendar():
+    """Get tasks grouped by due day or week."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        q = task_calendar_query_schema.load(request.args.to_dict())
+    except ValidationError as err:
+        return jsonify({"error": "Invalid query parameters",
+                        "messages": err.messages}), 400
+
+    bucket_by = q.get('bucket', 'day')
+    limit = q.get('limit', 5)
+    start = datetime.combine(q['start'], datetime.min.time())
+    end = datetime.combine(q['end'] + timedelta(days=1), datetime.min.time())
+
+    # Range scan of (user_id, due_date); the window functions rank and count
+    # each bucket so only the first `limit` rows per bucket leave the database
+    bucket = _due_bucket(bucket_by)
+    ranked = select(
+        Task.id, Task.title, Task.status, Task.priority, Task.due_date,
+        bucket.label('bucket'),
+        func.row_number().over(partition_by=bucket,
+                               order_by=(Task.due_date, Task.id)).label('rank'),
+        func.count().over(partition_by=bucket).label('bucket_count')
+    ).where(
+        Task.user_id == current_user_id,
+        Task.due_date >= start,
+        Task.due_date < end
+    ).subquery()
+    rows = db.session.execute(
+        select(ranked)
+        .where(ranked.c.rank <= max(limit, 1))
+        .order_by(ranked.c.bucket, ranked.c.rank)
+    )
+
+    buckets = []
+    for row in rows:
+        key = _bucket_key(row.bucket)
+        if not buckets or buckets[-1]['start'] != key:
+            buckets.append({"start": key, "count": row.bucket_count, "tasks": []})
+        if row.rank <= limit:
+            buckets[-1]['tasks'].append({
+                "id": row.id,
+                "title": row.title,
+                "status": row.status,
+                "priority": row.priority,
+                "due_date": row.due_date.isoformat()
+            })
+
+    return jsonify({
+        "from": q['start'].isoformat(),
+        "to": q['end'].isoformat(),
+        "bucket": bucket_by,
+        "buckets": buckets
+    }), 200
 
 # ---------------------------------------------------------------------- #
 # Create / update / delete – now with @log_activity
 # ---------------------------------------------------------------------- #
+def _owned_tags(user_id, tag_ids):
+    """The user's tags with the given ids, or None if any of them is missing."""
+    wanted = set(tag_ids or ())
+    if not wanted:
+        return []
+    # Tag.tasks is selectin-loaded by default; attaching needs none of it
+    tags = Tag.query.options(lazyload(Tag.tasks)) \
+                    .filter(Tag.id.in_(wanted), Tag.user_id == user_id).all()
+    return tags if len(tags) == len(wanted) else None
+
+def _load_task(task_id, user_id):
+    """One of the user's tasks with its tags loaded (but not the tags' tasks)."""
+    return (
+        Task.query
+            .options(selectinload(Task.tags).lazyload(Tag.tasks))
+            .filter_by(id=task_id, user_id=user_id)
+            .first()
+    )
+
+def _task_etag(task):
+    """
+    ETag of a task's representation: its version, plus a digest of the
+    embedded tags when they are loaded, since renaming or recolouring a
+    tag changes the representation without touching the task.
+    """
+    tags = task.__dict__.get('tags')
+    if not tags:
+        return str(task.version)
+    digest = zlib.crc32(repr(sorted((tag.id, tag.name, tag.color) for tag in tags)).encode())
+    return f"{task.version}.{digest:08x}"
+
+def _task_response(body, status, task):
+    """A single-task JSON response carrying the task's ETag."""
+    return jsonify(body), status, {"ETag": quote_etag(_task_etag(task))}
+
+def _precondition_failed(version):
+    """412 response for a write whose If-Match does not name ``version``."""
+    return jsonify({
+        "error": "Precondition failed: the task has been modified",
+        "version": version
+    }), 412, {"ETag": quote_etag(str(version))}
+
+def _check_if_match(task):
+    """
+    None when the request's If-Match (if any) names the task's version.
+    Only the version part of an ETag counts: tag edits do not fail writes.
+    """
+    if_match = request.if_match
+    if if_match and not if_match.star_tag and str(task.version) not in {
+            etag.partition('.')[0] for etag in if_match.as_set()}:
+        return _precondition_failed(task.version)
+    return None
+
+def _flush_or_conflict(task_id):
+    """
+    Flush pending task writes.  The versioned UPDATE/DELETE matches no row
+    if another request changed the task since it was loaded: answer 412
+    (or 404 if it is gone) instead of overwriting.
+    """
+    try:
+        db.session.flush()
+    except StaleDataError:
+        db.session.rollback()
+        version = db.session.query(Task.version).filter_by(id=task_id).scalar()
+        if version is None:
+            return jsonify({"error": "Task not found"}), 404
+        return _precondition_failed(version)
+    return None
+
+def _change_tags(task, user_id, replace=None, add=(), remove=()):
+    """
+    Bring a task's tags to ``replace`` (default: unchanged) plus ``add``
+    minus ``remove``.  Only the tags being attached are loaded, and the
+    flush issues one INSERT/DELETE per ``task_tags`` row that actually
+    changes.  Returns False, changing nothing, if a tag to attach is not
+    one of the user's.
+    """
+    current = {tag.id: tag for tag in task.tags}
+    target = set(current) if replace is None else set(replace)
+    target = (target | set(add)) - set(remove)
+
+    attach = _owned_tags(user_id, target - current.keys())
+    if attach is None:
+        return False
+    detach = [tag for tag_id, tag in current.items() if tag_id not in target]
+
+    for tag in detach:
+        task.tags.remove(tag)
+    task.tags.extend(attach)
+    if attach or detach:
+        task.updated_at = datetime.utcnow()
+    return True
+
 @task_bp.route('', methods=['POST'])
 @jwt_required()
+@idempotent
 @log_activity(               # <-- NEW
     activity_type=ActivityType.TASK_CREATE,
     entity_type="task",
@@ -114,6 +590,11 @@ def create_task():
         return jsonify({"error": "Validation error",
                         "messages": err.messages}), 400
 
+    # Resolve the tags before writing anything, so a bad id leaves no task behind
+    tags = _owned_tags(current_user_id, data.get('tag_ids'))
+    if tags is None:
+        return jsonify({"error": "One or more tags not found"}), 404
+
     task = Task(
         title=data['title'],
         user_id=current_user_id,
@@ -122,25 +603,18 @@ def create_task():
         priority=data.get('priority', 'medium'),
         due_date=data.get('due_date')
     )
+    task.tags = tags
     db.session.add(task)
-    db.session.commit()
 
-    # Handle tags if supplied
-    if data.get('tag_ids'):
-        tags = Tag.query.filter(
-            Tag.id.in_(data['tag_ids']),
-            Tag.user_id == current_user_id
-        ).all()
-        if len(tags) != len(data['tag_ids']):
-            return jsonify({"error": "One or more tags not found"}), 404
-        task.tags.extend(tags)
-        db.session.commit()
-
-    task = Task.query.options(joinedload(Task.tags)).get(task.id)
-    return jsonify({
+    # One flush inserts the task (id via RETURNING where supported) and its
+    # task_tags rows; every field is then known, so dump before committing
+    db.session.flush()
+    body = task_serializer.dump(task)
+    db.session.commit()
+    return _task_response({
         "message": "Task created successfully",
-        "task": task_schema.dump(task)
-    }), 201
+        "task": body
+    }, 201, task)
 
 
 @task_bp.route('/<int:task_id>', methods=['PUT'])
@@ -156,9 +630,12 @@ def update_task(task_id):
     if isinstance(current_user_id, str):
         current_user_id = int(current_user_id)
 
-    task = Task.query.filter_by(id=task_id, user_id=current_user_id).first()
+    task = _load_task(task_id, current_user_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
+    conflict = _check_if_match(task)
+    if conflict:
+        return conflict
 
     try:
         data = task_schema.load(request.json, partial=True)
@@ -166,29 +643,98 @@ def update_task(task_id):
         return jsonify({"error": "Validation error",
                         "messages": err.messages}), 400
 
+    # Tags first: an unknown tag id must leave the task untouched
+    if not _change_tags(task, current_user_id, data.get('tag_ids'),
+                        data.get('add_tag_ids', ()), data.get('remove_tag_ids', ())):
+        return jsonify({"error": "One or more tags not found"}), 404
+
     for field in ('title', 'description', 'status',
                   'priority', 'due_date'):
         if field in data:
             setattr(task, field, data[field])
 
-    # Tags
-    if 'tag_ids' in data:
-        task.tags = []
-        if data['tag_ids']:
-            tags = Tag.query.filter(
-                Tag.id.in_(data['tag_ids']),
-                Tag.user_id == current_user_id
-            ).all()
-            if len(tags) != len(data['tag_ids']):
-                return jsonify({"error": "One or more tags not found"}), 404
-            task.tags.extend(tags)
-
+    conflict = _flush_or_conflict(task_id)
+    if conflict:
+        return conflict
+    body = task_serializer.dump(task)
     db.session.commit()
-    task = Task.query.options(joinedload(Task.tags)).get(task.id)
-    return jsonify({
+    return _task_response({
         "message": "Task updated successfully",
-        "task": task_schema.dump(task)
-    }), 200
+        "task": body
+    }, 200, task)
+
+
+@task_bp.route('/<int:task_id>/tags', methods=['POST'])
+@jwt_required()
+@log_activity(
+    activity_type=ActivityType.TAG_ADDED_TO_TASK,
+    entity_type="task",
+    get_entity_id="task_id"
+)
+def add_task_tag(task_id):
+    """Attach one tag to a task."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        data = task_tag_schema.load(request.json)
+    except ValidationError as err:
+        return jsonify({"error": "Validation error",
+                        "messages": err.messages}), 400
+
+    task = _load_task(task_id, current_user_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    conflict = _check_if_match(task)
+    if conflict:
+        return conflict
+    if not _change_tags(task, current_user_id, add=[data['tag_id']]):
+        return jsonify({"error": "Tag not found"}), 404
+
+    conflict = _flush_or_conflict(task_id)
+    if conflict:
+        return conflict
+    body = task_serializer.dump(task)
+    db.session.commit()
+    return _task_response({
+        "message": "Tag added to task successfully",
+        "task": body
+    }, 200, task)
+
+
+@task_bp.route('/<int:task_id>/tags/<int:tag_id>', methods=['DELETE'])
+@jwt_required()
+@log_activity(
+    activity_type=ActivityType.TAG_REMOVED_FROM_TASK,
+    entity_type="task",
+    get_entity_id="task_id"
+)
+def remove_task_tag(task_id, tag_id):
+    """Detach one tag from a task."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    task = _load_task(task_id, current_user_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    conflict = _check_if_match(task)
+    if conflict:
+        return conflict
+    if tag_id not in {tag.id for tag in task.tags}:
+        return jsonify({"error": "Tag not found on task"}), 404
+
+    _change_tags(task, current_user_id, remove=[tag_id])
+    conflict = _flush_or_conflict(task_id)
+    if conflict:
+        return conflict
+    body = task_serializer.dump(task)
+    db.session.commit()
+    return _task_response({
+        "message": "Tag removed from task successfully",
+        "task": body
+    }, 200, task)
 
 
 @task_bp.route('/<int:task_id>', methods=['DELETE'])
@@ -207,19 +753,126 @@ def delete_task(task_id):
     task = Task.query.filter_by(id=task_id, user_id=current_user_id).first()
     if not task:
         return jsonify({"error": "Task not found"}), 404
+    conflict = _check_if_match(task)
+    if conflict:
+        return conflict
 
     db.session.delete(task)
+    conflict = _flush_or_conflict(task_id)
+    if conflict:
+        return conflict
     db.session.commit()
     return jsonify({"message": "Task deleted successfully"}), 200
 
 # ---------------------------------------------------------------------- #
 # Bulk operations – activity logged once per call
 # ---------------------------------------------------------------------- #
+def _record_bulk_changes(user_id, deltas):
+    """
+    Statement-level writes bypass the ORM events that maintain the counters
+    and the data version: apply the counter deltas and take the user's
+    change sequence (which the in-process search and tag indexes follow).
+    """
+    TaskCounter.adjust_many(user_id, deltas)
+    UserDataVersion.change_seq(user_id)
+
+@task_bp.route('/bulk/create', methods=['POST'])
+@jwt_required()
+@idempotent
+@log_activity(ActivityType.TASK_BULK_CREATE, entity_type="task")
+def bulk_create_tasks():
+    """Create many tasks; valid items are inserted, invalid ones reported."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        items = task_bulk_create_schema.load(request.json)['tasks']
+    except ValidationError as err:
+        return jsonify({"error": "Validation error",
+                        "messages": err.messages}), 400
+
+    limit = current_app.config['BULK_CREATE_MAX_TASKS']
+    if len(items) > limit:
+        return jsonify({"error": "Validation error",
+                        "messages": {"tasks": [f"At most {limit} tasks per request."]}}), 400
+
+    try:
+        loaded, errors = tasks_schema.load(items), {}
+    except ValidationError as err:
+        loaded, errors = err.valid_data, err.messages
+
+    # One ownership query for every tag named anywhere in the payload
+    wanted = {tag_id for index, data in enumerate(loaded) if index not in errors
+              for tag_id in data.get('tag_ids', ())}
+    owned = {tag_id for (tag_id,) in db.session.query(Tag.id).filter(
+        Tag.id.in_(wanted), Tag.user_id == current_user_id)} if wanted else set()
+
+    rows, row_tags, indexes = [], [], []
+    for index, data in enumerate(loaded):
+        if index in errors:
+            continue
+        tag_ids = set(data.get('tag_ids', ()))
+        if not tag_ids <= owned:
+            errors[index] = {"tag_ids": ["One or more tags not found."]}
+            continue
+        rows.append({
+            'title': data['title'],
+            'description': data.get('description'),
+            'status': data.get('status', 'pending'),
+            'priority': data.get('priority', 'medium'),
+            'due_date': data.get('due_date'),
+            'user_id': current_user_id
+        })
+        row_tags.append(sorted(tag_ids))
+        indexes.append(index)
+
+    results = {index: {"index": index, "errors": messages}
+               for index, messages in errors.items()}
+    if not rows:
+        return jsonify({"error": "Validation error",
+                        "results": [results[i] for i in sorted(results)]}), 400
+
+    seq = UserDataVersion.change_seq(current_user_id)
+    for row in rows:
+        row['change_seq'] = seq
+
+    # executemany in chunks, ids returned in parameter order (RETURNING)
+    chunk = current_app.config['BULK_WRITE_CHUNK_SIZE']
+    stmt = insert(Task).returning(Task.id, sort_by_parameter_order=True)
+    ids = []
+    for batch in chunked(rows, chunk):
+        ids.extend(db.session.execute(stmt, batch).scalars())
+    queue_changes(current_user_id, 'task', ids)
+
+    links = [{'task_id': task_id, 'tag_id': tag_id}
+             for task_id, tag_ids in zip(ids, row_tags) for tag_id in tag_ids]
+    for batch in chunked(links, chunk):
+        db.session.execute(insert(task_tags), batch)
+
+    deltas = {}
+    for row in rows:
+        key = (row['status'], row['priority'])
+        deltas[key] = deltas.get(key, 0) + 1
+    _record_bulk_changes(current_user_id, deltas)
+    db.session.commit()
+
+    for index, task_id in zip(indexes, ids):
+        results[index] = {"index": index, "id": task_id}
+    return jsonify({
+        "message": f"{len(ids)} tasks created successfully",
+        "created": len(ids),
+        "failed": len(errors),
+        "results": [results[i] for i in sorted(results)]
+    }), 201
+
+
 @task_bp.route('/bulk/delete', methods=['POST'])
 @jwt_required()
+@idempotent
 @log_activity(ActivityType.TASK_BULK_DELETE, entity_type="task")
 def bulk_delete_tasks():
-    """Delete multiple tasks."""
+    """Delete multiple tasks, reporting the outcome for every id."""
     current_user_id = get_jwt_identity()
     if isinstance(current_user_id, str):
         current_user_id = int(current_user_id)
@@ -230,20 +883,48 @@ def bulk_delete_tasks():
         return jsonify({"error": "Validation error",
                         "messages": err.messages}), 400
 
-    count = db.session.query(Task).filter(
-        Task.id.in_(data['task_ids']),
-        Task.user_id == current_user_id
-    ).delete(synchronise_session=False)
+    task_ids = list(dict.fromkeys(data['task_ids']))
+    deleted, deltas = set(), {}
+    for chunk in chunked(task_ids, current_app.config['BULK_WRITE_CHUNK_SIZE']):
+        found = db.session.query(Task.id, Task.status, Task.priority).filter(
+            Task.id.in_(chunk), Task.user_id == current_user_id).all()
+        if not found:
+            continue
+        ids = [task_id for task_id, _, _ in found]
+        # Statement-level deletes skip the ORM cascades and flush hooks:
+        # clear dependants first and record the tombstones here
+        seq = UserDataVersion.change_seq(current_user_id)
+        comment_ids = db.session.execute(
+            select(Comment.id).where(Comment.task_id.in_(ids))).scalars().all()
+        Tombstone.record(current_user_id, 'comment', comment_ids, seq)
+        Tombstone.record(current_user_id, 'task', ids, seq)
+        queue_changes(current_user_id, 'comment', comment_ids, 'deleted')
+        queue_changes(current_user_id, 'task', ids, 'deleted')
+        db.session.execute(delete(Comment).where(Comment.id.in_(comment_ids)))
+        db.session.execute(task_tags.delete().where(task_tags.c.task_id.in_(ids)))
+        db.session.execute(delete(Task).where(Task.id.in_(ids)),
+                           execution_options={'synchronize_session': False})
+        deleted.update(ids)
+        for _, status, priority in found:
+            deltas[(status, priority)] = deltas.get((status, priority), 0) - 1
+
+    if deleted:
+        _record_bulk_changes(current_user_id, deltas)
     db.session.commit()
 
-    return jsonify({"message": f"{count} tasks deleted successfully"}), 200
+    return jsonify({
+        "message": f"{len(deleted)} tasks deleted successfully",
+        "results": [{"id": task_id, "status": "deleted" if task_id in deleted else "not_found"}
+                    for task_id in task_ids]
+    }), 200
 
 
 @task_bp.route('/bulk/update', methods=['PUT'])
 @jwt_required()
+@idempotent
 @log_activity(ActivityType.TASK_BULK_UPDATE, entity_type="task")
 def bulk_update_tasks():
-    """Update multiple tasks."""
+    """Update multiple tasks, reporting the outcome for every id."""
     current_user_id = get_jwt_identity()
     if isinstance(current_user_id, str):
         current_user_id = int(current_user_id)
@@ -254,21 +935,174 @@ def bulk_update_tasks():
         return jsonify({"error": "Validation error",
                         "messages": err.messages}), 400
 
-    valid_fields = {'status', 'priority', 'due_date'}
+    valid_fields = {'status', 'priority', 'due_date', 'add_tag_ids', 'remove_tag_ids'}
     if not set(data['updates']).issubset(valid_fields):
-        return jsonify({"error": "Only status, priority or due_date "
-                                 "can be mass-updated"}), 400
+        return jsonify({"error": "Only status, priority, due_date, add_tag_ids "
+                                 "or remove_tag_ids can be mass-updated"}), 400
+    try:
+        updates = task_schema.load(data['updates'], partial=True)
+    except ValidationError as err:
+        return jsonify({"error": "Validation error",
+                        "messages": {"updates": err.messages}}), 400
+
+    add_ids = set(updates.pop('add_tag_ids', ()))
+    remove_ids = set(updates.pop('remove_tag_ids', ())) - add_ids
+    if _owned_tags(current_user_id, add_ids) is None:
+        return jsonify({"error": "One or more tags not found"}), 404
+
+    task_ids = list(dict.fromkeys(data['task_ids']))
+    expected = data.get('if_match', {})
+    updated, deltas, conflicts = set(), {}, {}
+    for chunk in chunked(task_ids, current_app.config['BULK_WRITE_CHUNK_SIZE']):
+        found = db.session.query(Task.id, Task.status, Task.priority, Task.version).filter(
+            Task.id.in_(chunk), Task.user_id == current_user_id).all()
+        conflicts.update({task_id: version for task_id, _, _, version in found
+                          if expected.get(task_id, version) != version})
+        if not found or conflicts:
+            # Nothing is written once a precondition has failed
+            continue
 
-    tasks = Task.query.filter(
-        Task.id.in_(data['task_ids']),
-        Task.user_id == current_user_id
-    ).all()
+        ids = [task_id for task_id, _, _, _ in found]
+        versioned = [(task_id, expected[task_id]) for task_id in ids if task_id in expected]
+        guard = Task.id.in_(ids)
+        if versioned:
+            # Re-checked in the UPDATE itself: no lock between read and write
+            guard = and_(guard, or_(Task.id.not_in([task_id for task_id, _ in versioned]),
+                                    tuple_(Task.id, Task.version).in_(versioned)))
+        written = set(db.session.execute(
+            update(Task).where(guard)
+                        .values(**updates, updated_at=datetime.utcnow(), version=Task.version + 1,
+                                change_seq=UserDataVersion.change_seq(current_user_id))
+                        .returning(Task.id),
+            execution_options={'synchronize_session': False}).scalars())
+        if len(written) < len(ids):
+            conflicts.update({task_id: None for task_id in ids if task_id not in written})
+            continue
+        updated.update(ids)
+        queue_changes(current_user_id, 'task', ids)
 
-    for task in tasks:
-        for field, value in data['updates'].items():
-            setattr(task, field, value)
+        for _, status, priority, _ in found:
+            new = (updates.get('status', status), updates.get('priority', priority))
+            if new != (status, priority):
+                deltas[(status, priority)] = deltas.get((status, priority), 0) - 1
+                deltas[new] = deltas.get(new, 0) + 1
 
+        if remove_ids:
+            db.session.execute(task_tags.delete().where(
+                task_tags.c.task_id.in_(ids), task_tags.c.tag_id.in_(remove_ids)))
+        if add_ids:
+            present = set(db.session.execute(
+                select(task_tags.c.task_id, task_tags.c.tag_id).where(
+                    task_tags.c.task_id.in_(ids), task_tags.c.tag_id.in_(add_ids))).all())
+            links = [{'task_id': task_id, 'tag_id': tag_id} for task_id in ids
+                     for tag_id in sorted(add_ids) if (task_id, tag_id) not in present]
+            if links:
+                db.session.execute(insert(task_tags), links)
+
+    if conflicts:
+        db.session.rollback()
+        current = dict(db.session.query(Task.id, Task.version).filter(Task.id.in_(conflicts)))
+        return jsonify({
+            "error": "Precondition failed: some tasks have been modified; nothing was updated",
+            "results": [{"id": task_id, "status": "precondition_failed",
+                         "version": current.get(task_id)} for task_id in conflicts]
+        }), 412
+
+    if updated:
+        _record_bulk_changes(current_user_id, deltas)
     db.session.commit()
+
     return jsonify({
-        "message": f"{len(tasks)} tasks updated successfully"
-    }), 200
\ No newline at end of file
+        "message": f"{len(updated)} tasks updated successfully",
+        "results": [{"id": task_id, "status": "updated" if task_id in updated else "not_found"}
+                    for task_id in task_ids]
+    }), 200
+
+# ---------------------------------------------------------------------- #
+# Archive – ?include_archived=true listings and restore
+# ---------------------------------------------------------------------- #
+def _list_with_archive(user_id, q):
+    """
+    One page of live and archived tasks together.  The filters, ordering
+    and paging run over a UNION ALL of ids and sort keys; the page's rows
+    are then loaded from their own tables and flagged with ``archived``.
+    """
+    fieldset = q.get('fieldset')
+    sort_by = q.get('sort_by', 'created_at')
+    parts = []
+    for model, links, archived in ((Task, task_tags, False),
+                                   (ArchivedTask, archived_task_tags, True)):
+        part = select(model.id, getattr(model, sort_by).label('sort_key'),
+                      literal(archived).label('archived')).where(model.user_id == user_id)
+        if 'status' in q:     part = part.where(model.status == q['status'])
+        if 'priority' in q:   part = part.where(model.priority == q['priority'])
+        if 'tag' in q:
+            part = part.where(model.id.in_(
+                select(links.c.task_id).where(links.c.tag_id == q['tag'])))
+        if 'due_before' in q: part = part.where(model.due_date <= q['due_before'])
+        if 'due_after' in q:  part = part.where(model.due_date >= q['due_after'])
+        parts.append(part)
+    listing = union_all(*parts).subquery()
+
+    direction = desc if q.get('sort_order', 'desc') == 'desc' else asc
+    page, per_page = q.get('page', 1), q.get('per_page', 10)
+    rows = db.session.execute(
+        select(listing.c.id, listing.c.archived)
+        .order_by(direction(listing.c.sort_key), direction(listing.c.id))
+        .limit(per_page).offset((page - 1) * per_page)).all()
+
+    live = [task_id for task_id, archived in rows if not archived]
+    cold = [task_id for task_id, archived in rows if archived]
+    loaded = {}
+    if live:
+        loaded.update(((task.id, False), task) for task in Task.query.options(
+            *_projection(fieldset)).filter(Task.id.in_(live)))
+    if cold:
+        loaded.update(((task.id, True), task) for task in ArchivedTask.query.filter(
+            ArchivedTask.id.in_(cold)))
+
+    serializer = _schema_for(fieldset)
+    tasks = []
+    for task_id, archived in rows:
+        item = serializer.dump(loaded[(task_id, bool(archived))])
+        item['archived'] = bool(archived)
+        tasks.append(item)
+
+    body = {"tasks": tasks, "page": page, "per_page": per_page}
+    if q.get('include_total', True):
+        total = db.session.execute(select(func.count()).select_from(listing)).scalar()
+        body["total"] = total
+        body["pages"] = (total + per_page - 1) // per_page
+    return jsonify(body), 200
+
+
+@task_bp.route('/<int:task_id>/restore', methods=['POST'])
+@jwt_required()
+@log_activity(
+    activity_type=ActivityType.TASK_RESTORE,
+    entity_type="task",
+    get_entity_id="task_id"
+)
+def restore_task(task_id):
+    """Move an archived task, its tag links and comments back to the live tables."""
+    current_user_id = get_jwt_identity()
+    if isinstance(current_user_id, str):
+        current_user_id = int(current_user_id)
+
+    try:
+        restored = ArchivedTask.restore(task_id, current_user_id)
+    except IntegrityError:
+        # A database that reused the archived task's (or a comment's) id
+        db.session.rollback()
+        return jsonify({"error": "The archived task's id is already in use"}), 409
+    if restored is None:
+        return jsonify({"error": "Archived task not found"}), 404
+
+    task = _load_task(task_id, current_user_id)
+    _record_bulk_changes(current_user_id, {(task.status, task.priority): 1})
+    body = task_serializer.dump(task)
+    db.session.commit()
+    return _task_response({
+        "message": "Task restored successfully",
+        "task": body
+    }, 200, task)
@@ -1,7 +1,14 @@
 from app.schemas.user import UserRegistrationSchema, UserLoginSchema, UserSchema
-from app.schemas.task import TaskSchema, TaskQuerySchema, TaskBulkDeleteSchema, TaskBulkUpdateSchema
+from app.schemas.task import (
+    TaskSchema, TaskQuerySchema, TaskFieldsetSchema, TaskCalendarQuerySchema,
+    TaskTagSchema, TaskBatchSchema, TaskBulkCreateSchema, TaskBulkDeleteSchema, TaskBulkUpdateSchema
+)
 from app.schemas.tag import TagSchema, TagReferenceSchema
 from app.schemas.comment import CommentSchema
+from app.schemas.activity_log import ActivityLogSchema
+from app.schemas.batch import BatchSchema
+from app.schemas.sync import SyncQuerySchema
+from app.schemas.compiled import compile_schema
 
 # Initialise schemas
 user_schema = UserSchema()
@@ -12,6 +19,11 @@ user_login_schema = UserLoginSchema()
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
 task_query_schema = TaskQuerySchema()
+task_fieldset_schema = TaskFieldsetSchema()
+task_calendar_query_schema = TaskCalendarQuerySchema()
+task_batch_schema = TaskBatchSchema()
+task_tag_schema = TaskTagSchema()
+task_bulk_create_schema = TaskBulkCreateSchema()
 task_bulk_delete_schema = TaskBulkDeleteSchema()
 task_bulk_update_schema = TaskBulkUpdateSchema()
 
@@ -20,4 +32,24 @@ tags_schema = TagSchema(many=True)
 tag_reference_schema = TagReferenceSchema()
 
 comment_schema = CommentSchema()
-comments_schema = CommentSchema(many=True)
\ No newline at end of file
+comments_schema = CommentSchema(many=True)
+
+activity_logs_schema = ActivityLogSchema(many=True)
+
+batch_schema = BatchSchema()
+
+sync_query_schema = SyncQuerySchema()
+# Sync pages carry tag ids and no joined-in usernames
+sync_tasks_schema = TaskSchema(many=True, exclude=('tags',))
+sync_comments_schema = CommentSchema(many=True, exclude=('username',))
+
+# Precompiled dump paths for the hot endpoints (identical output to .dump)
+user_serializer = compile_schema(user_schema)
+users_serializer = compile_schema(users_schema)
+task_serializer = compile_schema(task_schema)
+tasks_serializer = compile_schema(tasks_schema)
+tag_serializer = compile_schema(tag_schema)
+tags_serializer = compile_schema(tags_schema)
+comment_serializer = compile_schema(comment_schema)
+comments_serializer = compile_schema(comments_schema)
+activity_logs_serializer = compile_schema(activity_logs_schema)
@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields
+
+class ActivityLogSchema(Schema):
+    """Schema for serializing activity log entries (mirrors ActivityLog.to_dict)."""
+    id = fields.Integer(dump_only=True)
+    user_id = fields.Integer(dump_only=True)
+    activity_type = fields.String(dump_only=True)
+    entity_type = fields.String(dump_only=True)
+    entity_id = fields.Integer(dump_only=True)
+    description = fields.String(dump_only=True)
+    activity_data = fields.Raw(dump_only=True)
+    ip_address = fields.String(dump_only=True)
+    user_agent = fields.String(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
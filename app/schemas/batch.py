@@ -0,0 +1,30 @@
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+BATCH_METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+
+class BatchOperationSchema(Schema):
+    """Schema for one sub-request of a batch."""
+    id = fields.String(validate=validate.Length(min=1, max=50))   # name for references
+    method = fields.String(required=True, validate=validate.OneOf(BATCH_METHODS))
+    path = fields.String(required=True, validate=validate.Regexp(r'^/api/v1/'))
+    body = fields.Raw(allow_none=True)
+    headers = fields.Dict(keys=fields.String(), values=fields.String())
+
+
+class BatchSchema(Schema):
+    """Schema for validating a batch of sub-requests."""
+    requests = fields.List(
+        fields.Nested(BatchOperationSchema),
+        required=True,
+        validate=validate.Length(min=1)
+    )
+
+    @validates_schema
+    def validate_ids(self, data, **kwargs):
+        """Sub-request ids must be unique and must not look like indexes."""
+        ids = [op['id'] for op in data.get('requests', ()) if 'id' in op]
+        if len(ids) != len(set(ids)):
+            raise ValidationError('Sub-request ids must be unique.', 'requests')
+        if any(op_id.isdigit() for op_id in ids):
+            raise ValidationError('Sub-request ids must not be numbers.', 'requests')
@@ -0,0 +1,10 @@
+from marshmallow import Schema, fields, validate
+
+# Largest page a client may ask /sync for
+SYNC_MAX_LIMIT = 1000
+
+
+class SyncQuerySchema(Schema):
+    """Schema for validating delta sync parameters."""
+    since = fields.Integer(validate=validate.Range(min=0))    # cursor of the last sync
+    limit = fields.Integer(validate=validate.Range(min=1, max=SYNC_MAX_LIMIT))
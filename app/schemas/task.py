@@ -1,5 +1,6 @@
 from marshmallow import (
-    Schema, fields, validate, validates, ValidationError, pre_load
+    Schema, fields, validate, validates, validates_schema, ValidationError,
+    pre_load, post_load
 )
 from datetime import datetime
 from app.schemas.tag import TagSchema
@@ -28,9 +29,12 @@ class TaskSchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
     user_id = fields.Integer(dump_only=True)
+    version = fields.Integer(dump_only=True)                       # also the ETag
 
     tags = fields.Nested(TagSchema, many=True, dump_only=True)
-    tag_ids = fields.List(fields.Integer(), load_only=True)
+    tag_ids = fields.List(fields.Integer(), load_only=True)        # replaces the set
+    add_tag_ids = fields.List(fields.Integer(), load_only=True)    # then attach these
+    remove_tag_ids = fields.List(fields.Integer(), load_only=True) # and detach these
 
     # -------- NEW --------
     @pre_load
@@ -51,7 +55,46 @@ class TaskSchema(Schema):
             raise ValidationError('Due date cannot be in the past.')
 
 
-class TaskQuerySchema(Schema):
+class TaskTagSchema(Schema):
+    """Schema for attaching a single tag to a task."""
+    tag_id = fields.Integer(required=True)
+
+
+# Facets a listing can be counted by through ?facets=
+TASK_FACETS = ('status', 'priority', 'tag')
+
+# Fields a client may request through ?fields= (sparse fieldsets)
+TASK_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'due_date',
+    'created_at', 'updated_at', 'user_id', 'version', 'tags'
+)
+
+
+class TaskFieldsetSchema(Schema):
+    """Schema for validating sparse fieldset parameters."""
+    fieldset = fields.String(data_key='fields')    # e.g. "id,title,status"
+    include = fields.String(validate=validate.OneOf(['tags']))
+
+    @validates('fieldset')
+    def validate_fieldset(self, value, **kwargs):
+        """Reject unknown field names."""
+        unknown = {name.strip() for name in value.split(',')} - set(TASK_FIELDS)
+        if unknown:
+            raise ValidationError(
+                f"Unknown field(s): {', '.join(sorted(unknown))}.")
+
+    @post_load
+    def _split_fieldset(self, data, **kwargs):
+        """Turn `fields` + `include` into a tuple of field names in TASK_FIELDS order."""
+        if 'fieldset' in data:
+            names = {'id'} | {name.strip() for name in data['fieldset'].split(',')}
+            if data.get('include') == 'tags':
+                names.add('tags')
+            data['fieldset'] = tuple(name for name in TASK_FIELDS if name in names)
+        return data
+
+
+class TaskQuerySchema(TaskFieldsetSchema):
     """Schema for validating task query parameters."""
     status = fields.String(
         validate=validate.OneOf(['pending', 'in_progress', 'completed'])
@@ -60,13 +103,17 @@ class TaskQuerySchema(Schema):
         validate=validate.OneOf(['low', 'medium', 'high'])
     )
     search = fields.String()
+    search_mode = fields.String(validate=validate.OneOf(['fulltext', 'trigram']))
+    min_similarity = fields.Float(validate=validate.Range(min=0.05, max=1))
     tag = fields.Integer()                       # Tag ID to filter by
+    tags = fields.String()                       # e.g. "1,2,3"
+    tag_mode = fields.String(validate=validate.OneOf(['any', 'all', 'none']))
     due_before = fields.DateTime(format='iso')
     due_after = fields.DateTime(format='iso')
     sort_by = fields.String(
         validate=validate.OneOf([
             'title', 'status', 'priority', 'due_date',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at', 'relevance'
         ])
     )
     sort_order = fields.String(
@@ -74,6 +121,84 @@ class TaskQuerySchema(Schema):
     )
     page = fields.Integer(validate=validate.Range(min=1))
     per_page = fields.Integer(validate=validate.Range(min=1, max=100))
+    cursor = fields.String()                     # Opaque keyset cursor
+    include_total = fields.Boolean()
+    facets = fields.String()                     # e.g. "status,priority,tag"
+    include_archived = fields.Boolean()          # union in the archive tables
+
+    @validates('tags')
+    def validate_tags(self, value, **kwargs):
+        """Require a comma-separated list of at most 50 tag IDs."""
+        parts = [part.strip() for part in value.split(',')]
+        if not all(part.isdigit() for part in parts):
+            raise ValidationError('Must be a comma-separated list of tag IDs.')
+        if len(set(parts)) > 50:
+            raise ValidationError('At most 50 tags can be combined.')
+
+    @validates('facets')
+    def validate_facets(self, value, **kwargs):
+        """Reject unknown facet names."""
+        unknown = {name.strip() for name in value.split(',')} - set(TASK_FACETS)
+        if unknown:
+            raise ValidationError(
+                f"Unknown facet(s): {', '.join(sorted(unknown))}.")
+
+    @post_load
+    def _split_lists(self, data, **kwargs):
+        """Turn `tags` into sorted unique IDs and `facets` into a tuple of names."""
+        if 'tags' in data:
+            data['tags'] = tuple(sorted({int(part) for part in data['tags'].split(',')}))
+        if 'facets' in data:
+            names = [name.strip() for name in data['facets'].split(',')]
+            data['facets'] = tuple(name for name in TASK_FACETS if name in names)
+        return data
+
+
+# Largest number of tasks one batch fetch may ask for
+TASK_BATCH_MAX_IDS = 2000
+
+
+class TaskBatchSchema(TaskFieldsetSchema):
+    """Schema for validating batch fetch parameters (query string or JSON body)."""
+    ids = fields.List(
+        fields.Integer(),
+        required=True,
+        validate=validate.Length(min=1, max=TASK_BATCH_MAX_IDS)
+    )
+    comments = fields.Integer(validate=validate.Range(min=0, max=20))   # preview per task
+
+    @pre_load
+    def _split_ids(self, data, **kwargs):
+        """Accept `ids` as a comma-separated string as well as a list."""
+        if isinstance(data.get('ids'), str):
+            data = {**data, 'ids': [part.strip() for part in data['ids'].split(',')]}
+        return data
+
+
+class TaskCalendarQuerySchema(Schema):
+    """Schema for validating calendar query parameters."""
+    start = fields.Date(data_key='from', required=True)
+    end = fields.Date(data_key='to', required=True)        # inclusive
+    bucket = fields.String(validate=validate.OneOf(['day', 'week']))
+    limit = fields.Integer(validate=validate.Range(min=0, max=50))   # summaries per bucket
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        """Require `from` <= `to` and a span of at most a year."""
+        if 'start' in data and 'end' in data:
+            if data['end'] < data['start']:
+                raise ValidationError('`to` must not be before `from`.', 'to')
+            if (data['end'] - data['start']).days > 366:
+                raise ValidationError('The range may span at most 366 days.', 'to')
+
+
+class TaskBulkCreateSchema(Schema):
+    """Schema for the bulk create envelope; each item is a TaskSchema payload."""
+    tasks = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=validate.Length(min=1)
+    )
 
 
 class TaskBulkDeleteSchema(Schema):
@@ -92,4 +217,6 @@ class TaskBulkUpdateSchema(Schema):
         required=True,
         validate=validate.Length(min=1)
     )
-    updates = fields.Dict(required=True)
\ No newline at end of file
+    updates = fields.Dict(required=True)
+    # Optional preconditions: {task_id: expected version}
+    if_match = fields.Dict(keys=fields.Integer(), values=fields.Integer())
\ No newline at end of file
@@ -1,19 +1,21 @@
 from functools import wraps
-from flask import request, g
+from flask import current_app, request, g
 from flask_jwt_extended import get_jwt_identity
-from app.models.activity_log import ActivityLog, ActivityType
+from app.models.activity_log import ActivityType
 from app import db
+from app.utils.activity_writer import record_activity
+from app.utils.response_cache import get_response_cache
 
 def log_activity(activity_type, entity_type=None, get_entity_id=None, description_template=None):
     """Decorator to log activities automatically."""
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Execute the wrapped function
-            result = f(*args, **kwargs)
+            # Execute the wrapped function; views return tuples or responses
+            result = current_app.make_response(f(*args, **kwargs))
             
             # Only log if the operation was successful (2xx status code)
-            if hasattr(result, 'status_code') and 200 <= result[1] < 300:
+            if 200 <= result.status_code < 300:
                 try:
                     # Get current user ID
                     current_user_id = get_jwt_identity()
@@ -36,8 +38,8 @@ def log_activity(activity_type, entity_type=None, get_entity_id=None, descriptio
                         else:
                             description = description_template.format(**kwargs)
                     
-                    # Log the activity
-                    ActivityLog.log(
+                    # Log the activity (buffered; see app/utils/activity_writer.py)
+                    record_activity(
                         user_id=current_user_id,
                         activity_type=activity_type,
                         entity_type=entity_type,
@@ -45,9 +47,7 @@ def log_activity(activity_type, entity_type=None, get_entity_id=None, descriptio
                         description=description,
                         request=request
                     )
-                    
-                    # Commit as part of the same transaction
-                    db.session.commit()
+                    get_response_cache().invalidate([current_user_id])
                     
                 except Exception as e:
                     # Don't let logging errors break the application
@@ -64,7 +64,7 @@ def get_task_id_from_response(result, *args, **kwargs):
     if 'task_id' in kwargs:
         return kwargs['task_id']
     try:
-        data = result[0].get_json()
+        data = result.get_json()
         if data and 'task' in data and 'id' in data['task']:
             return data['task']['id']
     except:
@@ -76,7 +76,7 @@ def get_tag_id_from_response(result, *args, **kwargs):
     if 'tag_id' in kwargs:
         return kwargs['tag_id']
     try:
-        data = result[0].get_json()
+        data = result.get_json()
         if data and 'tag' in data and 'id' in data['tag']:
             return data['tag']['id']
     except:
@@ -88,7 +88,7 @@ def get_comment_id_from_response(result, *args, **kwargs):
     if 'comment_id' in kwargs:
         return kwargs['comment_id']
     try:
-        data = result[0].get_json()
+        data = result.get_json()
         if data and 'comment' in data and 'id' in data['comment']:
             return data['comment']['id']
     except:
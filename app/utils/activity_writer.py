@@ -0,0 +1,162 @@
+"""
+Buffered writer for activity log entries.
+
+``log_activity`` runs after the view has committed, so writing the entry
+through the request's session costs a second commit on every successful
+write.  Instead entries are queued in-process and a background thread
+inserts them in batches -- one multi-row ``INSERT`` per
+``ACTIVITY_LOG_BATCH_SIZE`` entries or per ``ACTIVITY_LOG_FLUSH_INTERVAL``
+seconds, whichever comes first -- on its own pooled connection.
+
+The queue is bounded (``ACTIVITY_LOG_QUEUE_SIZE``): when the database falls
+behind, requests wait up to ``ACTIVITY_LOG_ENQUEUE_TIMEOUT`` seconds for
+room before the entry is dropped and logged as an error.  Queued entries
+are flushed when the process exits.
+
+With ``ACTIVITY_LOG_ASYNC`` off (the tests) entries are written and
+committed through the request's session, as before.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.activity_log import ActivityLog
+from app.utils.transaction import commits_deferred
+
+# Queued by ``close`` to stop the writer thread once it has caught up
+_STOP = object()
+
+
+class ActivityLogWriter:
+    """Bounded queue of activity rows drained by a background thread."""
+
+    def __init__(self, engine, batch_size, flush_interval, queue_size, enqueue_timeout):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.closed = False
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name='activity-log-writer',
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row):
+        """Queue a row, waiting for room when the queue is full."""
+        if self.closed:
+            self._write([row])
+            return
+        try:
+            self._queue.put(row, timeout=self.enqueue_timeout)
+        except queue.Full:
+            logging.error("Activity log queue is full; dropped an entry")
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def close(self):
+        """Write everything queued so far and stop the thread."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            batch, stopping = self._take()
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _take(self):
+        """The next batch, and whether the writer was asked to stop."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, rows):
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(ActivityLog.__table__).values(rows))
+        except Exception as e:
+            logging.error(f"Error writing {len(rows)} activity log entries: {str(e)}")
+
+
+_writer_lock = threading.Lock()
+
+
+def get_activity_writer():
+    """The current application's activity log writer, started on first use."""
+    writer = current_app.extensions.get('activity_writer')
+    if writer is None:
+        with _writer_lock:
+            writer = current_app.extensions.get('activity_writer')
+            if writer is None:
+                config = current_app.config
+                writer = ActivityLogWriter(
+                    db.engine,
+                    config['ACTIVITY_LOG_BATCH_SIZE'],
+                    config['ACTIVITY_LOG_FLUSH_INTERVAL'],
+                    config['ACTIVITY_LOG_QUEUE_SIZE'],
+                    config['ACTIVITY_LOG_ENQUEUE_TIMEOUT']
+                )
+                current_app.extensions['activity_writer'] = writer
+    return writer
+
+
+def record_activity(user_id, activity_type, request=None, **kwargs):
+    """
+    Log an activity after the request's write has committed.
+
+    Within ``single_commit`` (``/batch``) the entry waits for the batch to
+    commit and is dropped if it rolls back.
+    """
+    if not current_app.config['ACTIVITY_LOG_ASYNC']:
+        ActivityLog.log(user_id, activity_type, request, **kwargs)
+        db.session.commit()
+        return
+
+    row = ActivityLog.row(user_id, activity_type, request, **kwargs)
+    session = db.session()
+    if commits_deferred(session):
+        session.info.setdefault('activity_rows', []).append(row)
+    else:
+        get_activity_writer().submit(row)
+
+
+@event.listens_for(Session, 'after_commit')
+def _submit_committed(session):
+    rows = session.info.pop('activity_rows', None)
+    if rows and has_app_context():
+        writer = get_activity_writer()
+        for row in rows:
+            writer.submit(row)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_uncommitted(session, previous_transaction):
+    session.info.pop('activity_rows', None)
@@ -41,11 +41,16 @@ def get_api_docs():
             "tasks": {
                 "/api/v1/tasks": {
                     "methods": ["GET", "POST"],
-                    "description": "Get all tasks or create a new task"
+                    "description": "Get all tasks or create a new task (?include_archived=true adds archived tasks)"
                 },
                 "/api/v1/tasks/<id>": {
                     "methods": ["GET", "PUT", "DELETE"],
-                    "description": "Get, update or delete a specific task"
+                    "description": "Get, update or delete a specific task (ETag / If-Match, 412 when stale)"
+                },
+                "/api/v1/tasks/bulk/create": {
+                    "methods": ["POST"],
+                    "description": "Create up to 1000 tasks from {'tasks': [...]}; 201 with "
+                                   "results: [{index, id} or {index, errors}] per item"
                 },
                 "/api/v1/tasks/bulk/delete": {
                     "methods": ["POST"],
@@ -53,12 +58,18 @@ def get_api_docs():
                 },
                 "/api/v1/tasks/bulk/update": {
                     "methods": ["PUT"],
-                    "description": "Update multiple tasks"
+                    "description": "Update multiple tasks (optional if_match: {id: version})"
                 },
                 "/api/v1/tasks/statistics": {
                     "methods": ["GET"],
                     "description": "Get task statistics"
                 },
+                "/api/v1/tasks/calendar": {
+                    "methods": ["GET"],
+                    "description": "Tasks due between ?from= and ?to= (dates, inclusive, at most 366 days), "
+                                   "grouped by ?bucket=day|week with up to ?limit= (default 5) summaries "
+                                   "per bucket; returns {from, to, bucket, buckets: [{start, count, tasks}]}"
+                },
                 "/api/v1/tasks/<id>/tags": {
                     "methods": ["POST"],
                     "description": "Add a tag to a task"
@@ -66,6 +77,10 @@ def get_api_docs():
                 "/api/v1/tasks/<id>/tags/<tag_id>": {
                     "methods": ["DELETE"],
                     "description": "Remove a tag from a task"
+                },
+                "/api/v1/tasks/<id>/restore": {
+                    "methods": ["POST"],
+                    "description": "Move an archived task back to the live tasks"
                 }
             },
             "tags": {
@@ -88,10 +103,26 @@ def get_api_docs():
                     "description": "Get, update or delete a specific comment"
                 }
             },
+            "batch": {
+                "/api/v1/batch": {
+                    "methods": ["POST"],
+                    "description": "Run several task, tag, comment or activity requests in one transaction"
+                }
+            },
+            "sync": {
+                "/api/v1/sync": {
+                    "methods": ["GET"],
+                    "description": "Tasks, tags and comments changed, and ids deleted, since a cursor (?since=)"
+                },
+                "/api/v1/events": {
+                    "methods": ["GET"],
+                    "description": "Server-Sent Events stream of change events (Last-Event-ID resume, ?jwt= for EventSource)"
+                }
+            },
             "export": {
                 "/api/v1/tasks/export": {
                     "methods": ["GET"],
-                    "description": "Export tasks in different formats (json, csv)"
+                    "description": "Export tasks in different formats (json, csv; ?include_archived=true)"
                 }
             },
             "admin": {
@@ -0,0 +1,72 @@
+"""
+Conditional GET support for the per-user task, tag and comment endpoints.
+
+Every response is tagged with an ETag derived from the user's
+``UserDataVersion`` and the request URL, plus a Last-Modified of the
+user's most recent write.  A request whose ``If-None-Match`` (or, failing
+that, ``If-Modified-Since``) still matches is answered with 304 Not
+Modified after a single primary-key lookup, without running the view.
+"""
+import hashlib
+from functools import wraps
+
+from flask import request, make_response, g
+from flask_jwt_extended import get_jwt_identity
+
+from app.models.data_version import UserDataVersion
+
+
+def _etag_for(user_id, version, variant=None):
+    raw = f"{user_id}:{version}:{variant}:{request.full_path}".encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional_get(fn=None, *, vary=None):
+    """
+    Decorator for GET views scoped to the current user's data.
+
+    Must be applied below ``@jwt_required()``.  Only successful responses
+    carry validators; errors are passed through unchanged.  Views whose
+    output also depends on the clock pass ``vary``, a callable whose
+    result is mixed into the ETag; Last-Modified is then omitted.
+    """
+    if fn is None:
+        return lambda view: conditional_get(view, vary=vary)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+
+        version, last_modified = UserDataVersion.current(user_id)
+        g.data_version = version
+        if vary is not None:
+            etag = _etag_for(user_id, version, vary())
+            last_modified = None
+        else:
+            etag = _etag_for(user_id, version)
+
+        if _not_modified(etag, last_modified):
+            response = make_response('', 304)
+        else:
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    return wrapper
@@ -1,6 +1,7 @@
 from app import db
 from app.models.user import User
 from app.models.task import Task
+from app.models.task_counter import TaskCounter
 from sqlalchemy import text
 
 def init_db():
@@ -90,6 +91,7 @@ def create_sample_data():
     
     db.session.add_all(admin_tasks)
     db.session.commit()
+    TaskCounter.rebuild()
     
     print(f"Created regular user: {user.username}")
     print(f"Created admin user: {admin.username}")
@@ -25,6 +25,10 @@ def register_error_handlers(app):
     def method_not_allowed(e):
         return jsonify({"error": "Method not allowed", "message": str(e)}), 405
     
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        return jsonify({"error": "Too many requests", "message": str(e)}), 429
+    
     @app.errorhandler(500)
     def server_error(e):
         return jsonify({"error": "Server error", "message": str(e)}), 500
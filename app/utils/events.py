@@ -0,0 +1,306 @@
+"""
+Per-user change events for ``GET /api/v1/events`` (Server-Sent Events).
+
+Writes become events when their transaction commits.  ORM inserts,
+updates and deletes of tasks, tags and comments are picked up by mapper
+hooks; statement-level bulk writes call ``queue_changes``.  Either way
+``(user_id, seq, entity, id, op)`` is queued in
+``session.info['change_events']`` and, after commit, grouped into one
+event per user and transaction:
+
+    {"seq": 42, "changes": [{"entity": "task", "id": 7, "op": "changed"}]}
+
+``seq`` is the transaction's change sequence (``UserDataVersion``), which
+is also the SSE event id, so a reconnecting client's ``Last-Event-ID`` is
+a ``/sync`` cursor and missed events can be replayed from the database.
+
+The ``EventBroker`` hands events to this worker's open streams (one
+bounded queue each) and to the other workers through a fan-out
+transport chosen by ``EVENTS_FANOUT``:
+
+* ``unix``     -- a datagram socket per worker in ``EVENTS_SOCKET_DIR``;
+                  an event is sent to every other worker's socket.
+* ``postgres`` -- ``NOTIFY`` on a channel every worker ``LISTEN``s on.
+* ``none``     -- a single worker process.
+
+An idle stream is a blocked ``queue.get``; under gevent workers that is
+a parked greenlet, so a worker holds thousands of them cheaply.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import select
+import socket
+import threading
+import time
+import uuid
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.task import Task
+from app.models.tag import Tag
+from app.models.comment import Comment
+
+# Entities that produce events, by model
+_ENTITIES = {Task: 'task', Tag: 'tag', Comment: 'comment'}
+
+
+class Subscription:
+    """One open stream: a bounded queue of events for a user."""
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize)
+        # Set when events were dropped because the client fell behind
+        self.lagging = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.lagging = True
+
+    def get(self, timeout):
+        return self.queue.get(timeout=timeout)
+
+    def drain(self):
+        """Discard queued events and clear the lagging flag."""
+        self.lagging = False
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class EventBroker:
+    """In-process pub/sub of change events, optionally fanned out to peers."""
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self.origin = uuid.uuid4().hex
+        self.fanout = None
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def deliver(self, user_id, event):
+        """Queue an event on this worker's streams for the user."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def publish(self, user_id, event):
+        """Deliver locally and send to the other workers."""
+        self.deliver(user_id, event)
+        if self.fanout is not None:
+            message = json.dumps({'origin': self.origin, 'user_id': user_id, 'event': event},
+                                 separators=(',', ':')).encode()
+            try:
+                self.fanout.send(message)
+            except Exception as e:
+                logging.error(f"Error fanning out change event: {str(e)}")
+
+    def receive(self, message):
+        """Deliver a message sent by another worker."""
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+        if payload.get('origin') != self.origin:
+            self.deliver(payload['user_id'], payload['event'])
+
+
+# ---------------------------------------------------------------------- #
+# Cross-worker fan-out transports
+# ---------------------------------------------------------------------- #
+class UnixSocketFanout:
+    """Datagrams between the workers' sockets in a shared directory."""
+
+    def __init__(self, directory, receive):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, f'{os.getpid()}-{uuid.uuid4().hex[:8]}.sock')
+        self._inbox = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._inbox.bind(self.path)
+        self._outbox = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._outbox.setblocking(False)    # a busy peer drops, writers never wait
+        atexit.register(self.close)
+        threading.Thread(target=self._listen, args=(receive,),
+                         name='events-unix-fanout', daemon=True).start()
+
+    def send(self, message):
+        for path in glob.glob(os.path.join(self.directory, '*.sock')):
+            if path == self.path:
+                continue
+            try:
+                self._outbox.sendto(message, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker that bound it has gone
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                logging.error(f"Dropped change event for busy worker socket {path}")
+
+    def _listen(self, receive):
+        while True:
+            try:
+                receive(self._inbox.recv(65536))
+            except OSError:
+                return
+
+    def close(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class PostgresFanout:
+    """``NOTIFY`` / ``LISTEN`` on a dedicated connection per worker."""
+
+    CHANNEL = 'task_events'
+
+    def __init__(self, engine, receive):
+        self.engine = engine
+        threading.Thread(target=self._listen, args=(receive,),
+                         name='events-pg-fanout', daemon=True).start()
+
+    def send(self, message):
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"),
+                               {'channel': self.CHANNEL, 'payload': message.decode()})
+            connection.commit()
+
+    def _listen(self, receive):
+        while True:
+            try:
+                connection = self.engine.raw_connection()
+                try:
+                    driver = connection.driver_connection
+                    driver.autocommit = True
+                    with driver.cursor() as cursor:
+                        cursor.execute(f'LISTEN {self.CHANNEL}')
+                    while True:
+                        select.select([driver], [], [], 60)
+                        driver.poll()
+                        while driver.notifies:
+                            receive(driver.notifies.pop(0).payload.encode())
+                finally:
+                    connection.invalidate()
+            except Exception as e:
+                logging.error(f"Change event listener failed, reconnecting: {str(e)}")
+                time.sleep(1)
+
+
+_broker_lock = threading.Lock()
+
+
+def get_event_broker():
+    """The current application's event broker, started on first use."""
+    broker = current_app.extensions.get('event_broker')
+    if broker is None:
+        with _broker_lock:
+            broker = current_app.extensions.get('event_broker')
+            if broker is None:
+                broker = EventBroker(current_app.config['EVENTS_QUEUE_SIZE'])
+                mode = current_app.config['EVENTS_FANOUT']
+                if mode == 'unix':
+                    broker.fanout = UnixSocketFanout(
+                        current_app.config['EVENTS_SOCKET_DIR'], broker.receive)
+                elif mode == 'postgres':
+                    broker.fanout = PostgresFanout(db.engine, broker.receive)
+                current_app.extensions['event_broker'] = broker
+    return broker
+
+
+# ---------------------------------------------------------------------- #
+# Queue changes during the transaction, publish them on commit
+# ---------------------------------------------------------------------- #
+def queue_changes(user_id, entity, ids, op='changed', session=None):
+    """
+    Queue events for rows written by statement-level writes; the caller
+    has already taken the transaction's change sequence for the user.
+    """
+    session = session if session is not None else db.session
+    seq = session.info.get('change_seqs', {}).get(user_id)
+    if seq is not None:
+        session.info.setdefault('change_events', []).extend(
+            (user_id, seq, entity, entity_id, op) for entity_id in ids)
+
+
+def _queue_write(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None and target.user_id is not None:
+        queue_changes(target.user_id, _ENTITIES[type(target)], [target.id], session=session)
+
+def _queue_delete(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None and target.user_id is not None:
+        queue_changes(target.user_id, _ENTITIES[type(target)], [target.id], 'deleted', session)
+
+for _model in _ENTITIES:
+    event.listen(_model, 'after_insert', _queue_write)
+    event.listen(_model, 'after_update', _queue_write)
+    event.listen(_model, 'after_delete', _queue_delete)
+
+
+def build_events(changes, max_changes):
+    """Group ``(user_id, seq, entity, id, op)`` rows into ``{user_id: [event]}``."""
+    grouped = {}
+    for user_id, seq, entity, entity_id, op in changes:
+        # Later writes to the same row in a transaction win
+        grouped.setdefault(user_id, {}).setdefault(seq, {})[(entity, entity_id)] = op
+    events = {}
+    for user_id, by_seq in grouped.items():
+        for seq in sorted(by_seq):
+            items = [{'entity': entity, 'id': entity_id, 'op': op}
+                     for (entity, entity_id), op in by_seq[seq].items()]
+            event = {'seq': seq, 'changes': items[:max_changes]}
+            if len(items) > max_changes:
+                # Too large to push: the client fetches /sync?since= instead
+                event['truncated'] = True
+            events.setdefault(user_id, []).append(event)
+    return events
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_changes(session):
+    changes = session.info.pop('change_events', None)
+    if changes and has_app_context():
+        broker = get_event_broker()
+        events = build_events(changes, current_app.config['EVENTS_MAX_CHANGES'])
+        for user_id, user_events in events.items():
+            for item in user_events:
+                broker.publish(user_id, item)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_changes(session, previous_transaction):
+    session.info.pop('change_events', None)
@@ -0,0 +1,88 @@
+"""
+Facet counts for filtered task listings: ``?facets=status,priority,tag``.
+
+All requested facets are counted over the same filtered task set in one
+statement.  PostgreSQL groups once with ``GROUPING SETS``; other backends
+``UNION ALL`` one ``GROUP BY`` per facet over a shared CTE of the
+filtered task ids.
+"""
+from sqlalchemy import String, cast, distinct, func, literal, select, tuple_, union_all
+
+from app import db
+from app.models.task import Task
+from app.models.tag import task_tags
+
+FACET_VALUES = {
+    'status': ('pending', 'in_progress', 'completed'),
+    'priority': ('low', 'medium', 'high'),
+}
+
+
+def _empty(facets):
+    return {facet: dict.fromkeys(FACET_VALUES.get(facet, ()), 0) for facet in facets}
+
+
+def _grouping_sets(base, facets):
+    columns = {'status': base.c.status, 'priority': base.c.priority}
+    source = base
+    count = func.count()
+    if 'tag' in facets:
+        columns['tag'] = task_tags.c.tag_id
+        # The join repeats tasks once per tag, so count tasks, not rows
+        source = base.outerjoin(task_tags, task_tags.c.task_id == base.c.id)
+        count = func.count(distinct(base.c.id))
+
+    keys = [columns[facet] for facet in facets]
+    stmt = (select(*keys, *[func.grouping(key) for key in keys], count)
+            .select_from(source)
+            .group_by(func.grouping_sets(*[tuple_(key) for key in keys])))
+
+    for row in db.session.execute(stmt):
+        values, grouped, n = row[:len(keys)], row[len(keys):-1], row[-1]
+        # Exactly one key is not rolled up in each grouping set
+        index = list(grouped).index(0)
+        if values[index] is not None:
+            yield facets[index], str(values[index]), n
+
+
+def _union_all(base, facets):
+    selects = []
+    for facet in facets:
+        if facet == 'tag':
+            selects.append(
+                select(literal('tag').label('facet'),
+                       cast(task_tags.c.tag_id, String).label('value'), func.count())
+                .select_from(base.join(task_tags, task_tags.c.task_id == base.c.id))
+                .group_by(task_tags.c.tag_id))
+        else:
+            column = base.c[facet]
+            selects.append(
+                select(literal(facet).label('facet'), column.label('value'), func.count())
+                .group_by(column))
+
+    for facet, value, n in db.session.execute(union_all(*selects)):
+        if value is not None:
+            yield facet, value, n
+
+
+def facet_counts(query, facets):
+    """
+    Return ``{facet: {value: count}}`` for a filtered ``Task`` query.
+
+    Status and priority always list every value (zero when absent); the
+    tag facet is keyed by tag id (as a string, like any JSON key) and lists
+    only tags carried by at least one matching task.
+    """
+    base = (query.with_entities(Task.id.label('id'), Task.status.label('status'),
+                                Task.priority.label('priority'))
+                 .order_by(None)
+                 .cte('faceted_tasks'))
+    if db.session.get_bind().dialect.name == 'postgresql':
+        rows = _grouping_sets(base, list(facets))
+    else:
+        rows = _union_all(base, facets)
+
+    counts = _empty(facets)
+    for facet, value, n in rows:
+        counts[facet][value] = n
+    return counts
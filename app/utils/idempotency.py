@@ -0,0 +1,111 @@
+"""
+``Idempotency-Key`` support for POST endpoints.
+
+A request carrying the header runs with its commits deferred (see
+``app/utils/transaction.py``); a successful response is stored in
+``idempotency_keys`` in the same transaction as the writes it describes.
+A retry with the same key is answered from the stored row alone – status
+and body as first sent, plus ``Idempotent-Replayed: true`` – without
+touching the domain tables.  Reusing a key for a different request (method,
+path or body) is rejected with 422.  Two concurrent first attempts race on
+the table's primary key: the loser's writes are rolled back and it replays
+the winner's response.
+
+Entries expire after ``IDEMPOTENCY_KEY_TTL``; expired rows are purged every
+``IDEMPOTENCY_PURGE_INTERVAL`` seconds by the process that next stores a
+key, or on demand with ``flask purge-idempotency-keys``.
+"""
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.idempotency_key import IdempotencyKey
+from app.utils.transaction import single_commit
+
+HEADER = 'Idempotency-Key'
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return jsonify({"error": f"{HEADER} was already used for a different request"}), 422
+    response = current_app.response_class(stored.response_body, status=stored.status_code,
+                                          mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _purge_if_due():
+    state = current_app.extensions.setdefault('idempotency', {'purged_at': time.monotonic()})
+    if time.monotonic() - state['purged_at'] >= current_app.config['IDEMPOTENCY_PURGE_INTERVAL']:
+        state['purged_at'] = time.monotonic()
+        IdempotencyKey.purge()
+
+
+def _store(user_id, key_hash, request_hash, response):
+    now = datetime.utcnow()
+    # An expired entry for the same key may still be waiting for the purge
+    db.session.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.user_id == user_id, IdempotencyKey.key_hash == key_hash,
+        IdempotencyKey.expires_at <= now))
+    db.session.add(IdempotencyKey(
+        user_id=user_id,
+        key_hash=key_hash,
+        request_hash=request_hash,
+        status_code=response.status_code,
+        response_body=response.get_data(as_text=True),
+        expires_at=now + current_app.config['IDEMPOTENCY_KEY_TTL']
+    ))
+    _purge_if_due()
+
+
+def idempotent(f):
+    """Make a JWT-protected POST view safe to retry with an ``Idempotency-Key``."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return f(*args, **kwargs)
+        if not 0 < len(key) <= 255:
+            return jsonify({"error": f"{HEADER} must be 1 to 255 characters"}), 400
+
+        user_id = get_jwt_identity()
+        if isinstance(user_id, str):
+            user_id = int(user_id)
+        key_hash = _sha256(key)
+        request_hash = _sha256(request.method, request.path, request.get_data())
+
+        stored = IdempotencyKey.find(user_id, key_hash)
+        if stored is not None:
+            return _replay(stored, request_hash)
+
+        with single_commit():
+            response = current_app.make_response(f(*args, **kwargs))
+            # Only successes are kept: a failed attempt may be retried as is
+            if 200 <= response.status_code < 300:
+                _store(user_id, key_hash, request_hash, response)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            stored = IdempotencyKey.find(user_id, key_hash)
+            if stored is None:
+                raise
+            return _replay(stored, request_hash)
+        return response
+
+    return decorated_function
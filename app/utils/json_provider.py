@@ -0,0 +1,52 @@
+"""
+orjson-backed JSON provider.
+
+Renders responses the way Flask's ``DefaultJSONProvider`` does (sorted
+keys, ASCII-only, compact or two-space indented) several times faster.
+Output containing non-ASCII text, and anything orjson refuses to encode,
+is re-encoded with the standard library so it keeps Flask's exact bytes.
+Values orjson has no native encoding for go through
+``DefaultJSONProvider.default`` as before.  Floats in exponent notation
+and non-finite floats are the only values orjson spells differently.
+
+Enabled with ``JSON_PROVIDER = 'orjson'`` when orjson is installed.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Keyword arguments DefaultJSONProvider.response() passes to dumps()
+_COMPACT = {'separators': (',', ':')}
+_INDENTED = {'indent': 2}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """``DefaultJSONProvider`` with an orjson fast path for responses."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs == _COMPACT or kwargs == _INDENTED:
+            option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if kwargs == _INDENTED:
+                option |= orjson.OPT_INDENT_2
+            try:
+                text = orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                # e.g. non-string dict keys, which json.dumps coerces
+                text = None
+            if text is not None and text.isascii():
+                return text
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def init_json_provider(app):
+    """Install the provider selected by ``JSON_PROVIDER`` on ``app``."""
+    if app.config.get('JSON_PROVIDER') == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
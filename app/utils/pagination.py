@@ -0,0 +1,137 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort value and id of the
+row a page starts after (or before).  Seeking on ``(sort_column, id)``
+lets the database walk an index straight to the next page instead of
+scanning and discarding ``OFFSET`` rows, so deep pages cost the same as
+the first one.
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import and_, or_, asc, desc
+
+KeysetPage = namedtuple('KeysetPage', ['items', 'next_cursor', 'prev_cursor'])
+
+
+class CursorError(ValueError):
+    """Raised when a cursor token is malformed or was issued for another sort."""
+
+
+def encode_cursor(value, row_id, direction='next', key=None):
+    """Build an opaque cursor token for the given sort value and row id."""
+    if isinstance(value, datetime):
+        value = {'dt': value.isoformat()}
+    payload = {'v': value, 'id': row_id, 'd': direction, 'k': key}
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, key=None):
+    """Decode a cursor token, checking it was issued for the same sort key."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload['v']
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value['dt'])
+        row_id = int(payload['id'])
+        direction = payload['d']
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise CursorError("Invalid cursor")
+
+    if direction not in ('next', 'prev'):
+        raise CursorError("Invalid cursor")
+    if payload.get('k') != key:
+        raise CursorError("Cursor does not match the requested sort order")
+
+    return {'value': value, 'id': row_id, 'direction': direction}
+
+
+def _is_nullable(column):
+    return getattr(getattr(column, 'expression', column), 'nullable', True)
+
+
+def _order_by(sort_column, id_column, descending, nulls_first):
+    """ORDER BY clauses: NULL sort values kept together, id as tiebreaker."""
+    direction = desc if descending else asc
+    clauses = []
+    if sort_column is not None:
+        if _is_nullable(sort_column):
+            null_flag = sort_column.is_(None)
+            clauses.append(desc(null_flag) if nulls_first else asc(null_flag))
+        clauses.append(direction(sort_column))
+    clauses.append(direction(id_column))
+    return clauses
+
+
+def _seek(sort_column, id_column, value, row_id, descending, backwards):
+    """WHERE clause selecting rows strictly after (or before) the cursor row."""
+    # Walking forwards on a descending sort means "smaller than the cursor".
+    smaller = descending != backwards
+
+    def beyond(column, bound):
+        return column < bound if smaller else column > bound
+
+    if sort_column is None:
+        return beyond(id_column, row_id)
+
+    nullable = _is_nullable(sort_column)
+    if value is None:
+        # NULLs sort last going forwards, so only NULL rows follow a NULL cursor.
+        tail = and_(sort_column.is_(None), beyond(id_column, row_id))
+        return or_(sort_column.isnot(None), tail) if backwards else tail
+
+    clause = or_(beyond(sort_column, value),
+                 and_(sort_column == value, beyond(id_column, row_id)))
+    if not nullable:
+        return clause
+    if backwards:
+        return and_(sort_column.isnot(None), clause)
+    return or_(clause, sort_column.is_(None))
+
+
+def paginate_keyset(query, id_column, per_page, cursor=None, sort_column=None,
+                    descending=True, key=None):
+    """
+    Return one page of ``query`` ordered by ``(sort_column, id_column)``.
+
+    ``query`` must not already be ordered.  ``key`` identifies the sort in
+    use and is embedded in every cursor so a token issued for one ordering
+    is rejected when replayed against another.  Raises ``CursorError`` for
+    invalid tokens.
+    """
+    position = decode_cursor(cursor, key) if cursor else None
+    backwards = position is not None and position['direction'] == 'prev'
+
+    if position is not None:
+        query = query.filter(_seek(sort_column, id_column, position['value'],
+                                   position['id'], descending, backwards))
+
+    query = query.order_by(*_order_by(sort_column, id_column,
+                                      descending != backwards,
+                                      nulls_first=backwards))
+
+    # Fetch one extra row to learn whether another page exists.
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_for(row, direction):
+        value = getattr(row, sort_column.key) if sort_column is not None else None
+        return encode_cursor(value, getattr(row, id_column.key), direction, key)
+
+    next_cursor = prev_cursor = None
+    if rows:
+        # Paging backwards always leaves the cursor row itself ahead of us.
+        if has_more or backwards:
+            next_cursor = cursor_for(rows[-1], 'next')
+        if (backwards and has_more) or (not backwards and position is not None):
+            prev_cursor = cursor_for(rows[0], 'prev')
+
+    return KeysetPage(rows, next_cursor, prev_cursor)
@@ -0,0 +1,181 @@
+"""
+In-process cache of rendered list responses, per user.
+
+Cached views are keyed by user id, the user's generation counter and the
+normalised query string (validated through the view's query schema where
+it has one, so ``?per_page=010&status=pending`` and
+``?status=pending&per_page=10`` share an entry).  Invalidation is O(1):
+writes bump the user's generation and stale entries simply stop being
+looked up until the LRU evicts them.
+
+Generations are bumped after commit for every user whose tasks, tags or
+comments changed (see ``UserDataVersion``) and by ``log_activity``.  The
+key also carries the user's database data version, so writes made by
+other worker processes are never served stale.
+"""
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request, g, has_app_context
+from flask_jwt_extended import get_jwt_identity
+from marshmallow import ValidationError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.data_version import UserDataVersion
+from app.utils.transaction import commits_deferred
+
+# Rough per-entry bookkeeping cost on top of the body itself
+_ENTRY_OVERHEAD = 256
+
+
+class ResponseCache:
+    """Thread-safe LRU of response bodies bounded by total size in bytes."""
+
+    def __init__(self, max_bytes, max_entry_bytes):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self.size = 0
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def generation(self, user_id):
+        return self._generations.get(user_id, 0)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, body, mimetype):
+        cost = len(body) + _ENTRY_OVERHEAD
+        if cost > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = ((body, mimetype), cost)
+            self.size += cost
+            while self.size > self.max_bytes and self._entries:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.size -= evicted_cost
+                self.evictions += 1
+
+    def invalidate(self, user_ids):
+        """Bump the generation of each user, orphaning their cached entries."""
+        with self._lock:
+            for user_id in user_ids:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+def get_response_cache():
+    """The current application's response cache."""
+    cache = current_app.extensions.get('response_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('response_cache', ResponseCache(
+            current_app.config.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024),
+            current_app.config.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', 1024 * 1024)
+        ))
+    return cache
+
+
+def _normalised_args(schema):
+    raw = {k: v for k, v in request.args.items() if v}
+    if schema is not None:
+        raw = schema.load(raw)
+    # Parameters sent empty still change behaviour (e.g. `?cursor=`)
+    present = tuple(sorted(k for k in request.args if not request.args.get(k)))
+    return tuple(sorted((k, repr(v)) for k, v in raw.items())), present
+
+
+def cached_response(schema=None):
+    """
+    Decorator caching a view's 200 responses per user and query string.
+
+    Apply below ``@jwt_required()`` (and ``@conditional_get`` when used).
+    Requests whose query string fails ``schema`` bypass the cache so the
+    view reports the validation error itself, as do ``/batch`` sub-requests.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Inside /batch the data version may belong to work that is
+            # later rolled back: neither serve nor store entries there
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED', False) or commits_deferred():
+                return fn(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            if isinstance(user_id, str):
+                user_id = int(user_id)
+            try:
+                normalised = _normalised_args(schema)
+            except ValidationError:
+                return fn(*args, **kwargs)
+
+            cache = get_response_cache()
+            data_version = g.get('data_version')
+            if data_version is None:
+                data_version = UserDataVersion.current(user_id)[0]
+            key = (user_id, cache.generation(user_id), data_version,
+                   request.endpoint, tuple(sorted(kwargs.items())), normalised)
+
+            hit = cache.get(key)
+            if hit is not None:
+                body, mimetype = hit
+                response = current_app.response_class(body, 200, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(fn(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.set(key, response.get_data(), response.mimetype)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------- #
+# Bump generations once the writes that changed a user's data commit
+# ---------------------------------------------------------------------- #
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    user_ids = session.info.pop('bumped_user_ids', None)
+    if user_ids and has_app_context():
+        get_response_cache().invalidate(user_ids)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_uncommitted(session, previous_transaction):
+    session.info.pop('bumped_user_ids', None)
@@ -0,0 +1,137 @@
+"""
+Full-text search over task titles and descriptions.
+
+PostgreSQL uses the generated ``tasks.search_vector`` tsvector column and
+its GIN index; SQLite uses the ``tasks_fts`` FTS5 shadow table.  Both are
+created alongside the ``tasks`` table (see ``app/models/task.py``).  Any
+other backend, or ``TASK_SEARCH_BACKEND = 'ilike'``, falls back to the
+original unindexed ``ILIKE`` scan.
+"""
+import html
+import re
+
+from flask import current_app
+from sqlalchemy import or_, text, literal_column, func, Integer, Float, bindparam
+
+from app import db
+from app.models.task import Task
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+# Stand-ins the database wraps matches in.  Snippets are HTML-escaped
+# before these become <mark> tags, so stored markup is never returned live.
+_MATCH_START = '\ue000'
+_MATCH_END = '\ue001'
+
+
+def search_backend():
+    """Name of the search implementation in use: postgresql, sqlite or ilike."""
+    if current_app.config.get('TASK_SEARCH_BACKEND', 'auto') == 'ilike':
+        return 'ilike'
+    dialect = db.session.get_bind().dialect.name
+    return dialect if dialect in ('postgresql', 'sqlite') else 'ilike'
+
+
+def _tokens(term):
+    return _TOKEN_RE.findall(term.lower())
+
+
+def _fts5_match(tokens):
+    # Quote every token so user input can never be parsed as FTS5 syntax;
+    # the trailing * makes each one a prefix match.
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def apply_search(query, term):
+    """
+    Restrict a ``Task`` query to rows matching ``term``.
+
+    Returns ``(query, relevance)`` where ``relevance`` is a SQL expression
+    that sorts best matches first when used descending, or ``None`` when the
+    active backend cannot rank results.
+    """
+    backend = search_backend()
+    tokens = _tokens(term)
+
+    if backend == 'ilike' or not tokens:
+        like = f"%{term}%"
+        return query.filter(or_(Task.title.ilike(like),
+                                Task.description.ilike(like))), None
+
+    if backend == 'postgresql':
+        ts_query = func.to_tsquery('english', _tsquery(tokens))
+        vector = literal_column('tasks.search_vector')
+        return (query.filter(vector.op('@@')(ts_query)),
+                func.ts_rank(vector, ts_query))
+
+    # SQLite: join against the FTS5 match set.  It is materialised so the
+    # planner runs the MATCH once instead of probing the virtual table for
+    # every candidate task.  bm25() is lower-is-better, so negate it; title
+    # hits are weighted above description hits.
+    matches = (
+        text("SELECT rowid AS task_id, bm25(tasks_fts, 10.0, 1.0) AS rank "
+             "FROM tasks_fts WHERE tasks_fts MATCH :match")
+        .bindparams(match=_fts5_match(tokens))
+        .columns(task_id=Integer, rank=Float)
+        .cte('fts_matches')
+        .prefix_with('MATERIALIZED')
+    )
+    query = query.join(matches, matches.c.task_id == Task.id)
+    return query, -matches.c.rank
+
+
+def _markup(snippet):
+    """Escape a snippet, then turn the match stand-ins into <mark> tags."""
+    return (html.escape(snippet or '')
+            .replace(_MATCH_START, SNIPPET_START).replace(_MATCH_END, SNIPPET_END))
+
+
+def highlight(term, task_ids):
+    """Return ``{task_id: snippet}`` with matched words wrapped in <mark>."""
+    if not task_ids:
+        return {}
+
+    backend = search_backend()
+    tokens = _tokens(term)
+
+    if backend == 'postgresql' and tokens:
+        stmt = text(
+            "SELECT id, ts_headline('english', "
+            "coalesce(nullif(description, ''), title), to_tsquery('english', :q), "
+            ":options) FROM tasks WHERE id IN :ids"
+        ).bindparams(bindparam('ids', expanding=True))
+        rows = db.session.execute(stmt, {
+            'q': _tsquery(tokens), 'ids': list(task_ids),
+            'options': f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords=24, MinWords=8"
+        })
+        return {row[0]: _markup(row[1]) for row in rows}
+
+    if backend == 'sqlite' and tokens:
+        # Column -1 lets FTS5 pick whichever column matched best.
+        stmt = text(
+            "SELECT rowid, snippet(tasks_fts, -1, :start, :end, '…', 16) "
+            "FROM tasks_fts WHERE tasks_fts MATCH :match AND rowid IN :ids"
+        ).bindparams(bindparam('ids', expanding=True))
+        rows = db.session.execute(stmt, {
+            'start': _MATCH_START, 'end': _MATCH_END,
+            'match': _fts5_match(tokens), 'ids': list(task_ids)
+        })
+        return {row[0]: _markup(row[1]) for row in rows}
+
+    # ILIKE fallback: mark the literal term inside the title or description.
+    pattern = re.compile(re.escape(term), re.IGNORECASE)
+    snippets = {}
+    for task_id, title, description in (
+        db.session.query(Task.id, Task.title, Task.description)
+                  .filter(Task.id.in_(task_ids))
+    ):
+        source = description if description and pattern.search(description) else title
+        snippets[task_id] = _markup(pattern.sub(
+            lambda m: f"{_MATCH_START}{m.group(0)}{_MATCH_END}", source or ''))
+    return snippets
@@ -0,0 +1,44 @@
+"""
+Small dialect-aware SQL helpers shared by the models.
+"""
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def upsert_increment(executor, model, keys, column, delta, **extra):
+    """
+    Atomically add ``delta`` to ``model.column`` for the row identified by
+    ``keys``, inserting the row with ``column = delta`` if it does not exist.
+
+    ``executor`` is a Session or Connection; ``extra`` columns are written on
+    both insert and update.  PostgreSQL and SQLite use a single
+    ``INSERT ... ON CONFLICT DO UPDATE``; other dialects fall back to an
+    UPDATE followed by an INSERT when no row matched.
+    """
+    bind = executor.get_bind() if hasattr(executor, 'get_bind') else executor
+    dialect = bind.dialect.name
+    values = {**keys, column: delta, **extra}
+    increment = {column: getattr(model, column) + delta, **extra}
+
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = pg_insert if dialect == 'postgresql' else sqlite_insert
+        executor.execute(
+            dialect_insert(model).values(**values)
+            .on_conflict_do_update(index_elements=list(keys), set_=increment)
+        )
+        return
+
+    result = executor.execute(
+        update(model)
+        .where(*[getattr(model, name) == value for name, value in keys.items()])
+        .values(**increment)
+    )
+    if result.rowcount == 0:
+        executor.execute(insert(model).values(**values))
+
+
+def chunked(values, size):
+    """Yield successive ``size``-long slices of a sequence."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
@@ -0,0 +1,53 @@
+"""
+Streaming JSON responses for unbounded listings.
+
+``stream_json`` iterates a query with ``yield_per`` (a server-side cursor
+on PostgreSQL) and emits the serialised rows in batches through a
+generator ``Response``, so neither the ORM objects nor the JSON text for
+the whole result are ever held in memory at once.  Each batch is encoded
+with the application's JSON provider, so values render exactly as they
+would through ``jsonify`` (compact form).
+"""
+from itertools import chain
+
+from flask import current_app, stream_with_context
+
+_COMPACT = {'separators': (',', ':')}
+
+
+def _generate(queries, dump, key, trailer, chunk_size):
+    encode = current_app.json.dumps
+    yield '{' + encode(key) + ':[' if key else '['
+
+    count = 0
+    batch = []
+    for obj in chain.from_iterable(query.yield_per(chunk_size) for query in queries):
+        batch.append(encode(dump(obj), **_COMPACT))
+        count += 1
+        if len(batch) == chunk_size:
+            yield (',' if count > chunk_size else '') + ','.join(batch)
+            batch.clear()
+    if batch:
+        yield (',' if count > len(batch) else '') + ','.join(batch)
+
+    if not key:
+        yield ']\n'
+        return
+    extra = {'total': count, **(trailer or {})}
+    # Splice the trailing members into the envelope after the array
+    yield '],' + encode(extra, **_COMPACT)[1:] + '\n'
+
+
+def stream_json(query, dump, key=None, trailer=None, chunk_size=500):
+    """
+    Stream ``query`` as a JSON array of ``dump(row)``; a list of queries is
+    streamed one after the other as a single array.
+
+    With ``key`` the array is wrapped as ``{key: [...], "total": n, **trailer}``
+    where ``total`` is the number of rows actually streamed.
+    """
+    return current_app.response_class(
+        stream_with_context(_generate(query if isinstance(query, (list, tuple)) else [query],
+                                      dump, key, trailer, chunk_size)),
+        mimetype='application/json'
+    )
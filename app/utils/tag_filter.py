@@ -0,0 +1,208 @@
+"""
+Multi-tag task filtering: ``?tags=1,2,3&tag_mode=all|any|none``.
+
+The SQL plan runs against ``task_tags`` alone, driven by its
+``(tag_id, task_id)`` index: ``any`` and ``none`` are (NOT) IN the tasks
+carrying any of the tags, and ``all`` is a ``GROUP BY task_id HAVING
+COUNT(tag_id) = n`` subquery, so no join multiplies the task rows.
+
+With ``TAG_BITMAP_INDEX`` enabled, ``TagBitmapIndex`` keeps a per-user
+bitset of task positions for every tag, built lazily on first use.  The
+bitmaps remember the user's data version (``UserDataVersion``) they
+reflect; when the user has moved on, the tasks stamped with a later
+``change_seq`` have their tags re-read and later tombstones are applied,
+so tagging done by any worker or statement is seen at once.
+Intersections and unions are then integer bit operations; the matching ids are handed to SQL as an ``IN`` list when
+there are few enough of them, otherwise the SQL plan is used.  Each
+application gets its own index in ``app.extensions``.
+"""
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import false, func, select
+
+from app import db
+from app.models.task import Task
+from app.models.tag import task_tags
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+
+TAG_MODES = ('any', 'all', 'none')
+
+
+def _tag_filter_sql(tag_ids, mode):
+    # Driven from the (tag_id, task_id) index: one range scan per tag
+    matching = select(task_tags.c.task_id).where(task_tags.c.tag_id.in_(tag_ids))
+    if mode == 'all':
+        matching = (matching.group_by(task_tags.c.task_id)
+                            .having(func.count(task_tags.c.tag_id) == len(tag_ids)))
+    return Task.id.not_in(matching) if mode == 'none' else Task.id.in_(matching)
+
+
+def apply_tag_filter(query, user_id, tag_ids, mode='any'):
+    """Restrict a ``Task`` query to tasks carrying any/all/none of ``tag_ids``."""
+    tag_ids = sorted(set(tag_ids))
+    if current_app.config.get('TAG_BITMAP_INDEX', False):
+        task_ids = get_tag_index().match(user_id, tag_ids, mode)
+        if task_ids is not None:
+            return query.filter(Task.id.in_(task_ids) if task_ids else false())
+    return query.filter(_tag_filter_sql(tag_ids, mode))
+
+
+class _UserBitmaps:
+    """Tag → bitset over positions of one user's tasks."""
+
+    def __init__(self, version):
+        self.positions = {}      # task id -> bit position
+        self.task_ids = []       # bit position -> task id (None once deleted)
+        self.tags = {}           # tag id -> int bitset
+        self.live = 0            # bitset of tasks that still exist
+        self.version = version   # the user's data version reflected
+
+    def add_task(self, task_id):
+        position = self.positions.get(task_id)
+        if position is None:
+            position = self.positions[task_id] = len(self.task_ids)
+            self.task_ids.append(task_id)
+            self.live |= 1 << position
+        return 1 << position
+
+    def attach(self, task_id, tag_id):
+        self.tags[tag_id] = self.tags.get(tag_id, 0) | self.add_task(task_id)
+
+    def reset_task(self, task_id):
+        """Add the task, or clear its bit in every tag before re-attaching."""
+        mask = ~self.add_task(task_id)
+        for tag_id in self.tags:
+            self.tags[tag_id] &= mask
+
+    def remove_task(self, task_id):
+        position = self.positions.pop(task_id, None)
+        if position is None:
+            return
+        mask = ~(1 << position)
+        self.task_ids[position] = None
+        self.live &= mask
+        for tag_id in self.tags:
+            self.tags[tag_id] &= mask
+
+    def match(self, tag_ids, mode):
+        bitsets = [self.tags.get(tag_id, 0) for tag_id in tag_ids]
+        if mode == 'all':
+            result = self.live
+            for bits in bitsets:
+                result &= bits
+        else:
+            result = 0
+            for bits in bitsets:
+                result |= bits
+            if mode == 'none':
+                result = self.live & ~result
+        return result
+
+    def ids(self, bits):
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.task_ids[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+
+class TagBitmapIndex:
+    """Bounded, thread-safe collection of per-user tag bitmaps."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._users = OrderedDict()
+
+    def _config(self, key, default):
+        return current_app.config.get(key, default)
+
+    def _user_bitmaps(self, user_id):
+        """Return the user's bitmaps, brought up to their current data version."""
+        row = db.session.query(UserDataVersion.version, UserDataVersion.compacted_seq) \
+                        .filter_by(user_id=user_id).first()
+        version, compacted = row if row else (0, 0)
+
+        with self._lock:
+            bitmaps = self._users.get(user_id)
+            if bitmaps is not None:
+                self._users.move_to_end(user_id)
+        if bitmaps is not None and bitmaps.version == version:
+            return bitmaps
+        if bitmaps is not None and compacted <= bitmaps.version < version \
+                and self._catch_up(user_id, bitmaps, version):
+            return bitmaps
+
+        bitmaps = _UserBitmaps(version)
+        for (task_id,) in db.session.query(Task.id).filter(Task.user_id == user_id) \
+                                    .order_by(Task.id).yield_per(5000):
+            bitmaps.add_task(task_id)
+        rows = (db.session.query(task_tags.c.task_id, task_tags.c.tag_id)
+                          .join(Task, Task.id == task_tags.c.task_id)
+                          .filter(Task.user_id == user_id))
+        for task_id, tag_id in rows.yield_per(5000):
+            bitmaps.attach(task_id, tag_id)
+
+        with self._lock:
+            self._users[user_id] = bitmaps
+            self._users.move_to_end(user_id)
+            while len(self._users) > self._config('TAG_BITMAP_INDEX_MAX_USERS', 1000):
+                self._users.popitem(last=False)
+        return bitmaps
+
+    def _catch_up(self, user_id, bitmaps, version):
+        """
+        Apply the changes after ``bitmaps.version``; False when there are
+        too many of them and a rebuild is cheaper.
+        """
+        since = bitmaps.version
+        limit = self._config('TAG_BITMAP_MAX_IDS', 5000)
+        changed = [task_id for (task_id,) in db.session.query(Task.id).filter(
+            Task.user_id == user_id, Task.change_seq > since, Task.change_seq <= version
+        ).limit(limit + 1)]
+        if len(changed) > limit:
+            return False
+        links = db.session.query(task_tags.c.task_id, task_tags.c.tag_id).filter(
+            task_tags.c.task_id.in_(changed)).all() if changed else []
+        deleted = db.session.query(Tombstone.entity, Tombstone.entity_id).filter(
+            Tombstone.user_id == user_id, Tombstone.entity.in_(('task', 'tag')),
+            Tombstone.change_seq > since, Tombstone.change_seq <= version).all()
+
+        with self._lock:
+            if bitmaps.version != since:
+                return True     # another request caught up first
+            for entity, entity_id in deleted:
+                if entity == 'task':
+                    bitmaps.remove_task(entity_id)
+                else:
+                    bitmaps.tags.pop(entity_id, None)
+            for task_id in changed:
+                bitmaps.reset_task(task_id)
+            for task_id, tag_id in links:
+                bitmaps.attach(task_id, tag_id)
+            bitmaps.version = version
+        return True
+
+    def match(self, user_id, tag_ids, mode):
+        """
+        Return the ids of the user's tasks matching ``tag_ids`` under
+        ``mode``, or None when there are more than ``TAG_BITMAP_MAX_IDS``.
+        """
+        bitmaps = self._user_bitmaps(user_id)
+        with self._lock:
+            bits = bitmaps.match(tag_ids, mode)
+            if bits.bit_count() > self._config('TAG_BITMAP_MAX_IDS', 5000):
+                return None
+            return bitmaps.ids(bits)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+def get_tag_index():
+    """The current application's tag bitmap index."""
+    return current_app.extensions.setdefault('tag_bitmap_index', TagBitmapIndex())
@@ -0,0 +1,33 @@
+"""
+Grouping the commits of several views into one transaction.
+"""
+from contextlib import contextmanager
+
+from app import db
+
+
+@contextmanager
+def single_commit(session=None):
+    """
+    Make ``commit()`` on the session flush only, within the block.
+
+    Views commit as they go; wrapping them lets the caller decide once, at
+    the end, whether the combined work is committed or rolled back.  Blocks
+    nest: the innermost one restores the outer one's behaviour on exit.
+    """
+    session = session if session is not None else db.session()
+    previous = session.__dict__.get('commit')
+    session.commit = session.flush
+    try:
+        yield session
+    finally:
+        if previous is None:
+            del session.commit
+        else:
+            session.commit = previous
+
+
+def commits_deferred(session=None):
+    """True inside a ``single_commit`` block."""
+    session = session if session is not None else db.session()
+    return 'commit' in session.__dict__
@@ -0,0 +1,218 @@
+"""
+Typo-tolerant trigram search over task titles and descriptions.
+
+PostgreSQL answers trigram queries with ``pg_trgm`` GIN indexes.  Other
+databases use ``TrigramIndex``, an in-process inverted index from trigram
+to task ids, built per user on first search.  Each index remembers the
+user's data version (``UserDataVersion``) it reflects; a search whose
+user has moved on first applies the tasks and tombstones stamped with a
+later ``change_seq``, so writes from any worker or statement show up
+without a rebuild.  Each application gets its own index in
+``app.extensions``.
+
+Scores follow ``pg_trgm``'s ``word_similarity``: the share of the query's
+trigrams that occur in the task, so short fragments and misspellings of
+longer words still score well.
+"""
+import math
+import re
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import func, or_, literal, text
+
+from app import db
+from app.models.task import Task
+from app.models.data_version import UserDataVersion
+from app.models.tombstone import Tombstone
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def trigrams(text_value):
+    """``pg_trgm``-style trigrams: words padded with two leading and one trailing space."""
+    grams = set()
+    for word in _WORD_RE.findall((text_value or '').lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _UserIndex:
+    """Postings and per-task trigram sets for one user's tasks."""
+
+    def __init__(self, version):
+        self.postings = {}
+        self.documents = {}
+        # The user's data version the index reflects
+        self.version = version
+        # Set when the build stopped at TRIGRAM_INDEX_MAX_TASKS
+        self.partial = False
+
+    def add(self, task_id, title, description):
+        self.remove(task_id)
+        grams = frozenset(trigrams(title) | trigrams(description))
+        self.documents[task_id] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(task_id)
+
+    def remove(self, task_id):
+        grams = self.documents.pop(task_id, None)
+        for gram in grams or ():
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del self.postings[gram]
+
+
+class TrigramIndex:
+    """Bounded, thread-safe collection of per-user trigram indexes."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._users = OrderedDict()
+
+    def _config(self, key, default):
+        return current_app.config.get(key, default)
+
+    def _user_index(self, user_id):
+        """Return the user's index, brought up to their current data version."""
+        row = db.session.query(UserDataVersion.version, UserDataVersion.compacted_seq) \
+                        .filter_by(user_id=user_id).first()
+        version, compacted = row if row else (0, 0)
+
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                self._users.move_to_end(user_id)
+        if index is not None and index.version == version:
+            return index
+        if index is not None and compacted <= index.version < version:
+            self._catch_up(user_id, index, version)
+            return index
+
+        # Bounded build: the most recently changed tasks up to the cap
+        limit = self._config('TRIGRAM_INDEX_MAX_TASKS', 50000)
+        index = _UserIndex(version)
+        rows = db.session.query(Task.id, Task.title, Task.description) \
+                         .filter(Task.user_id == user_id) \
+                         .order_by(Task.change_seq.desc()).limit(limit + 1)
+        for count, (task_id, title, description) in enumerate(rows.yield_per(1000)):
+            if count == limit:
+                index.partial = True
+                break
+            index.add(task_id, title, description)
+
+        with self._lock:
+            self._users[user_id] = index
+            self._users.move_to_end(user_id)
+            while len(self._users) > self._config('TRIGRAM_INDEX_MAX_USERS', 1000):
+                self._users.popitem(last=False)
+        return index
+
+    def _catch_up(self, user_id, index, version):
+        """Apply the tasks written and deleted after ``index.version``."""
+        since = index.version
+        written = db.session.query(Task.id, Task.title, Task.description).filter(
+            Task.user_id == user_id, Task.change_seq > since, Task.change_seq <= version).all()
+        deleted = db.session.query(Tombstone.entity_id).filter(
+            Tombstone.user_id == user_id, Tombstone.entity == 'task',
+            Tombstone.change_seq > since, Tombstone.change_seq <= version).all()
+        with self._lock:
+            if index.version != since:
+                return      # another request caught up first
+            for (task_id,) in deleted:
+                index.remove(task_id)
+            for task_id, title, description in written:
+                index.add(task_id, title, description)
+            index.version = version
+
+    def search(self, user_id, term, threshold):
+        """
+        Return ``([(task_id, score)], truncated)``: the matches, best first,
+        and whether the candidate cap cut the match set short.
+        """
+        query_grams = trigrams(term)
+        if not query_grams:
+            return [], False
+
+        index = self._user_index(user_id)
+        truncated = index.partial
+        max_candidates = self._config('TRIGRAM_MAX_CANDIDATES', 20000)
+        needed = max(1, math.ceil(threshold * len(query_grams)))
+
+        with self._lock:
+            # A task sharing `needed` of the query's trigrams must contain at
+            # least one of the rarest len - needed + 1 of them, so only those
+            # postings are scanned; the candidate cap bounds the work outright.
+            ranked = sorted(query_grams, key=lambda g: len(index.postings.get(g, ())))
+            candidates = set()
+            for gram in ranked[:len(ranked) - needed + 1]:
+                candidates.update(index.postings.get(gram, ()))
+                if len(candidates) >= max_candidates:
+                    truncated = True
+                    break
+
+            scored = []
+            for task_id in candidates:
+                score = len(query_grams & index.documents[task_id]) / len(query_grams)
+                if score >= threshold:
+                    scored.append((score, -len(index.documents[task_id]), task_id))
+
+        scored.sort(reverse=True)
+        return [(task_id, score) for score, _, task_id in scored], truncated
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+def get_trigram_index():
+    """The current application's trigram index."""
+    return current_app.extensions.setdefault('trigram_index', TrigramIndex())
+
+
+def trigram_search(query, user_id, term, threshold, page, per_page, options=()):
+    """
+    Return ``(matches, total, truncated)`` for ``term``: the ``[(task, score)]``
+    on the requested page, the number of matching tasks and whether the
+    candidate cap left some matches out.
+
+    ``query`` is a ``Task`` query already narrowed by the caller's other
+    filters; it is further restricted to the trigram matches here.
+    ``options`` are loader options for the page's tasks.
+    """
+    offset = (page - 1) * per_page
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # Scope the operator threshold to this transaction so `<%` can use
+        # the gin_trgm_ops indexes.
+        db.session.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+            {'t': str(threshold)}
+        )
+        term_value = literal(term)
+        score = func.greatest(func.word_similarity(term_value, Task.title),
+                              func.coalesce(func.word_similarity(term_value, Task.description), 0))
+        matching = query.filter(or_(term_value.op('<%')(Task.title),
+                                    term_value.op('<%')(Task.description)))
+        total = matching.order_by(None).count()
+        rows = (matching.options(*options)
+                        .add_columns(score.label('score'))
+                        .order_by(score.desc(), Task.id.desc())
+                        .limit(per_page).offset(offset).all())
+        return [(task, float(score_value)) for task, score_value in rows], total, False
+
+    ranked, truncated = get_trigram_index().search(user_id, term, threshold)
+    if not ranked:
+        return [], 0, truncated
+    scores = dict(ranked)
+    # The caller's other filters, over the ids only
+    ids = [task_id for (task_id,) in
+           query.with_entities(Task.id).filter(Task.id.in_(scores)).order_by(None)]
+    ids.sort(key=lambda task_id: (-scores[task_id], -task_id))
+    page_ids = ids[offset:offset + per_page]
+    tasks = query.options(*options).filter(Task.id.in_(page_ids)).all() if page_ids else []
+    tasks.sort(key=lambda task: (-scores[task.id], -task.id))
+    return [(task, scores[task.id]) for task in tasks], len(ids), truncated
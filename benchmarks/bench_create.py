@@ -0,0 +1,82 @@
+"""
+Measure task creation throughput through the API.
+
+    python -m benchmarks.bench_create --count 2000 --tags 3 --batch 500
+
+Each run gets a fresh database holding one account with ``--tags`` tags
+and issues ``--count`` ``POST /api/v1/tasks`` requests through the test
+client, half of them carrying every tag in ``tag_ids``, then an update of
+each created task.  The same ``--count`` tasks are then created again
+through ``POST /api/v1/tasks/bulk/create`` in requests of ``--batch``.
+Reports tasks created (and updated) per second.
+"""
+import argparse
+import json
+import time
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+
+from app import db
+from app.models.tag import Tag
+from benchmarks.common import make_app, create_user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--tags', type=int, default=3)
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    app, cleanup = make_app(args.database_url)
+    try:
+        with app.app_context():
+            user_id = create_user()
+            db.session.execute(insert(Tag), [
+                {'name': f'tag-{i}', 'color': '#3498db', 'user_id': user_id}
+                for i in range(args.tags)
+            ])
+            db.session.commit()
+            tag_ids = [tag_id for (tag_id,) in db.session.query(Tag.id)]
+            token = create_access_token(identity=str(user_id))
+
+        headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+        client = app.test_client()
+        bodies = [
+            json.dumps({'title': f'Task {i}', 'priority': 'high',
+                        **({'tag_ids': tag_ids} if i % 2 else {})})
+            for i in range(args.count)
+        ]
+
+        created = []
+        start = time.perf_counter()
+        for body in bodies:
+            response = client.post('/api/v1/tasks', data=body, headers=headers)
+            created.append(response.get_json()['task']['id'])
+        create_s = time.perf_counter() - start
+
+        update = json.dumps({'status': 'in_progress', 'tag_ids': tag_ids[:1]})
+        start = time.perf_counter()
+        for task_id in created:
+            client.put(f'/api/v1/tasks/{task_id}', data=update, headers=headers)
+        update_s = time.perf_counter() - start
+
+        items = [json.loads(body) for body in bodies]
+        start = time.perf_counter()
+        for offset in range(0, len(items), args.batch):
+            batch = json.dumps({'tasks': items[offset:offset + args.batch]})
+            response = client.post('/api/v1/tasks/bulk/create', data=batch, headers=headers)
+            assert response.status_code == 201, response.get_json()
+        bulk_s = time.perf_counter() - start
+
+        print(f"{'tasks':>9} {'creates/s':>10} {'updates/s':>10} {'bulk creates/s':>15}")
+        print(f"{args.count:>9} {args.count / create_s:>10.0f} {args.count / update_s:>10.0f} "
+              f"{args.count / bulk_s:>15.0f}")
+    finally:
+        cleanup()
+
+
+if __name__ == '__main__':
+    main()
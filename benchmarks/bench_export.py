@@ -0,0 +1,72 @@
+"""
+Peak memory of the JSON task export: buffered list vs streamed response.
+
+    python -m benchmarks.bench_export --sizes 10000 50000 100000
+
+"buffered" is the previous implementation (load every task, dump the list,
+``jsonify``); "streamed" is ``GET /api/v1/tasks/export?format=json``
+consumed chunk by chunk.  Peak Python heap is measured with tracemalloc.
+"""
+import argparse
+import time
+import tracemalloc
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models.task import Task
+from app.schemas import tasks_serializer
+from benchmarks.common import make_app, create_user, seed_tasks
+
+
+def measure(fn):
+    """Run ``fn`` and return ``(peak MiB, seconds, bytes produced)``."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9}  {'mode':<9} {'peak MiB':>9} {'seconds':>8} {'MiB out':>8}")
+    for size in args.sizes:
+        app, cleanup = make_app(args.database_url)
+        try:
+            with app.app_context():
+                user_id = create_user()
+                seed_tasks(user_id, size)
+                token = create_access_token(identity=str(user_id))
+
+            def buffered():
+                with app.test_request_context():
+                    tasks = Task.query.filter_by(user_id=user_id).order_by(Task.id).all()
+                    body = jsonify(tasks_serializer.dump(tasks)).get_data()
+                    db.session.remove()
+                    return len(body)
+
+            def streamed():
+                client = app.test_client()
+                response = client.get('/api/v1/tasks/export?format=json',
+                                      headers={'Authorization': f'Bearer {token}'})
+                total = sum(len(chunk) for chunk in response.response)
+                response.close()
+                return total
+
+            for mode, fn in (('buffered', buffered), ('streamed', streamed)):
+                peak, seconds, out = measure(fn)
+                print(f"{size:>9}  {mode:<9} {peak:>9.1f} {seconds:>8.2f} {out / 2 ** 20:>8.1f}")
+        finally:
+            cleanup()
+
+
+if __name__ == '__main__':
+    main()
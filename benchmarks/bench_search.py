@@ -0,0 +1,57 @@
+"""
+Compare the full-text search backend with the original ILIKE scan.
+
+    python -m benchmarks.bench_search --sizes 10000 100000 1000000
+
+Each size gets a fresh database holding one account with that many tasks;
+the timed operation is what ``GET /api/v1/tasks?search=...`` runs: the
+filtered count plus the first page of ten rows.
+"""
+import argparse
+
+from sqlalchemy import desc
+
+from app import db
+from app.models.task import Task
+from app.utils.search import apply_search, search_backend
+from benchmarks.common import make_app, create_user, seed_tasks, timed
+
+TERMS = ('invoice', 'budget review', 'migr', 'kalomi', 'nonexistentword')
+
+
+def run_search(user_id, term):
+    query, _ = apply_search(Task.query.filter_by(user_id=user_id), term)
+    query.count()
+    query.order_by(desc(Task.created_at)).limit(10).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9}  {'term':<16} {'ilike ms':>10} {'fts ms':>10} {'speed-up':>9}")
+    for size in args.sizes:
+        app, cleanup = make_app(args.database_url)
+        try:
+            with app.app_context():
+                user_id = create_user()
+                seed_tasks(user_id, size)
+                db.session.expire_all()
+
+                for term in TERMS:
+                    app.config['TASK_SEARCH_BACKEND'] = 'ilike'
+                    ilike_ms = timed(lambda: run_search(user_id, term), args.repeat)
+                    app.config['TASK_SEARCH_BACKEND'] = 'auto'
+                    backend = search_backend()
+                    fts_ms = timed(lambda: run_search(user_id, term), args.repeat)
+                    print(f"{size:>9}  {term:<16} {ilike_ms:>10.2f} {fts_ms:>10.2f} "
+                          f"{ilike_ms / fts_ms:>8.1f}x  ({backend})")
+        finally:
+            cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare task dump throughput of marshmallow and the compiled serializer.
+
+    python -m benchmarks.bench_serialize --sizes 100 1000 10000
+
+Dumps ``--sizes`` unsaved tasks carrying two tags each through
+``TaskSchema(many=True)`` and its ``compile_schema`` counterpart, and
+reports the best of ``--repeat`` runs for each.  No database is used.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.config import TestingConfig
+from app.models.task import Task
+from app.models.tag import Tag
+from app.schemas import TaskSchema
+from app.schemas.compiled import compile_schema
+
+
+def transient_tasks(count):
+    """Unsaved tasks with two tags each – serialisation only, no database."""
+    now = datetime.utcnow()
+    tags = []
+    for i in range(10):
+        tag = Tag(name=f"tag-{i}", user_id=1, color="#3498db")
+        tag.id = i + 1
+        tags.append(tag)
+    tasks = []
+    for i in range(count):
+        task = Task(title=f"Task {i}", user_id=1, description="Benchmark task " * 4,
+                    status=("pending", "in_progress", "completed")[i % 3],
+                    priority=("low", "medium", "high")[i % 3],
+                    due_date=now + timedelta(days=i % 30))
+        task.id = i + 1
+        task.created_at = task.updated_at = now
+        task.tags = [tags[i % 10], tags[(i + 3) % 10]]
+        tasks.append(task)
+    return tasks
+
+
+def best_of(fn, repeat):
+    """Fastest wall-clock time of ``fn()`` in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        schema = TaskSchema(many=True)
+        compiled = compile_schema(schema)
+        print(f"{'tasks':>9} {'marshmallow ms':>15} {'compiled ms':>12} {'tasks/s':>10} {'speed-up':>9}")
+        for count in args.sizes:
+            tasks = transient_tasks(count)
+            assert compiled.dump(tasks) == schema.dump(tasks)
+            slow = best_of(lambda: schema.dump(tasks), args.repeat)
+            fast = best_of(lambda: compiled.dump(tasks), args.repeat)
+            print(f"{count:>9} {slow:>15.1f} {fast:>12.1f} {count / fast * 1000:>10,.0f} "
+                  f"{slow / fast:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
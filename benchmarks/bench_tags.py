@@ -0,0 +1,85 @@
+"""
+Compare multi-tag filter plans: SQL (EXISTS / GROUP BY HAVING) vs bitmaps.
+
+    python -m benchmarks.bench_tags --sizes 10000 100000 --tags 300
+
+Each size gets a fresh database holding one account with that many tasks
+and ``--tags`` tags, three per task.  The timed operation is what
+``GET /api/v1/tasks?tags=...&tag_mode=...`` runs: the filtered count plus
+the first page of ten rows.
+"""
+import argparse
+import random
+
+from sqlalchemy import desc, insert
+
+from app import db
+from app.models.tag import Tag, task_tags
+from app.models.task import Task
+from app.utils.tag_filter import apply_tag_filter, get_tag_index
+from benchmarks.common import make_app, create_user, seed_tasks, timed
+
+
+def seed_tags(user_id, tag_count, per_task=3, seed=7):
+    rng = random.Random(seed)
+    db.session.execute(insert(Tag), [
+        {'name': f'tag-{i}', 'color': '#3498db', 'user_id': user_id}
+        for i in range(tag_count)
+    ])
+    tag_ids = [tag_id for (tag_id,) in db.session.query(Tag.id).filter_by(user_id=user_id)]
+    # Skewed popularity, like real labels
+    weights = [1.0 / (rank + 1) for rank in range(len(tag_ids))]
+    rows = []
+    for (task_id,) in db.session.query(Task.id).filter_by(user_id=user_id):
+        for tag_id in set(rng.choices(tag_ids, weights=weights, k=per_task)):
+            rows.append({'task_id': task_id, 'tag_id': tag_id})
+    db.session.execute(insert(task_tags), rows)
+    db.session.commit()
+    return tag_ids
+
+
+def run_filter(user_id, tag_ids, mode):
+    query = apply_tag_filter(Task.query.filter_by(user_id=user_id), user_id, tag_ids, mode)
+    query.count()
+    query.order_by(desc(Task.created_at)).limit(10).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--tags', type=int, default=300)
+    parser.add_argument('--database-url', default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9}  {'filter':<24} {'sql ms':>9} {'bitmap ms':>10} {'speed-up':>9}")
+    for size in args.sizes:
+        app, cleanup = make_app(args.database_url)
+        try:
+            with app.app_context():
+                user_id = create_user()
+                seed_tasks(user_id, size)
+                tag_ids = seed_tags(user_id, args.tags)
+                db.session.expire_all()
+
+                cases = (
+                    ('any', tag_ids[5:8]),
+                    ('all', tag_ids[0:2]),
+                    ('all', tag_ids[1:4]),
+                    ('none', tag_ids[0:3]),
+                )
+                for mode, ids in cases:
+                    label = f"{mode} of {len(ids)}"
+                    app.config['TAG_BITMAP_INDEX'] = False
+                    sql_ms = timed(lambda: run_filter(user_id, ids, mode), args.repeat)
+                    app.config['TAG_BITMAP_INDEX'] = True
+                    get_tag_index().match(user_id, ids, mode)   # build outside the timing
+                    bitmap_ms = timed(lambda: run_filter(user_id, ids, mode), args.repeat)
+                    print(f"{size:>9}  {label:<24} {sql_ms:>9.2f} {bitmap_ms:>10.2f} "
+                          f"{sql_ms / bitmap_ms:>8.1f}x")
+        finally:
+            cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Shared helpers for the standalone benchmarks in this directory.
+
+The benchmarks are not part of the pytest run.  Execute them from the
+repository root, e.g. ``python -m benchmarks.bench_search --sizes 10000``.
+By default each run uses a throw-away SQLite file; pass ``--database-url``
+to point at a scratch PostgreSQL database instead (its tables are dropped).
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app, db
+from app.config import TestingConfig
+from app.models.user import User
+from app.models.task import Task
+
+# A handful of recognisable topic words plus a long tail of filler words,
+# drawn with Zipf-like weights so term frequencies resemble real text.
+WORDS = (
+    "report budget meeting review design deploy invoice client server backup "
+    "release planning hiring onboarding roadmap audit migration database "
+    "frontend backend testing security payroll marketing research analytics "
+    "newsletter support ticket feedback contract renewal inventory shipping"
+).split()
+_SYLLABLES = ('ka', 'lo', 'mi', 'ne', 'su', 'ta', 'ri', 'po', 've', 'da', 'zu', 'fe')
+VOCABULARY = WORDS + [
+    a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES
+]
+_CUM_WEIGHTS = []
+_total = 0.0
+for _rank in range(len(VOCABULARY)):
+    _total += 1.0 / (_rank + 10)
+    _CUM_WEIGHTS.append(_total)
+
+
+def _words(rng, k):
+    return ' '.join(rng.choices(VOCABULARY, cum_weights=_CUM_WEIGHTS, k=k))
+
+
+def make_app(database_url=None):
+    """Create an app bound to a fresh database, returning ``(app, cleanup)``."""
+    path = None
+    if database_url is None:
+        fd, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+
+    class BenchmarkConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ECHO = False
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    def cleanup():
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    return app, cleanup
+
+
+def create_user(username='bench'):
+    """Insert a benchmark user and return its id."""
+    user = User(username=username, email=f'{username}@example.com', password='benchmark')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def seed_tasks(user_id, count, chunk_size=10000, seed=42):
+    """Insert ``count`` synthetic tasks with executemany in chunks."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    statuses = ('pending', 'in_progress', 'completed')
+    priorities = ('low', 'medium', 'high')
+
+    for start in range(0, count, chunk_size):
+        rows = []
+        for _ in range(min(chunk_size, count - start)):
+            rows.append({
+                'title': _words(rng, 4).capitalize(),
+                'description': _words(rng, rng.randint(10, 40)),
+                'status': rng.choice(statuses),
+                'priority': rng.choice(priorities),
+                'due_date': now + timedelta(days=rng.randint(-30, 90)),
+                'created_at': now - timedelta(minutes=rng.randint(0, 500000)),
+                'updated_at': now,
+                'user_id': user_id,
+            })
+        db.session.execute(insert(Task), rows)
+        db.session.commit()
+
+
+def timed(fn, repeat=5):
+    """Median wall-clock time of ``fn()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
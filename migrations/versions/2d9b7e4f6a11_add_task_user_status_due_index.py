@@ -0,0 +1,24 @@
+"""Add (user_id, status, due_date) index on tasks
+
+Revision ID: 2d9b7e4f6a11
+Revises: 8f1a6c3d2e57
+Create Date: 2026-10-17 16:02:47.915360
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d9b7e4f6a11'
+down_revision = '8f1a6c3d2e57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_tasks_user_status_due_date', 'tasks', ['user_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tasks_user_status_due_date', table_name='tasks')
@@ -0,0 +1,55 @@
+"""Add change sequences and tombstones for delta sync
+
+Revision ID: 4f2a9c7d1e60
+Revises: e93a7c1f5b28
+Create Date: 2026-10-17 21:48:26.530174
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c7d1e60'
+down_revision = 'e93a7c1f5b28'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ('tasks', 'tags', 'comments')
+
+
+def upgrade():
+    for table in SYNCED_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), server_default='0', nullable=False))
+            batch_op.create_index(f'ix_{table}_user_change_seq', ['user_id', 'change_seq'], unique=False)
+
+    with op.batch_alter_table('user_data_versions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('compacted_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tombstones_user_change_seq', 'tombstones', ['user_id', 'change_seq'], unique=False)
+    op.create_index(op.f('ix_tombstones_deleted_at'), 'tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_tombstones_deleted_at'), table_name='tombstones')
+    op.drop_index('ix_tombstones_user_change_seq', table_name='tombstones')
+    op.drop_table('tombstones')
+
+    with op.batch_alter_table('user_data_versions', schema=None) as batch_op:
+        batch_op.drop_column('compacted_seq')
+
+    for table in reversed(SYNCED_TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_user_change_seq')
+            batch_op.drop_column('change_seq')
@@ -0,0 +1,30 @@
+"""Add user data versions table
+
+Revision ID: 5c8e2d7a1b64
+Revises: a3c5e81d9f20
+Create Date: 2026-10-17 14:05:12.540871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e2d7a1b64'
+down_revision = 'a3c5e81d9f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_data_versions')
@@ -0,0 +1,97 @@
+"""Add archive tables for completed tasks
+
+Revision ID: 6a9d3e2f7c84
+Revises: 4f2a9c7d1e60
+Create Date: 2026-10-17 23:05:41.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a9d3e2f7c84'
+down_revision = '4f2a9c7d1e60'
+branch_labels = None
+depends_on = None
+
+# Rebuilding ``tasks`` on SQLite drops the triggers that feed ``tasks_fts``
+FTS_TRIGGERS = (
+    "CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+
+def _set_sqlite_autoincrement(enabled):
+    """
+    Rebuild ``tasks`` and ``comments`` with or without AUTOINCREMENT, so the
+    ids of archived rows are never handed out again.  Other databases never
+    reuse sequence values.
+    """
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in ('tasks', 'comments'):
+        with op.batch_alter_table(table, recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': enabled}):
+            pass
+    for trigger in FTS_TRIGGERS:
+        op.execute(trigger)
+
+
+def upgrade():
+    _set_sqlite_autoincrement(True)
+
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_user_updated_at', 'tasks_archive', ['user_id', 'updated_at'], unique=False)
+    op.create_table('task_tags_archive',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'tag_id')
+    )
+    op.create_table('comments_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks_archive.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_comments_archive_task_id'), 'comments_archive', ['task_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_comments_archive_task_id'), table_name='comments_archive')
+    op.drop_table('comments_archive')
+    op.drop_table('task_tags_archive')
+    op.drop_index('ix_tasks_archive_user_updated_at', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
+
+    _set_sqlite_autoincrement(False)
@@ -0,0 +1,24 @@
+"""Add tag-first index on task_tags
+
+Revision ID: 8f1a6c3d2e57
+Revises: 5c8e2d7a1b64
+Create Date: 2026-10-17 15:31:08.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1a6c3d2e57'
+down_revision = '5c8e2d7a1b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_tags_tag_id_task_id', 'task_tags', ['tag_id', 'task_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_tags_tag_id_task_id', table_name='task_tags')
@@ -0,0 +1,33 @@
+"""Add task trigram indexes
+
+Revision ID: a3c5e81d9f20
+Revises: 7b2f0c9e4a13
+Create Date: 2026-10-17 13:26:10.442871
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e81d9f20'
+down_revision = '7b2f0c9e4a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Other dialects use the in-process index in app/utils/trigram.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_tasks_title_trgm ON tasks USING GIN (title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_tasks_description_trgm ON tasks USING GIN (description gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_tasks_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_title_trgm")
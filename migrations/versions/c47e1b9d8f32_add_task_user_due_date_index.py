@@ -0,0 +1,24 @@
+"""Add (user_id, due_date) index on tasks
+
+Revision ID: c47e1b9d8f32
+Revises: 2d9b7e4f6a11
+Create Date: 2026-10-17 16:40:19.067225
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e1b9d8f32'
+down_revision = '2d9b7e4f6a11'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_tasks_user_due_date', 'tasks', ['user_id', 'due_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tasks_user_due_date', table_name='tasks')
@@ -0,0 +1,38 @@
+"""Add task counters table
+
+Revision ID: d41ec1e55a6a
+Revises: e5376396980d
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41ec1e55a6a'
+down_revision = 'e5376396980d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'status', 'priority')
+    )
+
+    # Backfill from the existing tasks
+    op.execute(
+        "INSERT INTO task_counters (user_id, status, priority, task_count) "
+        "SELECT user_id, status, priority, COUNT(id) FROM tasks "
+        "GROUP BY user_id, status, priority"
+    )
+
+
+def downgrade():
+    op.drop_table('task_counters')
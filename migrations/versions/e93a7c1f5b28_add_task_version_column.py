@@ -0,0 +1,26 @@
+"""Add version column to tasks
+
+Revision ID: e93a7c1f5b28
+Revises: b81f4a2c9d35
+Create Date: 2026-10-17 20:31:07.915406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e93a7c1f5b28'
+down_revision = 'b81f4a2c9d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -146,6 +146,39 @@ const api = {
         }
     },
 
+    // Subscribe to change events (Server-Sent Events). onChange receives
+    // {seq, changes} per change, or null when the client should reload
+    // everything. EventSource cannot send headers, so the token goes in
+    // the query string.
+    events(onChange) {
+        let lastEventId = null;
+        let source = null;
+
+        const connect = () => {
+            const params = new URLSearchParams({ jwt: this.getToken() || '' });
+            if (lastEventId !== null) {
+                params.append('last_event_id', lastEventId);
+            }
+            source = new EventSource(`${API_BASE_URL}/events?${params.toString()}`);
+            source.addEventListener('change', (e) => {
+                lastEventId = e.lastEventId;
+                onChange(JSON.parse(e.data));
+            });
+            source.addEventListener('resync', () => onChange(null));
+            source.onerror = async () => {
+                // The browser retries dropped streams itself; a rejected one
+                // (usually an expired token) is reconnected here
+                if (source.readyState === EventSource.CLOSED) {
+                    await this.refreshToken().catch(() => false);
+                    setTimeout(connect, 3000);
+                }
+            };
+        };
+
+        connect();
+        return { close: () => source.close() };
+    },
+
     // Auth endpoints
     auth: {
         async login(email, password) {
@@ -17,6 +17,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const priorityFilter = document.getElementById('priority-filter');
     const tagFilter = document.getElementById('tag-filter');
     const searchInput = document.getElementById('search-input');
+    const fuzzySearch = document.getElementById('fuzzy-search');
     const applyFiltersBtn = document.getElementById('apply-filters-btn');
     const prevPageBtn = document.getElementById('prev-page-btn');
     const nextPageBtn = document.getElementById('next-page-btn');
@@ -25,11 +26,13 @@ document.addEventListener('DOMContentLoaded', () => {
     // State
     let currentPage = 1;
     let totalPages = 1;
+    let refreshTimer = null;
     let filters = {
         status: '',
         priority: '',
         tag: '',
         search: '',
+        fuzzy: false,
         page: 1,
         per_page: 10
     };
@@ -39,6 +42,15 @@ document.addEventListener('DOMContentLoaded', () => {
         loadTasks();
         loadStatistics();
         setupEventListeners();
+        
+        // Stay fresh when other tabs or devices change tasks, tags or comments
+        api.events(() => {
+            clearTimeout(refreshTimer);
+            refreshTimer = setTimeout(() => {
+                loadTasks();
+                loadStatistics();
+            }, 500);
+        });
     }
     
     // Load tasks
@@ -46,8 +58,11 @@ document.addEventListener('DOMContentLoaded', () => {
         try {
             tasksContainer.innerHTML = '<div class="loading"><i class="fas fa-spinner fa-spin"></i> Loading tasks...</div>';
             
+            const { fuzzy, ...params } = filters;
             const data = await api.tasks.getAll({
-                ...filters,
+                ...params,
+                // Typo-tolerant matching only when asked for
+                search_mode: filters.search && fuzzy ? 'trigram' : '',
                 page: currentPage
             });
             
@@ -483,6 +498,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 filters.priority = priorityFilter.value;
                 filters.tag = tagFilter.value;
                 filters.search = searchInput.value;
+                filters.fuzzy = fuzzySearch ? fuzzySearch.checked : false;
                 currentPage = 1;
                 loadTasks();
             });
@@ -0,0 +1,49 @@
+import json
+
+from app.models.activity_log import ActivityLog
+
+
+def test_write_requests_are_logged(client, app, regular_user, test_tasks, auth_headers,
+                                   json_content_headers):
+    """Test successful writes are logged, whether views return tuples or responses."""
+    combined_headers = {**auth_headers, **json_content_headers}
+    response = client.post('/api/v1/tasks', data=json.dumps({'title': 'Logged'}),
+                           headers=combined_headers)
+    task_id = json.loads(response.data)['task']['id']
+    client.delete(f'/api/v1/tasks/{test_tasks[0].id}', headers=auth_headers)
+    # Failed writes are not logged
+    client.delete('/api/v1/tasks/999999', headers=auth_headers)
+
+    response = client.get('/api/v1/activities', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert [(item['activity_type'], item['entity_id']) for item in data] == [
+        ('task_delete', test_tasks[0].id), ('task_create', task_id)]
+
+
+def test_activity_log_writer_batches(client, app, regular_user, auth_headers, json_content_headers):
+    """Test the buffered writer queues entries and flushes them on close."""
+    from app.utils.activity_writer import get_activity_writer
+    app.config.update(ACTIVITY_LOG_ASYNC=True, ACTIVITY_LOG_FLUSH_INTERVAL=60)
+    combined_headers = {**auth_headers, **json_content_headers}
+
+    for title in ('One', 'Two', 'Three'):
+        response = client.post('/api/v1/tasks', data=json.dumps({'title': title}),
+                               headers=combined_headers)
+        assert response.status_code == 201
+
+    # A batch that rolls back logs nothing
+    response = client.post('/api/v1/batch', data=json.dumps({'requests': [
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {'title': 'Rolled back'}},
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {}}
+    ]}), headers=combined_headers)
+    assert response.status_code != 200
+
+    with app.app_context():
+        writer = get_activity_writer()
+        assert ActivityLog.query.count() == 0
+        writer.close()
+        rows = ActivityLog.query.order_by(ActivityLog.id).all()
+        assert [row.activity_type for row in rows] == ['task_create'] * 3
+        assert rows[0].user_id == regular_user.id
@@ -260,4 +260,18 @@ def test_admin_stats(client, app, regular_user, admin_user, test_tasks, admin_au
     response = client.get('/api/v1/admin/stats')
     
     assert response.status_code == 401
-    assert json.loads(response.data)['error'] == 'Authorization required'
\ No newline at end of file
+    assert json.loads(response.data)['error'] == 'Authorization required'
+
+
+def test_get_users_streamed(client, app, regular_user, admin_user, admin_auth_headers):
+    """Test `per_page=all` streams every user."""
+    response = client.get('/api/v1/admin/users?per_page=all', headers=admin_auth_headers)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    data = json.loads(response.data)
+    assert data['per_page'] == 'all'
+    assert data['total'] == len(data['users']) == 2
+    assert [user['id'] for user in data['users']] == sorted(user['id'] for user in data['users'])
+    assert 'password_hash' not in data['users'][0]
@@ -0,0 +1,133 @@
+import json
+import pytest
+
+def test_batch_with_references(client, app, regular_user, auth_headers, json_content_headers):
+    """Test a tag -> task -> comment workflow committed as one batch."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    commits = []
+    def count_commit(session):
+        commits.append(session)
+    event.listen(Session, 'after_commit', count_commit)
+
+    batch = {'requests': [
+        {'id': 'tag', 'method': 'POST', 'path': '/api/v1/tags',
+         'body': {'name': 'Batch', 'color': '#123456'}},
+        {'id': 'task', 'method': 'POST', 'path': '/api/v1/tasks',
+         'body': {'title': 'Batched task', 'tag_ids': ['${tag.tag.id}']}},
+        {'method': 'POST', 'path': '/api/v1/tasks/${task.task.id}/comments',
+         'body': {'content': 'Added in the same batch'}},
+        {'method': 'GET', 'path': '/api/v1/tasks/${1.task.id}'}
+    ]}
+    try:
+        response = client.post('/api/v1/batch', data=json.dumps(batch),
+                               headers={**auth_headers, **json_content_headers})
+    finally:
+        event.remove(Session, 'after_commit', count_commit)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert [result['status'] for result in data['results']] == [201, 201, 201, 200]
+    assert data['results'][0]['id'] == 'tag'
+    task = data['results'][3]['body']
+    assert task['title'] == 'Batched task'
+    assert [tag['name'] for tag in task['tags']] == ['Batch']
+    assert data['results'][2]['body']['comment']['task_id'] == task['id']
+    assert len(commits) == 1
+
+    with app.app_context():
+        from app.models.comment import Comment
+        assert Comment.query.filter_by(task_id=task['id']).count() == 1
+
+def test_batch_is_atomic(client, app, regular_user, auth_headers, json_content_headers):
+    """Test that a failing sub-request rolls back the whole batch."""
+    combined_headers = {**auth_headers, **json_content_headers}
+    batch = {'requests': [
+        {'id': 'tag', 'method': 'POST', 'path': '/api/v1/tags', 'body': {'name': 'Rolled back'}},
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {'title': ''}},
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {'title': 'Never run'}}
+    ]}
+    response = client.post('/api/v1/batch', data=json.dumps(batch), headers=combined_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 400
+    assert data['failed_index'] == 1
+    assert len(data['results']) == 2
+    with app.app_context():
+        from app.models.tag import Tag
+        from app.models.task import Task
+        assert Tag.query.filter_by(name='Rolled back').count() == 0
+        assert Task.query.filter_by(title='Never run').count() == 0
+
+    # Unknown references, endpoints outside the allowed blueprints and
+    # unmatched paths all abort the batch
+    for op in (
+        {'method': 'GET', 'path': '/api/v1/tasks/${missing.task.id}'},
+        {'method': 'GET', 'path': '/api/v1/admin/users'},
+        {'method': 'GET', 'path': '/api/v1/nowhere'},
+    ):
+        response = client.post('/api/v1/batch', data=json.dumps({'requests': [op]}),
+                               headers=combined_headers)
+        assert response.status_code in (400, 404)
+        assert json.loads(response.data)['failed_index'] == 0
+
+    response = client.post('/api/v1/batch', data=json.dumps({'requests': []}),
+                           headers=combined_headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/v1/batch', data=json.dumps(batch), headers=json_content_headers)
+    assert response.status_code == 401
+
+
+def test_batch_reads_bypass_response_cache(client, app, regular_user, auth_headers,
+                                           json_content_headers):
+    """Test GET sub-requests neither fill nor read the response cache."""
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    batch = {'requests': [
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {'title': 'Rolled back'}},
+        {'method': 'GET', 'path': '/api/v1/tasks'},
+        {'method': 'POST', 'path': '/api/v1/tasks', 'body': {'title': ''}}
+    ]}
+    response = client.post('/api/v1/batch', data=json.dumps(batch),
+                           headers={**auth_headers, **json_content_headers})
+    data = json.loads(response.data)
+
+    assert response.status_code == 400
+    assert data['results'][1]['body']['total'] == 1
+    with app.app_context():
+        from app.utils.response_cache import get_response_cache
+        assert get_response_cache().stats()['bytes'] == 0
+
+    response = client.get('/api/v1/tasks', headers=auth_headers)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['total'] == 0
+
+
+def test_batch_sub_requests_are_rate_limited(json_content_headers):
+    """Test every sub-request counts against the endpoint it calls."""
+    from flask_jwt_extended import create_access_token
+    from app import create_app, db
+    from app.config import TestingConfig
+    from app.models.user import User
+
+    class RateLimitedConfig(TestingConfig):
+        RATELIMIT_ENABLED = True
+        BATCH_MAX_REQUESTS = 100
+
+    app = create_app(RateLimitedConfig)
+    with app.app_context():
+        db.create_all()
+        user = User(username="limited", email="limited@example.com", password="password123")
+        db.session.add(user)
+        db.session.commit()
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}",
+                   **json_content_headers}
+
+    batch = {'requests': [{'method': 'GET', 'path': '/api/v1/tags'}] * 61}
+    response = app.test_client().post('/api/v1/batch', data=json.dumps(batch), headers=headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 429
+    assert data['failed_index'] == 60
+    assert data['results'][60]['body']['error'] == 'Too many requests'
@@ -0,0 +1,69 @@
+import json
+import pytest
+
+def _read_frames(chunks, count):
+    """Read ``count`` SSE frames as (event, id, data) tuples; comments as ('comment', None, text)."""
+    frames = []
+    while len(frames) < count:
+        fields = {}
+        for line in next(chunks).decode().strip().split('\n'):
+            key, _, value = line.partition(': ')
+            fields[key] = value
+        if '' in fields:
+            frames.append(('comment', None, fields['']))
+        elif 'retry' in fields:
+            frames.append(('retry', None, fields['retry']))
+        else:
+            frames.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+    return frames
+
+def test_event_stream_live_and_resume(client, app, regular_user, auth_tokens,
+                                      auth_headers, json_content_headers):
+    """Test live change events, heartbeats and Last-Event-ID resume."""
+    app.config['EVENTS_HEARTBEAT'] = 0.05
+    token = auth_tokens['access_token']
+    combined_headers = {**auth_headers, **json_content_headers}
+
+    response = client.get(f'/api/v1/events?jwt={token}')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = response.response
+
+    assert _read_frames(chunks, 1)[0][0] == 'retry'
+
+    created = json.loads(client.post('/api/v1/tasks', data=json.dumps({'title': 'Pushed'}),
+                                     headers=combined_headers).data)['task']
+    event, event_id, data = _read_frames(chunks, 1)[0]
+
+    assert event == 'change'
+    assert int(event_id) == data['seq']
+    assert data['changes'] == [{'entity': 'task', 'id': created['id'], 'op': 'changed'}]
+    assert _read_frames(chunks, 1)[0][0] == 'comment'        # heartbeat
+    response.close()
+    with app.app_context():
+        from app.utils.events import get_event_broker
+        assert get_event_broker().subscriber_count() == 0
+
+    # Changes made while disconnected are replayed from the cursor
+    last_seq = data['seq']
+    client.post('/api/v1/tasks/bulk/delete', data=json.dumps({'task_ids': [created['id']]}),
+                headers=combined_headers)
+    response = client.get(f'/api/v1/events?jwt={token}', headers={'Last-Event-ID': str(last_seq)})
+    frames = _read_frames(response.response, 2)
+    response.close()
+
+    assert frames[1][0] == 'change'
+    assert int(frames[1][1]) > last_seq
+    assert frames[1][2]['changes'] == [{'entity': 'task', 'id': created['id'], 'op': 'deleted'}]
+
+    # An unknown cursor cannot be replayed: the client is told to resync
+    response = client.get(f'/api/v1/events?jwt={token}', headers={'Last-Event-ID': '999999'})
+    frames = _read_frames(response.response, 2)
+    response.close()
+
+    assert frames[1] == ('resync', None, {'cursor': None})
+
+def test_event_stream_requires_token(client):
+    """Test that the stream is refused without a token."""
+    response = client.get('/api/v1/events')
+    assert response.status_code == 401
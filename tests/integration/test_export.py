@@ -110,4 +110,19 @@ def test_export_invalid_format(client, auth_headers):
     response = client.get('/api/v1/tasks/export?format=invalid', headers=auth_headers)
     
     assert response.status_code == 400
-    assert json.loads(response.data)['error'] == 'Unsupported export format'
\ No newline at end of file
+    assert json.loads(response.data)['error'] == 'Unsupported export format'
+
+
+def test_export_tasks_json_streamed(client, app, regular_user, test_tasks, auth_headers):
+    """Test the JSON export is streamed and matches the task serializer."""
+    with app.app_context():
+        from app import db
+        from app.schemas import tasks_schema
+        from app.models.task import Task
+        expected = tasks_schema.dump(Task.query.order_by(Task.id).all())
+
+    response = client.get('/api/v1/tasks/export?format=json', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert json.loads(response.data) == expected
@@ -0,0 +1,66 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+
+def test_create_task_idempotency_key(client, app, regular_user, auth_headers, json_content_headers):
+    """Test that a retried create is answered from the stored response."""
+    headers = {**auth_headers, **json_content_headers, 'Idempotency-Key': 'create-1'}
+    body = json.dumps({'title': 'Once only'})
+
+    first = client.post('/api/v1/tasks', data=body, headers=headers)
+    second = client.post('/api/v1/tasks', data=body, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert 'Idempotent-Replayed' not in first.headers
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert json.loads(second.data) == json.loads(first.data)
+    with app.app_context():
+        from app.models.task import Task
+        assert Task.query.filter_by(title='Once only').count() == 1
+
+    # Same key, different request
+    response = client.post('/api/v1/tasks', data=json.dumps({'title': 'Other'}), headers=headers)
+    assert response.status_code == 422
+
+    # Failures are not stored, so the same key can be retried
+    headers['Idempotency-Key'] = 'create-2'
+    response = client.post('/api/v1/tasks', data=json.dumps({'title': ''}), headers=headers)
+    assert response.status_code == 400
+    response = client.post('/api/v1/tasks', data=json.dumps({'title': 'Fixed'}), headers=headers)
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response.headers
+
+def test_idempotency_keys_expire_and_purge(client, app, regular_user, test_tasks,
+                                           auth_headers, json_content_headers):
+    """Test key scoping per endpoint body, expiry and the purge."""
+    with app.app_context():
+        from app import db
+        task_id = db.session.merge(test_tasks[0]).id
+
+    headers = {**auth_headers, **json_content_headers, 'Idempotency-Key': 'comment-1'}
+    body = json.dumps({'content': 'Posted twice'})
+    for _ in range(2):
+        response = client.post(f'/api/v1/tasks/{task_id}/comments', data=body, headers=headers)
+        assert response.status_code == 201
+
+    response = client.post('/api/v1/tags', data=json.dumps({'name': 'Keyed'}),
+                           headers={**headers, 'Idempotency-Key': 'tag-1'})
+    assert response.status_code == 201
+
+    with app.app_context():
+        from app import db
+        from app.models.comment import Comment
+        from app.models.idempotency_key import IdempotencyKey
+        assert Comment.query.filter_by(content='Posted twice').count() == 1
+        assert IdempotencyKey.query.count() == 2
+
+        IdempotencyKey.query.update({'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+    # An expired key starts over
+    response = client.post(f'/api/v1/tasks/{task_id}/comments', data=body, headers=headers)
+    assert 'Idempotent-Replayed' not in response.headers
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=['purge-idempotency-keys'])
+    assert 'Removed 1 expired idempotency keys.' in result.output
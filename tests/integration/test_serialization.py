@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.task import Task
+from app.models.tag import Tag
+from app.schemas import TaskSchema, TagSchema, CommentSchema, UserSchema, ActivityLogSchema
+from app.schemas.compiled import compile_schema
+
+
+def _both_paths(schema, objects):
+    """Dump through marshmallow and the compiled serializer as response bytes."""
+    from flask import current_app
+    expected = current_app.json.response(schema.dump(objects)).get_data()
+    actual = current_app.json.response(compile_schema(schema).dump(objects)).get_data()
+    return expected, actual
+
+def test_compiled_serializers_match_marshmallow(client, app, regular_user, test_tasks,
+                                                test_tags, test_comments, auth_headers):
+    """Test the compiled dump path produces byte-identical JSON."""
+    # Attach tags so the nested schema has something to render
+    client.put(f'/api/v1/tasks/{test_tasks[0].id}', headers=auth_headers,
+               json={'tag_ids': [tag.id for tag in test_tags[:2]],
+                     'description': 'Ünïcode – “quoted”'})
+
+    with app.app_context():
+        from app import db
+        from app.models.comment import Comment
+        from app.models.user import User
+        from app.models.activity_log import ActivityLog, ActivityType
+
+        ActivityLog.log(user_id=db.session.merge(regular_user).id,
+                        activity_type=ActivityType.TASK_UPDATE, entity_type='task',
+                        entity_id=test_tasks[0].id, activity_data={'fields': ['tag_ids']})
+        db.session.commit()
+
+        cases = [
+            (TaskSchema(many=True), Task.query.all()),
+            (TaskSchema(only=('id', 'title', 'tags'), many=True), Task.query.all()),
+            (TagSchema(many=True), Tag.query.all()),
+            (CommentSchema(many=True), Comment.query.all()),
+            (UserSchema(many=True), User.query.all()),
+            (ActivityLogSchema(many=True), ActivityLog.query.all()),
+        ]
+        for schema, objects in cases:
+            assert objects
+            expected, actual = _both_paths(schema, objects)
+            assert actual == expected
+
+        # The activity schema mirrors ActivityLog.to_dict()
+        entries = ActivityLog.query.all()
+        assert ActivityLogSchema(many=True).dump(entries) == [e.to_dict() for e in entries]
+
+
+def _transient_tasks(count):
+    """Unsaved tasks with two tags each – serialisation only, no database."""
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    tags = []
+    for i in range(10):
+        tag = Tag(name=f"tag-{i}", user_id=1, color="#3498db")
+        tag.id = i + 1
+        tags.append(tag)
+    tasks = []
+    for i in range(count):
+        task = Task(title=f"Task {i}", user_id=1, description="Benchmark task " * 4,
+                    status=("pending", "in_progress", "completed")[i % 3],
+                    priority=("low", "medium", "high")[i % 3],
+                    due_date=now + timedelta(days=i % 30))
+        task.id = i + 1
+        task.created_at = task.updated_at = now
+        task.tags = [tags[i % 10], tags[(i + 3) % 10]]
+        tasks.append(task)
+    return tasks
+
+
+def test_compiled_serializer_matches_on_many_tasks(app):
+    """Test the compiled serializer over a larger, varied set of tasks."""
+    with app.app_context():
+        tasks = _transient_tasks(300)
+        schema = TaskSchema(many=True)
+        assert compile_schema(schema).dump(tasks) == schema.dump(tasks)
@@ -0,0 +1,76 @@
+import json
+import pytest
+
+def test_sync_full_then_delta(client, app, regular_user, test_tasks, test_tags, test_comments,
+                              auth_headers, json_content_headers):
+    """Test a full sync followed by incremental syncs with tombstones."""
+    response = client.get('/api/v1/sync', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert len(data['tasks']) == len(test_tasks)
+    assert len(data['tags']) == len(test_tags)
+    assert len(data['comments']) == len(test_comments)
+    assert data['has_more'] is False
+    cursor = data['cursor']
+
+    # Nothing changed: an empty delta and the same cursor
+    data = json.loads(client.get(f'/api/v1/sync?since={cursor}', headers=auth_headers).data)
+    assert (data['tasks'], data['tags'], data['comments']) == ([], [], [])
+    assert data['cursor'] == cursor
+
+    combined_headers = {**auth_headers, **json_content_headers}
+    task_ids = [task['id'] for task in
+                json.loads(client.get('/api/v1/sync', headers=auth_headers).data)['tasks']]
+    tag_id = json.loads(client.get('/api/v1/tags', headers=auth_headers).data)[0]['id']
+    client.put(f'/api/v1/tasks/{task_ids[1]}',
+               data=json.dumps({'title': 'Changed offline', 'tag_ids': [tag_id]}),
+               headers=combined_headers)
+    client.post('/api/v1/tasks/bulk/delete', data=json.dumps({'task_ids': [task_ids[0]]}),
+                headers=combined_headers)
+    client.delete(f'/api/v1/tags/{tag_id}', headers=auth_headers)
+
+    response = client.get(f'/api/v1/sync?since={cursor}', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert [task['title'] for task in data['tasks']] == ['Changed offline']
+    assert data['tasks'][0]['tag_ids'] == []           # the link went with the tag
+    assert data['deleted']['tasks'] == [task_ids[0]]
+    assert data['deleted']['tags'] == [tag_id]
+    assert len(data['deleted']['comments']) == len(test_comments)
+    assert data['cursor'] > cursor
+
+    # Pages end on transaction boundaries and resume from the cursor
+    client.post('/api/v1/tasks/bulk/create',
+                data=json.dumps({'tasks': [{'title': f'Imported {i}'} for i in range(3)]}),
+                headers=combined_headers)
+    client.post('/api/v1/tasks', data=json.dumps({'title': 'Later'}), headers=combined_headers)
+    data = json.loads(client.get(f'/api/v1/sync?since={data["cursor"]}&limit=2',
+                                 headers=auth_headers).data)
+
+    assert len(data['tasks']) == 3                     # one transaction, never split
+    assert data['has_more'] is True
+    data = json.loads(client.get(f'/api/v1/sync?since={data["cursor"]}&limit=2',
+                                 headers=auth_headers).data)
+    assert [task['title'] for task in data['tasks']] == ['Later']
+    assert data['has_more'] is False
+
+def test_sync_compacted_cursor(client, app, regular_user, test_tasks, auth_headers):
+    """Test that cursors older than compacted tombstones must resync."""
+    cursor = json.loads(client.get('/api/v1/sync', headers=auth_headers).data)['cursor']
+    task_id = json.loads(client.get('/api/v1/sync', headers=auth_headers).data)['tasks'][0]['id']
+    client.delete(f'/api/v1/tasks/{task_id}', headers=auth_headers)
+
+    result = app.test_cli_runner().invoke(args=['compact-tombstones', '--days', '-1'])
+    assert 'Removed 1 sync tombstones' in result.output
+
+    response = client.get(f'/api/v1/sync?since={cursor}', headers=auth_headers)
+    assert response.status_code == 410
+
+    current = json.loads(client.get('/api/v1/sync', headers=auth_headers).data)['cursor']
+    response = client.get(f'/api/v1/sync?since={current}', headers=auth_headers)
+    assert response.status_code == 200
+
+    response = client.get(f'/api/v1/sync?since={current + 1}', headers=auth_headers)
+    assert response.status_code == 400
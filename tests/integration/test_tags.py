@@ -350,4 +350,30 @@ def test_task_tag_relationships(client, app, regular_user, test_tasks, test_tags
         from app.models.tag import Tag
         task = Task.query.get(task_id)
         tag = Tag.query.get(tag_id)
-        assert tag not in task.tags
\ No newline at end of file
+        assert tag not in task.tags
+
+
+def test_get_tags_conditional(client, app, regular_user, test_tags, auth_headers):
+    """Test ETag revalidation of the tag list."""
+    response = client.get('/api/v1/tags', headers=auth_headers)
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Last-Modified' in response.headers
+
+    # Unchanged data – 304 with no body
+    response = client.get('/api/v1/tags', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    # Any write invalidates the tag
+    client.post('/api/v1/tags', headers=auth_headers,
+                json={'name': 'Fresh', 'color': '#000000'})
+    response = client.get('/api/v1/tags', headers={**auth_headers, 'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(json.loads(response.data)) == 4
@@ -445,4 +445,910 @@ def test_bulk_actions(client, app, regular_user, test_tasks, auth_headers, json_
     )
     
     assert response.status_code == 400
-    assert 'error' in json.loads(response.data)
\ No newline at end of file
+    assert 'error' in json.loads(response.data)
+
+
+def test_get_tasks_cursor_pagination(client, app, regular_user, test_tasks, auth_headers):
+    """Test keyset pagination of the task list."""
+    with app.app_context():
+        from app import db
+        tasks = [db.session.merge(task) for task in test_tasks]
+        all_ids = {task.id for task in tasks}
+
+    # Walk forwards, two tasks at a time, sorting on a nullable column
+    response = client.get('/api/v1/tasks?cursor=&per_page=2&sort_by=due_date&sort_order=asc',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert len(data['tasks']) == 2
+    assert data['total'] == 3
+    assert data['prev_cursor'] is None
+    assert data['next_cursor'] is not None
+    first_page = [task['id'] for task in data['tasks']]
+
+    response = client.get(
+        f"/api/v1/tasks?cursor={data['next_cursor']}&per_page=2"
+        f"&sort_by=due_date&sort_order=asc&include_total=false",
+        headers=auth_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert len(data['tasks']) == 1
+    assert 'total' not in data
+    assert data['next_cursor'] is None
+    assert set(first_page) | {data['tasks'][0]['id']} == all_ids
+
+    # Walk back to the first page
+    response = client.get(
+        f"/api/v1/tasks?cursor={data['prev_cursor']}&per_page=2"
+        f"&sort_by=due_date&sort_order=asc",
+        headers=auth_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert [task['id'] for task in data['tasks']] == first_page
+    assert data['prev_cursor'] is None
+
+    # A cursor issued for one ordering is rejected for another
+    response = client.get(
+        f"/api/v1/tasks?cursor={data['next_cursor']}&sort_by=title",
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+
+    response = client.get('/api/v1/tasks?cursor=not-a-cursor', headers=auth_headers)
+    assert response.status_code == 400
+
+def test_task_counters_stay_exact(client, app, regular_user, test_tasks, auth_headers, json_content_headers):
+    """Test the denormalised task counters under single and bulk writes."""
+    with app.app_context():
+        from app import db
+        tasks = [db.session.merge(task) for task in test_tasks]
+        task_ids = [task.id for task in tasks]
+        user_id = db.session.merge(regular_user).id
+
+    combined_headers = {**auth_headers, **json_content_headers}
+
+    def assert_counters_exact():
+        with app.app_context():
+            from app import db
+            from sqlalchemy import func
+            from app.models.task import Task
+            from app.models.task_counter import TaskCounter
+            expected = {
+                (status, priority): n for status, priority, n in
+                db.session.query(Task.status, Task.priority, func.count(Task.id))
+                          .filter_by(user_id=user_id)
+                          .group_by(Task.status, Task.priority).all()
+            }
+            actual = {
+                (row.status, row.priority): row.task_count
+                for row in TaskCounter.query.filter_by(user_id=user_id).all()
+                if row.task_count
+            }
+            assert actual == expected
+
+    assert_counters_exact()
+
+    for i in range(5):
+        response = client.post('/api/v1/tasks', headers=combined_headers,
+                               data=json.dumps({'title': f'Counter {i}', 'priority': 'low'}))
+        assert response.status_code == 201
+        task_ids.append(json.loads(response.data)['task']['id'])
+    assert_counters_exact()
+
+    response = client.put('/api/v1/tasks/bulk/update', headers=combined_headers,
+                          data=json.dumps({'task_ids': task_ids[:6],
+                                           'updates': {'status': 'completed'}}))
+    assert response.status_code == 200
+    assert_counters_exact()
+
+    response = client.put(f'/api/v1/tasks/{task_ids[6]}', headers=combined_headers,
+                          data=json.dumps({'priority': 'high'}))
+    assert response.status_code == 200
+    assert_counters_exact()
+
+    response = client.post('/api/v1/tasks/bulk/delete', headers=combined_headers,
+                           data=json.dumps({'task_ids': task_ids[2:5]}))
+    assert response.status_code == 200
+    assert_counters_exact()
+
+    response = client.delete(f'/api/v1/tasks/{task_ids[0]}', headers=auth_headers)
+    assert response.status_code == 200
+    assert_counters_exact()
+
+    # Totals for plain listings are served from the counters
+    response = client.get('/api/v1/tasks?status=completed', headers=auth_headers)
+    data = json.loads(response.data)
+    assert data['total'] == len(data['tasks']) == 2
+
+def test_search_tasks_full_text(client, app, regular_user, test_tasks, auth_headers, json_content_headers):
+    """Test full-text search ranking, highlighting and index maintenance."""
+    combined_headers = {**auth_headers, **json_content_headers}
+
+    for title, description in [
+        ('Quarterly report', 'Collect the numbers for the report'),
+        ('Groceries', 'Buy milk and write the shopping report'),
+    ]:
+        response = client.post('/api/v1/tasks', headers=combined_headers,
+                               data=json.dumps({'title': title, 'description': description}))
+        assert response.status_code == 201
+
+    # Title matches outrank description-only matches
+    response = client.get('/api/v1/tasks?search=report&sort_by=relevance', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['total'] == 2
+    assert data['tasks'][0]['title'] == 'Quarterly report'
+    assert all('<mark>' in task['snippet'].lower() for task in data['tasks'])
+
+    # Prefix matching and stemming
+    response = client.get('/api/v1/tasks?search=quart', headers=auth_headers)
+    assert json.loads(response.data)['total'] == 1
+    response = client.get('/api/v1/tasks?search=reports', headers=auth_headers)
+    assert json.loads(response.data)['total'] == 2
+
+    # The index follows updates and deletes
+    task_id = data['tasks'][0]['id']
+    client.put(f'/api/v1/tasks/{task_id}', headers=combined_headers,
+               data=json.dumps({'title': 'Quarterly summary', 'description': 'Numbers'}))
+    response = client.get('/api/v1/tasks?search=report', headers=auth_headers)
+    assert json.loads(response.data)['total'] == 1
+
+    client.delete(f"/api/v1/tasks/{json.loads(response.data)['tasks'][0]['id']}",
+                  headers=auth_headers)
+    response = client.get('/api/v1/tasks?search=report', headers=auth_headers)
+    assert json.loads(response.data)['total'] == 0
+
+    # Relevance ordering needs a search term
+    response = client.get('/api/v1/tasks?sort_by=relevance', headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('backend', ['auto', 'ilike'])
+def test_search_snippets_are_escaped(client, app, regular_user, auth_headers,
+                                     json_content_headers, backend):
+    """Test stored HTML comes back escaped in search snippets."""
+    app.config['TASK_SEARCH_BACKEND'] = backend
+    client.post('/api/v1/tasks', headers={**auth_headers, **json_content_headers},
+                data=json.dumps({'title': 'Payload',
+                                 'description': '<img src=x onerror=alert(1)> invoice <b>'}))
+
+    response = client.get('/api/v1/tasks?search=invoice', headers=auth_headers)
+    snippet = json.loads(response.data)['tasks'][0]['snippet']
+
+    assert '<img' not in snippet and '<b>' not in snippet
+    assert '&lt;img src=x onerror=alert(1)&gt;' in snippet
+    assert '<mark>invoice</mark>' in snippet
+
+def test_search_tasks_trigram(client, app, regular_user, test_tasks, auth_headers, json_content_headers):
+    """Test typo-tolerant trigram search and index maintenance."""
+    combined_headers = {**auth_headers, **json_content_headers}
+
+    response = client.post('/api/v1/tasks', headers=combined_headers,
+                           data=json.dumps({'title': 'Prepare onboarding checklist'}))
+    onboarding_id = json.loads(response.data)['task']['id']
+
+    # Misspelled fragment
+    response = client.get('/api/v1/tasks?search=onbaording&search_mode=trigram',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['tasks'][0]['id'] == onboarding_id
+    assert 0 < data['tasks'][0]['similarity'] <= 1
+
+    # Writes made after the index was built are visible
+    response = client.post('/api/v1/tasks', headers=combined_headers,
+                           data=json.dumps({'title': 'Archive invoices', 'status': 'completed'}))
+    invoice_id = json.loads(response.data)['task']['id']
+
+    response = client.get('/api/v1/tasks?search=invoce&search_mode=trigram', headers=auth_headers)
+    assert [task['id'] for task in json.loads(response.data)['tasks']] == [invoice_id]
+
+    # Other filters still apply
+    response = client.get('/api/v1/tasks?search=invoce&search_mode=trigram&status=pending',
+                          headers=auth_headers)
+    assert json.loads(response.data)['tasks'] == []
+
+    client.delete(f'/api/v1/tasks/{invoice_id}', headers=auth_headers)
+    response = client.get('/api/v1/tasks?search=invoce&search_mode=trigram', headers=auth_headers)
+    assert json.loads(response.data)['tasks'] == []
+
+    response = client.get('/api/v1/tasks?search_mode=trigram', headers=auth_headers)
+    assert response.status_code == 400
+
+    # Writes this process never saw (another worker, a raw statement) show up
+    from app import db
+    from app.models.task import Task
+    from app.models.data_version import UserDataVersion
+    with app.app_context():
+        seq = UserDataVersion.change_seq(regular_user.id)
+        db.session.execute(Task.__table__.update().where(Task.id == test_tasks[1].id)
+                           .values(title='Quarterly budget review', change_seq=seq))
+        db.session.commit()
+    response = client.get('/api/v1/tasks?search=budjet&search_mode=trigram', headers=auth_headers)
+    assert [task['id'] for task in json.loads(response.data)['tasks']] == [test_tasks[1].id]
+
+    # Matches beyond per_page are paged, not dropped
+    for title in ('Onboarding docs', 'Onboarding survey'):
+        client.post('/api/v1/tasks', headers=combined_headers, data=json.dumps({'title': title}))
+    seen = []
+    for page in (1, 2, 3):
+        response = client.get(f'/api/v1/tasks?search=onboarding&search_mode=trigram'
+                              f'&per_page=1&page={page}', headers=auth_headers)
+        data = json.loads(response.data)
+        assert (data['total'], data['pages'], data['truncated']) == (3, 3, False)
+        seen += [task['id'] for task in data['tasks']]
+    assert len(set(seen)) == 3 and onboarding_id in seen
+
+def test_get_tasks_sparse_fieldsets(client, app, regular_user, test_tasks, test_tags, auth_headers):
+    """Test ?fields= and ?include= projection on the task endpoints."""
+    from sqlalchemy import event
+    from app import db
+
+    with app.app_context():
+        task_id = db.session.merge(test_tasks[0]).id
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = client.get('/api/v1/tasks?fields=title,status,due_date',
+                                  headers=auth_headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert len(data['tasks']) == 3
+    assert all(set(task) == {'id', 'title', 'status', 'due_date'} for task in data['tasks'])
+
+    # Neither the description column nor the tags are fetched
+    task_selects = [s for s in statements if 'FROM tasks' in s]
+    assert task_selects and all('tasks.description' not in s for s in task_selects)
+    assert not any('task_tags' in s for s in statements)
+
+    response = client.get('/api/v1/tasks?fields=title&include=tags', headers=auth_headers)
+    data = json.loads(response.data)
+    assert all(set(task) == {'id', 'title', 'tags'} for task in data['tasks'])
+
+    response = client.get(f'/api/v1/tasks/{task_id}?fields=title', headers=auth_headers)
+    assert json.loads(response.data) == {'id': task_id, 'title': 'Test Task 1'}
+
+    response = client.get('/api/v1/tasks?fields=title,password', headers=auth_headers)
+    assert response.status_code == 400
+
+    # The client's field order does not matter: both requests share one serializer
+    from app.schemas import task_fieldset_schema
+    assert task_fieldset_schema.load({'fields': 'status,title,id'})['fieldset'] == \
+        task_fieldset_schema.load({'fields': 'title,status'})['fieldset'] == \
+        ('id', 'title', 'status')
+
+def test_get_tasks_conditional(client, app, regular_user, test_tasks, auth_headers):
+    """Test ETag / Last-Modified revalidation of task listings."""
+    response = client.get('/api/v1/tasks?status=pending', headers=auth_headers)
+    etag = response.headers['ETag']
+    last_modified = response.headers['Last-Modified']
+
+    response = client.get('/api/v1/tasks?status=pending',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+    response = client.get('/api/v1/tasks?status=pending',
+                          headers={**auth_headers, 'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+    # Different query string, different representation
+    response = client.get('/api/v1/tasks?status=completed',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+
+    # Bulk deletes bypass the ORM but still bump the version
+    with app.app_context():
+        from app import db
+        task_id = db.session.merge(test_tasks[0]).id
+    client.post('/api/v1/tasks/bulk/delete', headers=auth_headers,
+                json={'task_ids': [task_id]})
+
+    response = client.get('/api/v1/tasks?status=pending',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_get_tasks_response_cache(client, app, regular_user, test_tasks, auth_headers):
+    """Test the per-user response cache and its write-driven invalidation."""
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    from app.utils.response_cache import get_response_cache
+    with app.app_context():
+        cache = get_response_cache()
+
+    response = client.get('/api/v1/tasks?status=pending&per_page=10', headers=auth_headers)
+    assert response.headers['X-Cache'] == 'MISS'
+    first = json.loads(response.data)
+
+    # Same validated arguments in a different spelling share the entry
+    response = client.get('/api/v1/tasks?per_page=010&status=pending', headers=auth_headers)
+    assert response.headers['X-Cache'] == 'HIT'
+    assert json.loads(response.data) == first
+
+    # Invalid arguments bypass the cache and still fail validation
+    response = client.get('/api/v1/tasks?status=bogus', headers=auth_headers)
+    assert response.status_code == 400
+    assert 'X-Cache' not in response.headers
+
+    # A write invalidates the user's entries
+    client.post('/api/v1/tasks', headers=auth_headers,
+                json={'title': 'Cached?', 'status': 'pending', 'priority': 'low'})
+    response = client.get('/api/v1/tasks?status=pending&per_page=10', headers=auth_headers)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['total'] == first['total'] + 1
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['invalidations'] >= 1
+    assert stats['bytes'] > 0
+
+
+@pytest.mark.parametrize('bitmap_index', [False, True])
+def test_get_tasks_multi_tag_filter(client, app, regular_user, test_tasks, test_tags,
+                                    auth_headers, bitmap_index):
+    """Test ?tags=&tag_mode=any|all|none with and without the bitmap index."""
+    app.config['TAG_BITMAP_INDEX'] = bitmap_index
+    with app.app_context():
+        from app import db
+        task_ids = [db.session.merge(task).id for task in test_tasks]
+        tag_ids = [db.session.merge(tag).id for tag in test_tags]
+
+    def ids(query):
+        response = client.get(f'/api/v1/tasks?per_page=100&{query}', headers=auth_headers)
+        assert response.status_code == 200
+        return sorted(task['id'] for task in json.loads(response.data)['tasks'])
+
+    # Task 1: Work + Personal, task 2: Work, task 3: untagged
+    client.put(f'/api/v1/tasks/{task_ids[0]}', headers=auth_headers,
+               json={'tag_ids': tag_ids[:2]})
+    tags = f"{tag_ids[0]},{tag_ids[1]}"
+
+    # Warm the bitmaps before task 2 is tagged so the attach is applied incrementally
+    assert ids(f'tags={tags}&tag_mode=all') == [task_ids[0]]
+    client.put(f'/api/v1/tasks/{task_ids[1]}', headers=auth_headers,
+               json={'tag_ids': [tag_ids[0]]})
+
+    assert ids(f'tags={tags}&tag_mode=all') == [task_ids[0]]
+    assert ids(f'tags={tags}') == sorted(task_ids[:2])
+    assert ids(f'tags={tags}&tag_mode=none') == [task_ids[2]]
+    assert ids(f'tags={tag_ids[2]}&tag_mode=any') == []
+
+    # Detaching and deleting keep the bitmaps current
+    client.put(f'/api/v1/tasks/{task_ids[0]}', headers=auth_headers,
+               json={'tag_ids': [tag_ids[1]]})
+    assert ids(f'tags={tags}&tag_mode=all') == []
+    client.delete(f'/api/v1/tasks/{task_ids[2]}', headers=auth_headers)
+    assert ids(f'tags={tags}&tag_mode=none') == []
+
+    # Tagging this process never saw (another worker, a raw statement) shows up
+    with app.app_context():
+        from app.models.tag import task_tags
+        from app.models.task import Task
+        from app.models.data_version import UserDataVersion
+        seq = UserDataVersion.change_seq(regular_user.id)
+        db.session.execute(task_tags.insert().values(task_id=task_ids[1], tag_id=tag_ids[2]))
+        db.session.execute(Task.__table__.update().where(Task.id == task_ids[1])
+                           .values(change_seq=seq))
+        db.session.commit()
+    assert ids(f'tags={tag_ids[2]}') == [task_ids[1]]
+
+    response = client.get('/api/v1/tasks?tags=1,x', headers=auth_headers)
+    assert response.status_code == 400
+    assert 'tags' in json.loads(response.data)['messages']
+
+    with app.app_context():
+        from app.utils.tag_filter import get_tag_index
+        assert bool(get_tag_index()._users) is bitmap_index
+
+def test_task_statistics_breakdown(client, app, regular_user, test_tasks, test_tags, auth_headers):
+    """Test the statistics breakdown and its revalidation headers."""
+    from datetime import datetime, timedelta
+    with app.app_context():
+        from app import db
+        from app.models.task import Task
+        tasks = [db.session.merge(task) for task in test_tasks]
+        tag = db.session.merge(test_tags[0])
+        # One overdue open task, one due within the week, one completed
+        tasks[0].due_date = datetime.utcnow() - timedelta(days=2)
+        tasks[1].due_date = datetime.utcnow() + timedelta(days=3)
+        tasks[0].tags.append(tag)
+        db.session.commit()
+        tag_name = tag.name
+
+    response = client.get('/api/v1/tasks/statistics', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['total_tasks'] == 3
+    assert data['by_status'] == {'pending': 1, 'in_progress': 1, 'completed': 1}
+    assert data['by_priority'] == {'low': 1, 'medium': 1, 'high': 1}
+    assert data['by_tag'][tag_name] == 1
+    assert data['overdue_tasks'] == 1
+    assert data['upcoming_tasks'] == 1
+    assert data['completion_rate'] == round(1 / 3, 4)
+
+    etag = response.headers['ETag']
+    response = client.get('/api/v1/tasks/statistics',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+    client.put(f'/api/v1/tasks/{tasks[0].id}', headers=auth_headers,
+               json={'status': 'completed'})
+    response = client.get('/api/v1/tasks/statistics',
+                          headers={**auth_headers, 'If-None-Match': etag})
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data['by_status']['completed'] == 2
+    assert data['overdue_tasks'] == 0
+
+def test_get_tasks_facets(client, app, regular_user, test_tasks, test_tags, auth_headers):
+    """Test facet counts returned alongside a filtered listing."""
+    with app.app_context():
+        from app import db
+        tasks = [db.session.merge(task) for task in test_tasks]
+        tags = [db.session.merge(tag) for tag in test_tags]
+        tasks[0].tags.extend(tags[:2])
+        tasks[1].tags.append(tags[0])
+        db.session.commit()
+        work_id, personal_id = str(tags[0].id), str(tags[1].id)
+
+    response = client.get('/api/v1/tasks?facets=status,priority,tag', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['facets']['status'] == {'pending': 1, 'in_progress': 1, 'completed': 1}
+    assert data['facets']['priority'] == {'low': 1, 'medium': 1, 'high': 1}
+    assert data['facets']['tag'] == {work_id: 2, personal_id: 1}
+
+    # Facets follow the other active filters
+    response = client.get(f'/api/v1/tasks?tags={work_id}&facets=status,tag&cursor=',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert data['facets']['status'] == {'pending': 1, 'in_progress': 1, 'completed': 0}
+    assert data['facets']['tag'] == {work_id: 2, personal_id: 1}
+    assert 'priority' not in data['facets']
+
+    response = client.get('/api/v1/tasks?facets=owner', headers=auth_headers)
+    assert response.status_code == 400
+
+def test_get_tasks_calendar(client, app, regular_user, test_tasks, auth_headers):
+    """Test the due-date calendar buckets."""
+    with app.app_context():
+        from app import db
+        tasks = [db.session.merge(task) for task in test_tasks]
+        # Wednesday 2024-05-15 twice, then the following Monday
+        tasks[0].due_date = datetime(2024, 5, 15, 9, 0)
+        tasks[1].due_date = datetime(2024, 5, 15, 17, 0)
+        tasks[2].due_date = datetime(2024, 5, 20, 12, 0)
+        db.session.commit()
+        task_ids = [task.id for task in tasks]
+
+    response = client.get('/api/v1/tasks/calendar?from=2024-05-01&to=2024-05-31',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['bucket'] == 'day'
+    assert [b['start'] for b in data['buckets']] == ['2024-05-15', '2024-05-20']
+    assert data['buckets'][0]['count'] == 2
+    assert [t['id'] for t in data['buckets'][0]['tasks']] == task_ids[:2]
+
+    # Weeks start on Monday; limit caps the summaries but not the counts
+    response = client.get('/api/v1/tasks/calendar?from=2024-05-01&to=2024-05-31'
+                          '&bucket=week&limit=1', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert [(b['start'], b['count'], len(b['tasks'])) for b in data['buckets']] == \
+        [('2024-05-13', 2, 1), ('2024-05-20', 1, 1)]
+
+    # The range is inclusive of the 'to' day
+    response = client.get('/api/v1/tasks/calendar?from=2024-05-16&to=2024-05-20&limit=0',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert data['buckets'] == [{'start': '2024-05-20', 'count': 1, 'tasks': []}]
+
+    response = client.get('/api/v1/tasks/calendar?from=2024-05-31&to=2024-05-01',
+                          headers=auth_headers)
+    assert response.status_code == 400
+
+def test_get_tasks_batch(client, app, regular_user, admin_user, test_tasks, test_tags,
+                         test_comments, auth_headers, json_content_headers):
+    """Test fetching many tasks by id in one request."""
+    with app.app_context():
+        from app import db
+        from app.models.task import Task
+        tasks = [db.session.merge(task) for task in test_tasks]
+        tasks[0].tags.append(db.session.merge(test_tags[0]))
+        other = Task(title='Not mine', user_id=db.session.merge(admin_user).id)
+        db.session.add(other)
+        db.session.commit()
+        task_ids = [task.id for task in tasks]
+        other_id = other.id
+
+    ids = ','.join(str(i) for i in [task_ids[1], task_ids[0], other_id, 999999])
+    response = client.get(f'/api/v1/tasks/batch?ids={ids}', headers=auth_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert set(data['tasks']) == {str(task_ids[0]), str(task_ids[1])}
+    assert data['tasks'][str(task_ids[0])]['tags'][0]['name'] == 'Work'
+    assert data['missing'] == [other_id, 999999]
+    assert 'comments' not in data['tasks'][str(task_ids[0])]
+
+    # POST variant with a capped comment preview and a sparse fieldset
+    response = client.post(
+        '/api/v1/tasks/batch',
+        data=json.dumps({'ids': task_ids, 'comments': 1, 'fields': 'title'}),
+        headers={**auth_headers, **json_content_headers}
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    first = data['tasks'][str(task_ids[0])]
+    assert set(first) == {'id', 'title', 'comment_count', 'comments'}
+    assert first['comment_count'] == 2
+    assert len(first['comments']) == 1
+    assert data['tasks'][str(task_ids[1])]['comments'] == []
+    assert data['missing'] == []
+
+    response = client.get('/api/v1/tasks/batch?ids=1,x', headers=auth_headers)
+    assert response.status_code == 400
+    response = client.post('/api/v1/tasks/batch', data=json.dumps({'ids': []}),
+                           headers={**auth_headers, **json_content_headers})
+    assert response.status_code == 400
+
+def test_create_task_with_tags_is_atomic(client, app, regular_user, admin_user, test_tags,
+                                         auth_headers, json_content_headers):
+    """Test that a create with a bad tag id writes nothing."""
+    with app.app_context():
+        from app import db
+        from app.models.tag import Tag
+        tag_ids = [db.session.merge(tag).id for tag in test_tags[:2]]
+        foreign = Tag(name='Foreign', user_id=db.session.merge(admin_user).id)
+        db.session.add(foreign)
+        db.session.commit()
+        foreign_id = foreign.id
+
+    combined_headers = {**auth_headers, **json_content_headers}
+    response = client.post(
+        '/api/v1/tasks',
+        data=json.dumps({'title': 'Tagged', 'tag_ids': tag_ids}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 201
+    assert sorted(tag['id'] for tag in data['task']['tags']) == sorted(tag_ids)
+    assert data['task']['created_at'] is not None
+
+    response = client.post(
+        '/api/v1/tasks',
+        data=json.dumps({'title': 'Orphan', 'tag_ids': [tag_ids[0], foreign_id]}),
+        headers=combined_headers
+    )
+
+    assert response.status_code == 404
+    with app.app_context():
+        from app.models.task import Task
+        assert Task.query.filter_by(title='Orphan').count() == 0
+
+def test_update_task_incremental_tags(client, app, regular_user, test_tasks, test_tags,
+                                      auth_headers, json_content_headers):
+    """Test add_tag_ids / remove_tag_ids on task update."""
+    with app.app_context():
+        from app import db
+        task = db.session.merge(test_tasks[0])
+        tags = [db.session.merge(tag) for tag in test_tags]
+        task.tags.append(tags[0])
+        db.session.commit()
+        task_id = task.id
+        work_id, personal_id, urgent_id = [tag.id for tag in tags]
+
+    combined_headers = {**auth_headers, **json_content_headers}
+    response = client.put(
+        f'/api/v1/tasks/{task_id}',
+        data=json.dumps({'add_tag_ids': [personal_id, urgent_id], 'remove_tag_ids': [work_id]}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert sorted(tag['id'] for tag in data['task']['tags']) == sorted([personal_id, urgent_id])
+
+    # Replacement and increments combine: replace first, then add/remove
+    response = client.put(
+        f'/api/v1/tasks/{task_id}',
+        data=json.dumps({'tag_ids': [work_id, personal_id], 'remove_tag_ids': [personal_id]}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert [tag['id'] for tag in data['task']['tags']] == [work_id]
+
+    # An unknown tag leaves both the tags and the other fields untouched
+    response = client.put(
+        f'/api/v1/tasks/{task_id}',
+        data=json.dumps({'title': 'Renamed', 'add_tag_ids': [999999]}),
+        headers=combined_headers
+    )
+
+    assert response.status_code == 404
+    with app.app_context():
+        from app.models.task import Task
+        task = Task.query.get(task_id)
+        assert task.title != 'Renamed'
+        assert [tag.id for tag in task.tags] == [work_id]
+
+def test_bulk_create_tasks(client, app, regular_user, test_tags, auth_headers, json_content_headers):
+    """Test bulk task creation with per-item results."""
+    with app.app_context():
+        from app import db
+        tag_id = db.session.merge(test_tags[0]).id
+
+    combined_headers = {**auth_headers, **json_content_headers}
+    payload = {'tasks': [
+        {'title': 'Imported 1', 'priority': 'high', 'tag_ids': [tag_id]},
+        {'title': ''},
+        {'title': 'Imported 2', 'status': 'completed'},
+        {'title': 'Imported 3', 'tag_ids': [999999]},
+    ]}
+    response = client.post('/api/v1/tasks/bulk/create', data=json.dumps(payload),
+                           headers=combined_headers)
+    data = json.loads(response.data)
+
+    assert response.status_code == 201
+    assert data['created'] == 2
+    assert data['failed'] == 2
+    assert [sorted(result) for result in data['results']] == \
+        [['id', 'index'], ['errors', 'index'], ['id', 'index'], ['errors', 'index']]
+    assert 'title' in data['results'][1]['errors']
+    assert 'tag_ids' in data['results'][3]['errors']
+
+    first_id = data['results'][0]['id']
+    response = client.get(f'/api/v1/tasks/{first_id}', headers=auth_headers)
+    task = json.loads(response.data)
+
+    assert task['title'] == 'Imported 1'
+    assert task['priority'] == 'high'
+    assert [tag['id'] for tag in task['tags']] == [tag_id]
+
+    # Counters follow the query-level inserts
+    response = client.get('/api/v1/tasks?status=completed', headers=auth_headers)
+    assert json.loads(response.data)['total'] == 1
+
+    response = client.post('/api/v1/tasks/bulk/create',
+                           data=json.dumps({'tasks': [{'title': ''}]}),
+                           headers=combined_headers)
+    assert response.status_code == 400
+    assert json.loads(response.data)['results'][0]['index'] == 0
+
+    app.config['BULK_CREATE_MAX_TASKS'] = 1
+    response = client.post('/api/v1/tasks/bulk/create',
+                           data=json.dumps({'tasks': [{'title': 'a'}, {'title': 'b'}]}),
+                           headers=combined_headers)
+    assert response.status_code == 400
+
+def test_bulk_update_and_delete_set_based(client, app, regular_user, test_tasks, test_tags,
+                                          test_comments, auth_headers, json_content_headers):
+    """Test chunked bulk writes: per-id reports, tag edits and dependant cleanup."""
+    with app.app_context():
+        from app import db
+        tasks = [db.session.merge(task) for task in test_tasks]
+        tags = [db.session.merge(tag) for tag in test_tags]
+        tasks[0].tags.append(tags[0])
+        db.session.commit()
+        task_ids = [task.id for task in tasks]
+        work_id, personal_id = tags[0].id, tags[1].id
+
+    app.config['BULK_WRITE_CHUNK_SIZE'] = 2
+    combined_headers = {**auth_headers, **json_content_headers}
+    response = client.put(
+        '/api/v1/tasks/bulk/update',
+        data=json.dumps({'task_ids': task_ids + [999999],
+                         'updates': {'priority': 'low', 'add_tag_ids': [personal_id],
+                                     'remove_tag_ids': [work_id]}}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['message'] == '3 tasks updated successfully'
+    assert data['results'][-1] == {'id': 999999, 'status': 'not_found'}
+    assert {result['status'] for result in data['results'][:3]} == {'updated'}
+
+    for task_id in task_ids:
+        task = json.loads(client.get(f'/api/v1/tasks/{task_id}', headers=auth_headers).data)
+        assert task['priority'] == 'low'
+        assert [tag['id'] for tag in task['tags']] == [personal_id]
+
+    response = client.put(
+        '/api/v1/tasks/bulk/update',
+        data=json.dumps({'task_ids': task_ids, 'updates': {'status': 'archived'}}),
+        headers=combined_headers
+    )
+    assert response.status_code == 400
+
+    # Deleting removes the comments and task_tags rows with the tasks
+    response = client.post(
+        '/api/v1/tasks/bulk/delete',
+        data=json.dumps({'task_ids': [task_ids[0], 999999, task_ids[1]]}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert [result['status'] for result in data['results']] == ['deleted', 'not_found', 'deleted']
+    with app.app_context():
+        from app import db
+        from app.models.comment import Comment
+        from app.models.tag import task_tags
+        assert Comment.query.filter(Comment.task_id.in_(task_ids[:2])).count() == 0
+        assert db.session.query(task_tags).filter(
+            task_tags.c.task_id.in_(task_ids[:2])).count() == 0
+
+def test_task_optimistic_concurrency(client, app, regular_user, test_tasks, test_tags,
+                                     auth_headers, json_content_headers):
+    """Test version ETags, If-Match preconditions and 412 on stale writes."""
+    with app.app_context():
+        from app import db
+        task_ids = [db.session.merge(task).id for task in test_tasks]
+        tag_id = db.session.merge(test_tags[0]).id
+    task_id = task_ids[0]
+
+    response = client.get(f'/api/v1/tasks/{task_id}', headers=auth_headers)
+    etag = response.headers['ETag']
+
+    assert response.status_code == 200
+    assert etag == f'"{json.loads(response.data)["version"]}"'
+
+    response = client.get(f'/api/v1/tasks/{task_id}', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+    combined_headers = {**auth_headers, **json_content_headers}
+    response = client.put(f'/api/v1/tasks/{task_id}', data=json.dumps({'title': 'First'}),
+                          headers={**combined_headers, 'If-Match': etag})
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert data['task']['version'] == 2
+
+    # A writer still holding the old ETag is refused, and nothing changes
+    response = client.put(f'/api/v1/tasks/{task_id}', data=json.dumps({'title': 'Second'}),
+                          headers={**combined_headers, 'If-Match': etag})
+    assert response.status_code == 412
+    assert json.loads(response.data)['version'] == 2
+
+    response = client.delete(f'/api/v1/tasks/{task_id}', headers={**auth_headers, 'If-Match': etag})
+    assert response.status_code == 412
+
+    # Bulk updates take per-task preconditions and apply all or nothing
+    response = client.put(
+        '/api/v1/tasks/bulk/update',
+        data=json.dumps({'task_ids': task_ids, 'updates': {'priority': 'low'},
+                         'if_match': {str(task_id): 1, str(task_ids[1]): 1}}),
+        headers=combined_headers
+    )
+    data = json.loads(response.data)
+
+    assert response.status_code == 412
+    assert data['results'] == [{'id': task_id, 'status': 'precondition_failed', 'version': 2}]
+    task = json.loads(client.get(f'/api/v1/tasks/{task_ids[1]}', headers=auth_headers).data)
+    assert task['priority'] != 'low'
+    assert task['version'] == 1
+
+    response = client.put(
+        '/api/v1/tasks/bulk/update',
+        data=json.dumps({'task_ids': task_ids, 'updates': {'priority': 'low'},
+                         'if_match': {str(task_id): 2}}),
+        headers=combined_headers
+    )
+    assert response.status_code == 200
+    task = json.loads(client.get(f'/api/v1/tasks/{task_id}', headers=auth_headers).data)
+    assert task['version'] == 3
+
+    # Renaming a tag changes the representation of the tasks that carry it
+    client.post(f'/api/v1/tasks/{task_id}/tags', data=json.dumps({'tag_id': tag_id}),
+                headers=combined_headers)
+    etag = client.get(f'/api/v1/tasks/{task_id}', headers=auth_headers).headers['ETag']
+    client.put(f'/api/v1/tags/{tag_id}', data=json.dumps({'name': 'Renamed'}),
+               headers=combined_headers)
+    response = client.get(f'/api/v1/tasks/{task_id}', headers=auth_headers)
+    assert response.headers['ETag'] != etag
+    assert json.loads(response.data)['version'] == 4
+
+    # ... but not the task's version: writers holding the old ETag still succeed
+    response = client.put(f'/api/v1/tasks/{task_id}', data=json.dumps({'title': 'Third'}),
+                          headers={**combined_headers, 'If-Match': etag})
+    assert response.status_code == 200
+
+    response = client.delete(f'/api/v1/tasks/{task_id}',
+                             headers={**auth_headers, 'If-Match': response.headers['ETag']})
+    assert response.status_code == 200
+
+
+def test_archive_and_restore_tasks(client, app, regular_user, test_tasks, test_tags,
+                                   auth_headers, json_content_headers):
+    """Test archiving old completed tasks, listing them and restoring one."""
+    combined_headers = {**auth_headers, **json_content_headers}
+    task_id = test_tasks[2].id    # completed
+    client.post(f'/api/v1/tasks/{task_id}/tags', data=json.dumps({'tag_id': test_tags[0].id}),
+                headers=combined_headers)
+    client.post(f'/api/v1/tasks/{task_id}/comments', data=json.dumps({'content': 'Done'}),
+                headers=combined_headers)
+
+    from app import db
+    from app.models.task import Task
+    with app.app_context():
+        db.session.get(Task, task_id).updated_at = datetime.utcnow() - timedelta(days=30)
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['archive-tasks', '--older-than', '7d'])
+    assert 'Archived 1 completed tasks.' in result.output
+
+    response = client.get('/api/v1/tasks', headers=auth_headers)
+    data = json.loads(response.data)
+    assert data['total'] == 2
+    assert task_id not in [task['id'] for task in data['tasks']]
+    response = client.get('/api/v1/tasks/statistics', headers=auth_headers)
+    assert json.loads(response.data)['total_tasks'] == 2
+
+    response = client.get('/api/v1/tasks?include_archived=true&sort_by=title&sort_order=asc',
+                          headers=auth_headers)
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data['total'] == 3
+    assert [task['archived'] for task in data['tasks']] == [False, False, True]
+    assert data['tasks'][2]['id'] == task_id
+    assert data['tasks'][2]['tags'][0]['id'] == test_tags[0].id
+
+    response = client.get('/api/v1/tasks?include_archived=true&search=Task', headers=auth_headers)
+    assert response.status_code == 400
+    response = client.get('/api/v1/tasks?include_archived=true&sort_by=relevance',
+                          headers=auth_headers)
+    assert response.status_code == 400
+
+    response = client.get('/api/v1/tasks/export?include_archived=true', headers=auth_headers)
+    exported = json.loads(response.data)
+    assert sorted(task['id'] for task in exported if task['archived']) == [task_id]
+
+    # A database that handed the id out again reports a conflict
+    with app.app_context():
+        db.session.execute(Task.__table__.insert().values(
+            id=task_id, title='Reused id', user_id=regular_user.id))
+        db.session.commit()
+    response = client.post(f'/api/v1/tasks/{task_id}/restore', headers=auth_headers)
+    assert response.status_code == 409
+    with app.app_context():
+        db.session.execute(Task.__table__.delete().where(Task.id == task_id))
+        db.session.commit()
+
+    # Restore brings the task back with its tags and comments
+    response = client.post(f'/api/v1/tasks/{task_id}/restore', headers=auth_headers)
+    data = json.loads(response.data)
+    assert response.status_code == 200
+    assert data['task']['id'] == task_id
+    assert [tag['id'] for tag in data['task']['tags']] == [test_tags[0].id]
+    response = client.get(f'/api/v1/tasks/{task_id}/comments', headers=auth_headers)
+    assert len(json.loads(response.data)) == 1
+    response = client.get('/api/v1/tasks/statistics', headers=auth_headers)
+    assert json.loads(response.data)['total_tasks'] == 3
+
+    response = client.post(f'/api/v1/tasks/{task_id}/restore', headers=auth_headers)
+    assert response.status_code == 404